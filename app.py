@@ -1,12 +1,48 @@
+import os
+import time
+import numpy as np
+import pandas as pd
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import ttkbootstrap as tb
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
-from matplotlib.figure import Figure
-from models import train_model, calculate_accuracy
-from plots import generate_plot
-from utils import load_dataset
-from sklearn.model_selection import train_test_split
+# sklearn, matplotlib and seaborn are imported on first use (or by the pre-warm
+# thread once the window is up) so they do not delay the first window
+from models import (
+    train_model, calculate_accuracy, compare_models, predict_file, train_incremental, model_target,
+    train_progressive, PredictionStore, MODEL_NAMES, INCREMENTAL_MODELS, REGRESSION_MODELS, PLATEAU_TOLERANCE
+)
+from utils import load_dataset, top_correlated, DEFAULT_CHUNKSIZE
+from jobs import JobRunner
+from widgets import ColumnPicker, VirtualForm, VirtualTable
+from cache import ModelCache, RenderCache, fingerprint_frame, model_cache_key, write_cached_dataset, write_cached_profile
+from profiling import PROFILER
+from preprocessing import PreparedCache
+from column_profile import profile_dataset, profile_frame, describe, check_value, suggest_model, suggest_plot
+from watch import TailReader, FileRewritten, append_rows, supports_partial_fit, update_model
+
+# Wall-clock limit for the Tune button's hyperparameter search
+TUNE_BUDGET_SECONDS = 120
+# File > Watch: how often the data file is checked for appended rows, and how long appends must
+# pause before a model without partial_fit is retrained and the caches are rewritten
+WATCH_INTERVAL_MS = 2000
+RETRAIN_DELAY_MS = 5000
+# Share of appended rows added to the test split when a model is updated with partial_fit
+APPEND_TEST_SHARE = 0.2
+# Plots that recompute what they show on zoom and pan: they open on the live canvas by default
+ZOOMABLE_PLOTS = ("Scatter Plot", "Decision Surface")
+
+
+def prewarm_imports(job):
+    # Loads the heavy modules in the background while the user is still picking a file
+    start = time.perf_counter()
+    for module in (
+        "sklearn.model_selection", "sklearn.metrics", "sklearn.linear_model", "sklearn.tree",
+        "sklearn.ensemble", "sklearn.svm", "sklearn.naive_bayes",
+        "matplotlib.backends.backend_tkagg", "plots",
+    ):
+        job.check()
+        __import__(module)
+    return time.perf_counter() - start
 
 class MLApp:
     def __init__(self, root):
@@ -20,11 +56,51 @@ class MLApp:
         # Modern theme
         self.style = tb.Style(theme="pulse")
         self.dataset = None
+        self.dataset_path = None
+        # Bytes of the file the dataset was parsed from; watch mode reads the rows appended after it
+        self.dataset_size = None
+        # Per-column statistics of the loaded dataset (see column_profile.py)
+        self.profile = None
         self.model = None
+        # Bumped whenever self.model changes; keys cached plots (an id() can be reused)
+        self.model_version = 0
+        self.model_name = None
         self.X_train, self.X_test, self.y_train, self.y_test = None, None, None, None
         self.selected_inputs = []
         self.plot_window = None
         
+        # Encoded features per feature selection, shared by every model trained on it
+        self.prepared = PreparedCache()
+        self.preprocessor = None
+        self.X_all = None
+        # (rows, accuracy) per step of the last progressive training, for the learning curve
+        self.learning_curve = []
+        
+        # Background worker for long-running jobs, and a separate one for low-priority warm-up
+        self.jobs = JobRunner(self.root)
+        self.background = JobRunner(self.root)
+        # Plots are built and rasterized on their own worker so training does not hold them up
+        self.plot_jobs = JobRunner(self.root)
+        self.plot_job = None
+        self.render_cache = RenderCache()
+        # Decision surfaces of the current model by (x input, y input, data version); each keeps
+        # its computed tiles so zoom and pan only compute new ones
+        self.surfaces = {}
+        # Local prediction server (server, service) while File > Serve Model is on
+        self.server = None
+        # Bumped on every load so cached renders of an earlier dataset are never shown
+        self.data_version = 0
+        self.train_job = None
+        self.batch_job = None
+        # Watch mode: reader of the data file's new lines, its running read and pending after() calls
+        self.watcher = None
+        self.watch_job = None
+        self.watch_after = None
+        self.retrain_after = None
+        self.refresh_after = None
+        self.model_cache = ModelCache()
+        self.predictions = PredictionStore()
+        
         # Create menu bar
         self.create_menu()
         
@@ -41,6 +117,16 @@ class MLApp:
         file_menu = tk.Menu(menubar, tearoff=0)
         file_menu.add_command(label="Reset", command=self.reset_app)
         file_menu.add_separator()
+        self.profiling_var = tk.BooleanVar(value=PROFILER.enabled)
+        file_menu.add_checkbutton(label="Enable Profiling", variable=self.profiling_var, command=self.toggle_profiling)
+        file_menu.add_command(label="Export Trace...", command=self.export_trace)
+        file_menu.add_separator()
+        file_menu.add_command(label="Export Model...", command=self.export_model)
+        self.serving_var = tk.BooleanVar(value=False)
+        file_menu.add_checkbutton(label="Serve Model over HTTP", variable=self.serving_var, command=self.toggle_server)
+        self.watch_var = tk.BooleanVar(value=False)
+        file_menu.add_checkbutton(label="Watch File for New Rows", variable=self.watch_var, command=self.toggle_watch)
+        file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self.root.quit)
         menubar.add_cascade(label="File", menu=file_menu)
         
@@ -156,15 +242,10 @@ class MLApp:
         self.frame_columns = tb.LabelFrame(self.main_frame, text="2. Select Columns", padding=10)
         self.frame_columns.grid(row=1, column=0, sticky="ew", padx=5, pady=5)
         
-        # Input Features (Listbox for multi-select)
+        # Input Features (searchable multi-select, only the visible names are in the widget)
         tb.Label(self.frame_columns, text="Input Features :").pack(anchor=tk.W)
-        self.input_listbox = tk.Listbox(
-            self.frame_columns, 
-            selectmode=tk.MULTIPLE, 
-            height=4,
-            exportselection=False
-        )
-        self.input_listbox.pack(fill=tk.X, padx=5)
+        self.column_picker = ColumnPicker(self.frame_columns, visible_rows=5, top_k=self._top_correlated)
+        self.column_picker.pack(fill=tk.X, padx=5)
         
         # Target Column (Combobox for single-select)
         tb.Label(self.frame_columns, text="Target Column:").pack(anchor=tk.W)
@@ -175,6 +256,7 @@ class MLApp:
             state="readonly"
         )
         self.output_dropdown.pack(fill=tk.X, padx=5)
+        self.output_dropdown.bind("<<ComboboxSelected>>", self._on_target_selected)
 
         # Model Training Frame (row 2)
         self.frame_model = tb.LabelFrame(self.main_frame, text="3. Model Training", padding=10)
@@ -184,7 +266,7 @@ class MLApp:
         self.model_dropdown = tb.Combobox(
             self.frame_model,
             textvariable=self.model_var,
-            values=["Linear / Multiple Regression", "Logistic Regression", "Decision Tree", "Random Forest", "SVM", "Naive Bayes"],
+            values=MODEL_NAMES,
             state="readonly"
         )
         self.model_dropdown.pack(side=tk.LEFT, padx=5)
@@ -197,6 +279,64 @@ class MLApp:
         )
         self.btn_train.pack(side=tk.LEFT, padx=5)
         
+        self.btn_compare = tb.Button(
+            self.frame_model,
+            text="Compare All",
+            command=self.compare_all_models,
+            bootstyle="secondary"
+        )
+        self.btn_compare.pack(side=tk.LEFT, padx=5)
+        
+        self.btn_tune = tb.Button(
+            self.frame_model,
+            text="Tune",
+            command=self.tune_selected_model,
+            bootstyle="secondary"
+        )
+        self.btn_tune.pack(side=tk.LEFT, padx=5)
+        
+        # Stream the source file through partial_fit instead of fitting in memory
+        self.incremental_var = tk.BooleanVar(value=False)
+        tb.Checkbutton(
+            self.frame_model,
+            text="Out-of-core",
+            variable=self.incremental_var,
+            bootstyle="round-toggle"
+        ).pack(side=tk.LEFT, padx=5)
+        
+        # Fit on 1%, 10% and then all training rows, with a usable model after the first step
+        self.progressive_var = tk.BooleanVar(value=False)
+        tb.Checkbutton(
+            self.frame_model,
+            text="Progressive",
+            variable=self.progressive_var,
+            bootstyle="round-toggle"
+        ).pack(side=tk.LEFT, padx=5)
+        self.plateau_var = tk.BooleanVar(value=True)
+        tb.Checkbutton(
+            self.frame_model,
+            text="Stop on plateau",
+            variable=self.plateau_var,
+            bootstyle="round-toggle"
+        ).pack(side=tk.LEFT, padx=5)
+        
+        self.btn_cancel_train = tb.Button(
+            self.frame_model,
+            text="Cancel",
+            command=self.cancel_training,
+            bootstyle="danger-outline",
+            state=tk.DISABLED
+        )
+        self.btn_cancel_train.pack(side=tk.LEFT, padx=5)
+        
+        self.train_progress = tb.Progressbar(
+            self.frame_model,
+            mode="indeterminate",
+            length=120,
+            bootstyle="success-striped"
+        )
+        self.train_progress.pack(side=tk.LEFT, padx=5)
+        
         # Training Status and Accuracy
         self.train_status = tb.Label(
             self.frame_model,
@@ -217,32 +357,17 @@ class MLApp:
         self.frame_data = tb.LabelFrame(self.main_frame, text="Data Preview", padding=10)
         self.frame_data.grid(row=3, column=0, sticky="nsew", padx=5, pady=5)
         
-        # Treeview with scrollbars - Limited to 8 rows
-        self.tree = ttk.Treeview(self.frame_data, show="headings", height=8)
-        self.tree_scroll_y = ttk.Scrollbar(self.frame_data, orient=tk.VERTICAL, command=self.tree.yview)
-        self.tree_scroll_x = ttk.Scrollbar(self.frame_data, orient=tk.HORIZONTAL, command=self.tree.xview)
-        self.tree.configure(yscrollcommand=self.tree_scroll_y.set, xscrollcommand=self.tree_scroll_x.set)
-        
-        self.tree_scroll_y.pack(side=tk.RIGHT, fill=tk.Y)
-        self.tree_scroll_x.pack(side=tk.BOTTOM, fill=tk.X)
-        self.tree.pack(fill=tk.BOTH, expand=True)
+        # Virtualized table - 8 visible rows, scrolls through the whole dataset
+        self.preview = VirtualTable(self.frame_data, visible_rows=8)
+        self.preview.pack(fill=tk.BOTH, expand=True)
 
         # Manual Prediction Frame (row 4) - Now with more space
         self.frame_prediction = tb.LabelFrame(self.main_frame, text="4. Manual Prediction", padding=10)
         self.frame_prediction.grid(row=4, column=0, sticky="nsew", padx=5, pady=5)
         
-        # Container for input fields (2 columns)
-        self.pred_inputs_frame = tb.Frame(self.frame_prediction)
-        self.pred_inputs_frame.pack(fill=tk.BOTH, expand=True)
-        
-        # Create two columns
-        self.left_col = tb.Frame(self.pred_inputs_frame)
-        self.left_col.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5)
-        
-        self.right_col = tb.Frame(self.pred_inputs_frame)
-        self.right_col.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5)
-        
-        self.input_entries = []
+        # Input fields (2 columns); only the visible rows have widgets, the rest scroll in
+        self.prediction_form = VirtualForm(self.frame_prediction, visible_rows=5, columns=2, validate=self._check_input)
+        self.prediction_form.pack(fill=tk.BOTH, expand=True)
         
         # Prediction button and result - Now fully visible
         self.btn_predict = tb.Button(
@@ -254,6 +379,27 @@ class MLApp:
         )
         self.btn_predict.pack(pady=(10, 5))
         
+        # Batch scoring of whole files
+        self.frame_batch = tb.Frame(self.frame_prediction)
+        self.frame_batch.pack(pady=(0, 5))
+        self.btn_predict_file = tb.Button(
+            self.frame_batch,
+            text="Predict File",
+            command=self.predict_file,
+            bootstyle="primary-outline",
+            state=tk.DISABLED
+        )
+        self.btn_predict_file.pack(side=tk.LEFT, padx=5)
+        tb.Label(self.frame_batch, text="Workers:").pack(side=tk.LEFT)
+        self.batch_workers_var = tk.IntVar(value=1)
+        tb.Spinbox(
+            self.frame_batch,
+            from_=1,
+            to=os.cpu_count() or 1,
+            textvariable=self.batch_workers_var,
+            width=4
+        ).pack(side=tk.LEFT, padx=5)
+        
         self.prediction_result = tb.Label(
             self.frame_prediction,
             text="Prediction: N/A",
@@ -269,11 +415,26 @@ class MLApp:
         self.plot_dropdown = tb.Combobox(
             self.frame_plot_controls,
             textvariable=self.plot_var,
-            values=["Scatter Plot", "Confusion Matrix"],
+            values=["Scatter Plot", "Confusion Matrix", "Learning Curve", "Decision Surface"],
             state="readonly"
         )
         self.plot_dropdown.pack(side=tk.LEFT, padx=5)
         
+        # Axes of the decision surface, chosen among the model's numeric inputs
+        self.surface_x_var = tk.StringVar()
+        tb.Label(self.frame_plot_controls, text="X:").pack(side=tk.LEFT, padx=(5, 0))
+        self.surface_x_dropdown = tb.Combobox(
+            self.frame_plot_controls, textvariable=self.surface_x_var, width=14, state="readonly"
+        )
+        self.surface_x_dropdown.pack(side=tk.LEFT, padx=2)
+        
+        self.surface_y_var = tk.StringVar()
+        tb.Label(self.frame_plot_controls, text="Y:").pack(side=tk.LEFT, padx=(5, 0))
+        self.surface_y_dropdown = tb.Combobox(
+            self.frame_plot_controls, textvariable=self.surface_y_var, width=14, state="readonly"
+        )
+        self.surface_y_dropdown.pack(side=tk.LEFT, padx=2)
+        
         self.btn_plot = tb.Button(
             self.frame_plot_controls,
             text="Generate Plot",
@@ -281,6 +442,17 @@ class MLApp:
             bootstyle="info"
         )
         self.btn_plot.pack(side=tk.LEFT, padx=5)
+        
+        # Live Matplotlib canvas with zoom/pan instead of a pre-rendered image; set to match the
+        # plot type whenever it changes, and can still be switched by hand afterwards
+        self.interactive_plot_var = tk.BooleanVar(value=False)
+        tb.Checkbutton(
+            self.frame_plot_controls,
+            text="Interactive",
+            variable=self.interactive_plot_var,
+            bootstyle="round-toggle"
+        ).pack(side=tk.LEFT, padx=5)
+        self.plot_var.trace_add("write", self._on_plot_selected)
 
         # Status Bar
         self.status_var = tk.StringVar()
@@ -291,39 +463,364 @@ class MLApp:
             padding=5
         )
         self.status_bar.pack(fill=tk.X, side=tk.BOTTOM)
+        
+        # Profiling summary, only shown while profiling is enabled
+        self.profile_var = tk.StringVar()
+        self.profile_bar = tb.Label(
+            self.root,
+            textvariable=self.profile_var,
+            relief=tk.SUNKEN,
+            padding=(5, 2),
+            bootstyle="secondary"
+        )
+        if PROFILER.enabled:
+            self.profile_bar.pack(fill=tk.X, side=tk.BOTTOM)
 
     def load_data(self):
         file_path = filedialog.askopenfilename(filetypes=[("CSV", "*.csv"), ("Excel", "*.xlsx")])
         if file_path:
+            if self.watcher is not None:
+                self.watch_var.set(False)
+                self._stop_watch()
             try:
-                self.dataset = load_dataset(file_path)
+                # Parsed up to the size seen here, so watch mode starts exactly where the parse ended
+                stat = os.stat(file_path)
+                with PROFILER.stage("load_dataset") as stage:
+                    self.dataset = load_dataset(
+                        file_path,
+                        chunksize=DEFAULT_CHUNKSIZE,
+                        progress=self._on_load_progress,
+                        use_cache=True,
+                        stat=stat
+                    )
+                    stage.set(rows=len(self.dataset), cols=self.dataset.shape[1])
+                self.dataset_size = stat.st_size
+                with PROFILER.stage("profile_columns", cols=self.dataset.shape[1]):
+                    self.profile = profile_dataset(self.dataset, file_path, optimized=True, stat=stat)
+                self._clear_model()
+                self.data_version += 1
+                self.dataset_path = file_path
                 self.label_file.config(text=file_path.split("/")[-1])
                 self.update_data_preview()
                 
                 # Update column selection widgets
                 columns = list(self.dataset.columns)
-                self.input_listbox.delete(0, tk.END)
-                for col in columns:
-                    self.input_listbox.insert(tk.END, col)
+                stats = self.profile["columns"]
+                self.column_picker.set_columns(
+                    columns,
+                    numeric=[col for col in columns if stats[str(col)]["kind"] == "numeric"],
+                    notes={col: describe(stats[str(col)]) for col in columns}
+                )
                 self.output_dropdown["values"] = columns
                 
-                self.status_var.set(f"✅ Loaded: {len(self.dataset)} rows | Columns: {', '.join(columns)}")
+                self.status_var.set(f"✅ Loaded: {len(self.dataset):,} rows | {len(columns):,} columns")
+                self.update_profile_summary()
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to load dataset: {e}")
 
-    def update_data_preview(self):
-        self.tree.delete(*self.tree.get_children())
-        columns = list(self.dataset.columns)
-        self.tree["columns"] = columns
-        
-        # Configure columns with left alignment
-        for col in columns:
-            self.tree.heading(col, text=col, anchor=tk.W)
-            self.tree.column(col, anchor=tk.W, width=100, stretch=tk.YES)
+    def toggle_profiling(self):
+        PROFILER.enabled = self.profiling_var.get()
+        if PROFILER.enabled:
+            self.profile_bar.pack(fill=tk.X, side=tk.BOTTOM)
+            self.profile_var.set("Profiling enabled")
+        else:
+            self.profile_bar.pack_forget()
+
+    def update_profile_summary(self):
+        if PROFILER.enabled:
+            self.profile_var.set(PROFILER.summary())
+
+    def export_trace(self):
+        if not PROFILER.events:
+            messagebox.showinfo("Export Trace", "No profiling data yet. Enable profiling under File first.")
+            return
+        path = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=[("Chrome trace", "*.json")],
+            initialfile="ml_viz_trace.json"
+        )
+        if path:
+            try:
+                count = PROFILER.export_chrome_trace(path)
+                self.status_var.set(f"Exported {count} trace events to {path}")
+            except OSError as e:
+                messagebox.showerror("Error", f"Trace export failed: {e}")
+
+    def export_model(self):
+        if self.model is None:
+            messagebox.showerror("Error", "Train a model first!")
+            return
+        path = filedialog.asksaveasfilename(
+            defaultextension=".mlvz",
+            filetypes=[("NumPy predictor", "*.mlvz")],
+            initialfile="model.mlvz"
+        )
+        if not path:
+            return
+        try:
+            from export import export_model
+            export_model(
+                path, self.model, preprocessor=self.preprocessor, inputs=self.selected_inputs,
+                target=self.output_var.get(), model_name=self.model_name
+            )
+            self.status_var.set(f"Exported {self.model_name} to {path} (load it with npmodel.load)")
+        except Exception as e:
+            messagebox.showerror("Error", f"Export failed: {str(e)}")
+
+    def toggle_server(self):
+        from server import start_server, stop_server, DEFAULT_HOST, DEFAULT_PORT
         
-        # Insert data (first 8 rows only)
-        for _, row in self.dataset.head(8).iterrows():
-            self.tree.insert("", tk.END, values=list(row))
+        if self.server is not None:
+            stop_server(*self.server)
+            self.server = None
+            self.status_var.set("Prediction server stopped")
+        if not self.serving_var.get():
+            return
+        if self.model is None:
+            self.serving_var.set(False)
+            messagebox.showerror("Error", "Train a model first!")
+            return
+        # The server keeps the model it was started with; toggle again after retraining
+        bundle = {
+            "model": self.model,
+            "model_name": self.model_name,
+            "inputs": list(self.selected_inputs),
+            "target": self.output_var.get(),
+            "metrics": {},
+            "preprocessor": self.preprocessor,
+        }
+        try:
+            self.server = start_server(bundle, host=DEFAULT_HOST, port=DEFAULT_PORT)
+        except OSError as e:
+            self.serving_var.set(False)
+            messagebox.showerror("Error", f"Could not start the prediction server: {e}")
+            return
+        self.status_var.set(f"Serving {self.model_name} on http://{DEFAULT_HOST}:{DEFAULT_PORT}/predict")
+
+    def toggle_watch(self):
+        self._stop_watch()
+        if not self.watch_var.get():
+            self.status_var.set("Stopped watching for new rows")
+            return
+        if self.dataset is None:
+            self.watch_var.set(False)
+            messagebox.showerror("Error", "No dataset loaded!")
+            return
+        try:
+            self.watcher = TailReader(self.dataset_path, self.dataset.dtypes, offset=self.dataset_size)
+        except (ValueError, OSError) as e:
+            self.watch_var.set(False)
+            messagebox.showerror("Error", f"Cannot watch {os.path.basename(self.dataset_path)}: {e}")
+            return
+        self.status_var.set(f"Watching {os.path.basename(self.dataset_path)} for new rows")
+        self.watch_after = self.root.after(WATCH_INTERVAL_MS, self._poll_watch)
+
+    def _stop_watch(self):
+        self.watcher = None
+        if self.watch_job is not None:
+            self.watch_job.cancel()
+            self.watch_job = None
+        for after_id in (self.watch_after, self.retrain_after, self.refresh_after):
+            if after_id is not None:
+                self.root.after_cancel(after_id)
+        self.watch_after = self.retrain_after = self.refresh_after = None
+
+    def _poll_watch(self):
+        self.watch_after = None
+        if self.watcher is None:
+            return
+        # Training holds on to the frame it started with; new rows wait until it is done
+        if self.train_job is None:
+            self.watch_job = self.background.submit(
+                self._read_appended, self.watcher, self.dataset, self.model, self.model_name,
+                self.preprocessor, list(self.selected_inputs), self.output_var.get(),
+                (self.X_train, self.X_test, self.y_train, self.y_test), self.X_all,
+                on_done=self._on_rows_appended,
+                on_error=self._on_watch_error,
+                on_cancel=lambda job: None
+            )
+            return
+        self.watch_after = self.root.after(WATCH_INTERVAL_MS, self._poll_watch)
+
+    def _read_appended(self, job, watcher, dataset, model, model_name, preprocessor, inputs, output, split, X_all):
+        # Worker thread: parses only the new lines, grows the frame and, for models with
+        # partial_fit, folds the rows into a copy of the model
+        with PROFILER.stage("read_appended") as stage:
+            tail = watcher.read()
+            if tail is None:
+                return None
+            stage.set(rows=len(tail), cols=tail.shape[1])
+            dataset = append_rows(dataset, tail)
+        job.check()
+        rows = dataset.iloc[len(dataset) - len(tail):]
+        result = {"rows": len(tail), "dataset": dataset, "model": model, "X_all": X_all, "update": None}
+        X_new = None
+        if preprocessor is not None and X_all is not None:
+            X_new = preprocessor.transform(rows)
+            result["X_all"] = np.vstack([X_all, X_new])
+        if model is not None and output in rows.columns and supports_partial_fit(model):
+            with PROFILER.stage("partial_fit", rows=len(rows)):
+                result["update"] = self._fold_rows(model, model_name, rows, preprocessor, X_new, inputs, output, split)
+        return result
+
+    def _fold_rows(self, model, model_name, rows, preprocessor, X_new, inputs, output, split):
+        # (updated model, accuracy, split), or None when only retraining can take the rows in
+        keep = rows[output].notna().to_numpy()
+        if preprocessor is not None:
+            X = X_new[keep]
+            y = model_target(model_name, rows[output].to_numpy()[keep], preprocessor)
+            if model_name in REGRESSION_MODELS and preprocessor.target_classes is not None and (y < 0).any():
+                return None
+        else:
+            # Out-of-core models: raw numeric inputs, labels as strings, like train_incremental
+            rows = rows[keep].dropna(subset=inputs)
+            X = rows[inputs].to_numpy(dtype=np.float64)
+            y = rows[output].to_numpy()
+            if not pd.api.types.is_numeric_dtype(rows[output]):
+                if model_name in REGRESSION_MODELS:
+                    return None
+                y = y.astype(str)
+        if not len(X):
+            return model, None, split
+        X_train, X_test, y_train, y_test = split
+        if X_test is None:
+            # No test split to grow: score the rows before learning from them
+            accuracy = calculate_accuracy(model, X, y)
+            updated = update_model(model, X, y)
+            return None if updated is None else (updated, accuracy, split)
+        held = np.random.default_rng(len(X_train) + len(X_test)).random(len(X)) < APPEND_TEST_SHARE
+        updated = update_model(model, X[~held], y[~held]) if (~held).any() else model
+        if updated is None:
+            return None
+        split = (
+            np.vstack([X_train, X[~held]]), np.vstack([X_test, X[held]]),
+            np.concatenate([y_train, y[~held]]), np.concatenate([y_test, y[held]]),
+        )
+        return updated, calculate_accuracy(updated, split[1], split[3]), split
+
+    def _on_rows_appended(self, job, result):
+        if job is not self.watch_job:
+            return
+        self.watch_job = None
+        if self.watcher is None:
+            return
+        # A model trained in the meantime was not part of this read: read the rows again
+        if result is not None and result["model"] is self.model and self.train_job is None:
+            self.watcher.advance()
+            self.dataset = result["dataset"]
+            self.X_all = result["X_all"]
+            self.prepared.clear()
+            self.surfaces.clear()
+            self.data_version += 1
+            self.update_data_preview()
+            message = f"+{result['rows']:,} rows | {len(self.dataset):,} rows"
+            update = result["update"]
+            if update is not None:
+                model, accuracy, split = update
+                if model is not self.model:
+                    self.predictions.clear(self.model)
+                self.model = model
+                self.model_version += 1
+                self.X_train, self.X_test, self.y_train, self.y_test = split
+                if accuracy is not None:
+                    self.accuracy_var.set(f"Accuracy: {accuracy:.2%} (updated with new rows)")
+                self._refresh_prediction()
+                message += f" | {self.model_name} updated"
+            elif self.model is not None:
+                self.predictions.clear(self.model)
+                self._schedule_retrain()
+                message += f" | retraining {self.model_name} once appends pause"
+            self.status_var.set(message)
+            self._schedule_refresh()
+            self.update_profile_summary()
+        self.watch_after = self.root.after(WATCH_INTERVAL_MS, self._poll_watch)
+
+    def _on_watch_error(self, job, error):
+        if job is not self.watch_job:
+            return
+        self.watch_job = None
+        self.watch_var.set(False)
+        self._stop_watch()
+        if isinstance(error, FileRewritten):
+            self.status_var.set(f"Stopped watching: {error}. Load the file again.")
+        else:
+            messagebox.showerror("Error", f"Reading new rows failed: {str(error)}")
+
+    def _schedule_retrain(self):
+        # Debounced: a burst of appends leads to one retrain once it pauses
+        if self.retrain_after is not None:
+            self.root.after_cancel(self.retrain_after)
+        self.retrain_after = self.root.after(RETRAIN_DELAY_MS, self._auto_retrain)
+
+    def _auto_retrain(self):
+        self.retrain_after = None
+        output = self.output_var.get()
+        if self.watcher is None or self.model is None or not output:
+            return
+        if self.train_job is not None:
+            self._schedule_retrain()
+            return
+        self._begin_training()
+        self.train_job = self.jobs.submit(
+            self._run_training, self.model_name, self.dataset, list(self.selected_inputs), output,
+            on_done=self._on_training_done,
+            on_error=self._on_training_error,
+            on_progress=self._on_training_progress,
+            on_cancel=self._on_training_cancelled
+        )
+        self._tick_training()
+
+    def _schedule_refresh(self):
+        if self.refresh_after is not None:
+            self.root.after_cancel(self.refresh_after)
+        self.refresh_after = self.root.after(RETRAIN_DELAY_MS, self._refresh_caches)
+
+    def _refresh_caches(self):
+        # Column profile and dataset cache of the grown file, so the next load skips parsing
+        self.refresh_after = None
+        if self.watcher is None:
+            return
+        self.background.submit(
+            self._write_caches, self.dataset, self.dataset_path, self.watcher.offset,
+            on_done=self._on_caches_refreshed,
+            on_error=lambda job, error: self.status_var.set(f"Cache refresh failed: {error}")
+        )
+
+    def _write_caches(self, job, dataset, file_path, offset):
+        with PROFILER.stage("profile_columns", rows=len(dataset), cols=dataset.shape[1]):
+            profile = profile_frame(dataset)
+        # Caches are keyed by the file's size and mtime: only write them while the file
+        # ends where the rows read so far end, keyed on that very stat
+        stat = os.stat(file_path)
+        if stat.st_size == offset:
+            write_cached_dataset(dataset, file_path, optimized=True, stat=stat)
+            write_cached_profile(profile, file_path, None, True, stat=stat)
+        return dataset, profile
+
+    def _on_caches_refreshed(self, job, result):
+        dataset, profile = result
+        if dataset is not self.dataset:
+            return
+        self.profile = profile
+        stats = profile["columns"]
+        self.column_picker.set_notes({col: describe(stats[str(col)]) for col in dataset.columns})
+
+    def prewarm(self, on_done=None):
+        # Import sklearn/matplotlib/seaborn off the Tk thread; on_done receives the seconds it took
+        return self.background.submit(
+            prewarm_imports,
+            on_done=lambda job, seconds: on_done(seconds) if on_done else None,
+            on_error=lambda job, error: self.status_var.set(f"Pre-warm failed: {error}")
+        )
+
+    def _on_load_progress(self, fraction):
+        # Keep the status bar alive while large files stream in
+        self.status_var.set(f"Loading dataset... {fraction:.0%}")
+        self.root.update_idletasks()
+
+    def update_data_preview(self):
+        # Only the visible window of rows is ever inserted into the Treeview
+        self.preview.set_data(self.dataset)
 
     def train_model(self):
         if self.dataset is None:
@@ -331,7 +828,7 @@ class MLApp:
             return
         
         # Get selected columns
-        self.selected_inputs = [self.input_listbox.get(i) for i in self.input_listbox.curselection()]
+        self.selected_inputs = self.column_picker.selection()
         selected_output = self.output_var.get()
         
         if not self.selected_inputs or not selected_output:
@@ -343,71 +840,625 @@ class MLApp:
             messagebox.showerror("Error", "Select a model first!")
             return
         
-        try:
-            X = self.dataset[self.selected_inputs]
-            y = self.dataset[selected_output]
-            
-            # Split data
-            self.X_train, self.X_test, self.y_train, self.y_test = train_test_split(
-                X, y, test_size=0.2, random_state=42
+        incremental = self.incremental_var.get()
+        if incremental and model_name not in INCREMENTAL_MODELS:
+            messagebox.showerror("Error", f"{model_name} cannot be trained out-of-core. Use one of: {', '.join(INCREMENTAL_MODELS)}")
+            return
+        
+        # Fit on a worker thread so the window keeps repainting
+        self._begin_training()
+        if incremental:
+            self.train_job = self.jobs.submit(
+                self._run_incremental_training, model_name, self.dataset_path,
+                list(self.selected_inputs), selected_output,
+                on_done=self._on_training_done,
+                on_error=self._on_training_error,
+                on_progress=self._on_incremental_progress,
+                on_cancel=self._on_training_cancelled
             )
-            
-            # Train model
-            self.model = train_model(model_name, self.X_train, self.y_train)
-            accuracy = calculate_accuracy(self.model, self.X_test, self.y_test)
-            
-            # Update UI
-            self.accuracy_var.set(f"Accuracy: {accuracy:.2%}")
-            self.train_status.config(text="✅ Trained", bootstyle="success")
-            self.btn_predict.config(state=tk.NORMAL)
+        elif self.progressive_var.get():
+            self.train_job = self.jobs.submit(
+                self._run_progressive_training, model_name, self.dataset, list(self.selected_inputs),
+                selected_output, self.plateau_var.get(),
+                on_done=self._on_training_done,
+                on_error=self._on_training_error,
+                on_progress=self._on_progressive_step,
+                on_cancel=self._on_training_cancelled
+            )
+        else:
+            self.train_job = self.jobs.submit(
+                self._run_training, model_name, self.dataset, list(self.selected_inputs), selected_output,
+                on_done=self._on_training_done,
+                on_error=self._on_training_error,
+                on_progress=self._on_training_progress,
+                on_cancel=self._on_training_cancelled
+            )
+        self._tick_training()
+
+    def _begin_training(self):
+        self.learning_curve = []
+        self.btn_train.config(state=tk.DISABLED)
+        self.btn_compare.config(state=tk.DISABLED)
+        self.btn_tune.config(state=tk.DISABLED)
+        self.btn_cancel_train.config(state=tk.NORMAL)
+        self.train_progress.start(15)
+        self.train_status.config(text="⏳ Training...", bootstyle="info")
+
+    def compare_all_models(self):
+        if self.dataset is None:
+            messagebox.showerror("Error", "No dataset loaded!")
+            return
+        
+        selected_inputs = self.column_picker.selection()
+        selected_output = self.output_var.get()
+        if not selected_inputs or not selected_output:
+            messagebox.showerror("Error", "Select input features AND target column!")
+            return
+        
+        self.btn_train.config(state=tk.DISABLED)
+        self.btn_compare.config(state=tk.DISABLED)
+        self.btn_tune.config(state=tk.DISABLED)
+        self.btn_cancel_train.config(state=tk.NORMAL)
+        self.train_progress.start(15)
+        self.train_status.config(text="⏳ Comparing...", bootstyle="info")
+        self.train_job = self.jobs.submit(
+            self._run_comparison, self.dataset, selected_inputs, selected_output,
+            on_done=self._on_comparison_done,
+            on_error=self._on_training_error,
+            on_progress=self._on_training_progress,
+            on_cancel=self._on_training_cancelled
+        )
+        self._tick_training()
+
+    def _run_comparison(self, job, dataset, inputs, output):
+        # Same encoding and split as single-model training so the numbers are comparable
+        job.report("Preprocessing")
+        prepared = self._prepare(dataset, inputs, output)
+        X, y = prepared["X"], prepared["y"]
+        X_train, X_test = X[prepared["train_idx"]], X[prepared["test_idx"]]
+        y_train, y_test = y[prepared["train_idx"]], y[prepared["test_idx"]]
+        job.check()
+        finished = []
+        
+        def on_result(result):
+            finished.append(result["model"])
+            job.report(f"Finished {len(finished)}/{len(MODEL_NAMES)} ({result['model']})")
+        
+        with PROFILER.stage("compare_models", rows=len(X_train), cols=X_train.shape[1]):
+            results = compare_models(
+                X_train, X_test, y_train, y_test,
+                on_result=on_result,
+                should_stop=lambda: job.cancelled
+            )
+        job.check()
+        return results
+
+    def _on_comparison_done(self, job, results):
+        if job is not self.train_job:
+            return
+        self._finish_training()
+        self.train_status.config(text="✅ Compared", bootstyle="success")
+        self.status_var.set(f"Compared {len(results)} models in {job.elapsed:.1f}s")
+        self.update_profile_summary()
+        
+        rows = []
+        for r in results:
+            if "error" in r:
+                rows.append((r["model"], "failed", "", "", r["error"]))
+            else:
+                rows.append((
+                    r["model"],
+                    f"{r['accuracy']:.4f}",
+                    f"{r['fit_time']:.3f}",
+                    f"{r['predict_time']:.3f}",
+                    f"{r['peak_memory'] / 1024 ** 2:.1f}" if r["peak_memory"] is not None else "n/a"
+                ))
+        self.show_table_window(
+            "Model Leaderboard",
+            ["Model", "Accuracy", "Fit (s)", "Predict (s)", "Peak Mem (MB)"],
+            rows
+        )
+
+    def tune_selected_model(self):
+        if self.dataset is None:
+            messagebox.showerror("Error", "No dataset loaded!")
+            return
+        
+        self.selected_inputs = self.column_picker.selection()
+        selected_output = self.output_var.get()
+        if not self.selected_inputs or not selected_output:
+            messagebox.showerror("Error", "Select input features AND target column!")
+            return
+        
+        model_name = self.model_var.get()
+        if not model_name:
+            messagebox.showerror("Error", "Select a model first!")
+            return
+        
+        self.btn_train.config(state=tk.DISABLED)
+        self.btn_compare.config(state=tk.DISABLED)
+        self.btn_tune.config(state=tk.DISABLED)
+        self.btn_cancel_train.config(state=tk.NORMAL)
+        self.train_progress.start(15)
+        self.train_status.config(text="⏳ Tuning...", bootstyle="info")
+        self.learning_curve = []
+        self.train_job = self.jobs.submit(
+            self._run_tuning, model_name, self.dataset, list(self.selected_inputs), selected_output,
+            on_done=self._on_tuning_done,
+            on_error=self._on_training_error,
+            on_progress=self._on_training_progress,
+            on_cancel=self._on_training_cancelled
+        )
+        self._tick_training()
+
+    def _run_tuning(self, job, model_name, dataset, inputs, output):
+        from tuning import tune_model
+        
+        # Cross-validated search on the training rows, the test rows stay untouched for the final score
+        job.report("Preprocessing")
+        prepared = self._prepare(dataset, inputs, output)
+        preprocessor = prepared["preprocessor"]
+        X = prepared["X"]
+        y = model_target(model_name, prepared["y"], preprocessor)
+        X_train, X_test = X[prepared["train_idx"]], X[prepared["test_idx"]]
+        y_train, y_test = y[prepared["train_idx"]], y[prepared["test_idx"]]
+        job.check()
+        
+        def on_round(p):
+            job.report(
+                f"Tuning round {p['round']}/{p['rounds']}: best CV score {p['best_score']:.4f} "
+                f"on {p['rows']:,} rows"
+            )
+        
+        with PROFILER.stage("tune_model", rows=len(X_train), cols=X_train.shape[1]):
+            model, params, table = tune_model(
+                model_name, X_train, y_train,
+                budget=TUNE_BUDGET_SECONDS,
+                progress=on_round,
+                should_stop=lambda: job.cancelled
+            )
+        job.check()
+        job.report("Evaluating")
+        y_pred = self.predictions.predictions(model, "test", X_test)
+        accuracy = calculate_accuracy(model, X_test, y_test, y_pred=y_pred)
+        split = (X_train, X_test, y_train, y_test)
+        return (model_name, model, accuracy, split, preprocessor, X, False), params, table
+
+    def _on_tuning_done(self, job, result):
+        if job is not self.train_job:
+            return
+        from tuning import format_params
+        
+        training, params, table = result
+        self._on_training_done(job, training)
+        self.train_status.config(text="✅ Tuned", bootstyle="success")
+        self.status_var.set(
+            f"{training[0]} tuned in {job.elapsed:.1f}s | {format_params(params)} | Test Accuracy: {training[2]:.2%}"
+        )
+        rows = [
+            (row["round"], row["rows"], f"{row['score']:.4f}", f"{row['std']:.4f}",
+             f"{row['fit_time']:.3f}", format_params(row["params"]))
+            for row in table
+        ]
+        self.show_table_window(
+            f"Tuning Results - {training[0]}",
+            ["Round", "Rows", "CV Score", "Std", "Fit (s)", "Parameters"],
+            rows
+        )
+
+    def show_table_window(self, title, columns, rows):
+        window = tb.Toplevel(self.root)
+        window.title(f"{title} - ML Visualization")
+        window.geometry("700x300")
+        
+        tree = ttk.Treeview(window, show="headings", columns=columns)
+        tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        for col in columns:
+            tree.heading(col, text=col, anchor=tk.W, command=lambda c=col: self._sort_table(tree, c, False))
+            tree.column(col, anchor=tk.W, width=120, stretch=tk.YES)
+        for row in rows:
+            tree.insert("", tk.END, values=row)
+        return window
+
+    def _sort_table(self, tree, col, descending):
+        # Numeric columns sort by value, text (and failed rows) after them
+        def key(item):
+            value = tree.set(item, col)
+            try:
+                return (0, float(value))
+            except ValueError:
+                return (1, value)
+        
+        items = sorted(tree.get_children(""), key=key, reverse=descending)
+        for index, item in enumerate(items):
+            tree.move(item, "", index)
+        tree.heading(col, command=lambda: self._sort_table(tree, col, not descending))
+
+    def _prepare(self, dataset, inputs, output):
+        # Encoded features and split, computed once per feature selection (worker thread)
+        with PROFILER.stage("preprocess", rows=len(dataset), cols=len(inputs)):
+            return self.prepared.get(dataset, inputs, output, test_size=0.2, random_state=42)
+
+    def _model_cache_key(self, prepared, dataset, inputs, output, model_name):
+        if "fingerprint" not in prepared:
+            prepared["fingerprint"] = f"{fingerprint_frame(dataset[inputs])}:{fingerprint_frame(dataset[[output]])}"
+        return model_cache_key(
+            prepared["fingerprint"], inputs, output, model_name,
+            params={"preprocessing": prepared["preprocessor"].feature_names}
+        )
+
+    def _run_training(self, job, model_name, dataset, inputs, selected_output):
+        # Runs on the worker thread: no Tk calls in here
+        job.report("Preprocessing")
+        prepared = self._prepare(dataset, inputs, selected_output)
+        preprocessor = prepared["preprocessor"]
+        X = prepared["X"]
+        y = model_target(model_name, prepared["y"], preprocessor)
+        X_train, X_test = X[prepared["train_idx"]], X[prepared["test_idx"]]
+        y_train, y_test = y[prepared["train_idx"]], y[prepared["test_idx"]]
+        job.check()
+        
+        # Same data, columns, model and split as an earlier run: reuse that fit
+        job.report("Checking model cache")
+        key = self._model_cache_key(prepared, dataset, inputs, selected_output, model_name)
+        cached = self.model_cache.get(key)
+        split = (X_train, X_test, y_train, y_test)
+        if cached is not None:
+            return model_name, cached["model"], cached["accuracy"], split, preprocessor, X, True
+        
+        job.report(f"Fitting {model_name}")
+        with PROFILER.stage("train_model", rows=len(X_train), cols=X_train.shape[1]):
+            model = train_model(model_name, X_train, y_train)
+        job.check()
+        job.report("Evaluating")
+        with PROFILER.stage("calculate_accuracy", rows=len(X_test), cols=X_test.shape[1]):
+            y_pred = self.predictions.predictions(model, "test", X_test)
+            accuracy = calculate_accuracy(model, X_test, y_test, y_pred=y_pred)
+        self.model_cache.put(key, {"model": model, "accuracy": accuracy})
+        return model_name, model, accuracy, split, preprocessor, X, False
+
+    def _run_progressive_training(self, job, model_name, dataset, inputs, output, stop_on_plateau):
+        # Each step's model is handed to the Tk thread as soon as it is fitted
+        job.report("Preprocessing")
+        prepared = self._prepare(dataset, inputs, output)
+        preprocessor = prepared["preprocessor"]
+        X = prepared["X"]
+        y = model_target(model_name, prepared["y"], preprocessor)
+        X_train, X_test = X[prepared["train_idx"]], X[prepared["test_idx"]]
+        y_train, y_test = y[prepared["train_idx"]], y[prepared["test_idx"]]
+        split = (X_train, X_test, y_train, y_test)
+        job.check()
+        
+        key = self._model_cache_key(prepared, dataset, inputs, output, model_name)
+        cached = self.model_cache.get(key)
+        if cached is not None:
+            return model_name, cached["model"], cached["accuracy"], split, preprocessor, X, True
+        
+        def on_step(step):
+            job.report(dict(step, model_name=model_name, preprocessor=preprocessor, X_all=X, split=split))
+        
+        with PROFILER.stage("train_progressive", rows=len(X_train), cols=X_train.shape[1]):
+            history = train_progressive(
+                model_name, X_train, y_train, X_test, y_test,
+                plateau=PLATEAU_TOLERANCE if stop_on_plateau else None,
+                on_step=on_step,
+                should_stop=lambda: job.cancelled
+            )
+        job.check()
+        model = history[-1]["model"]
+        job.report("Evaluating")
+        y_pred = self.predictions.predictions(model, "test", X_test)
+        accuracy = calculate_accuracy(model, X_test, y_test, y_pred=y_pred)
+        if history[-1]["fraction"] == 1:
+            # Only the full fit is the same model plain training would produce
+            self.model_cache.put(key, {"model": model, "accuracy": accuracy})
+        return model_name, model, accuracy, split, preprocessor, X, False
+
+    def _on_progressive_step(self, job, message):
+        if job is not self.train_job:
+            return
+        if isinstance(message, str):
+            self._on_training_progress(job, message)
+            return
+        # Provisional model: usable for predictions and plots while larger samples are fitted
+        first = not self.learning_curve
+        if self.model is not None and self.model is not message["model"]:
+            self.predictions.clear(self.model)
+            # Surfaces hold tiles of the earlier step's model
+            self.surfaces.clear()
+        self.learning_curve.append((message["rows"], message["accuracy"]))
+        self.model = message["model"]
+        self.model_version += 1
+        self.model_name = message["model_name"]
+        self.preprocessor = message["preprocessor"]
+        self.X_all = message["X_all"]
+        self.X_train, self.X_test, self.y_train, self.y_test = message["split"]
+        self.accuracy_var.set(
+            f"Accuracy: {message['accuracy']:.2%} ({message['fraction']:.0%} of rows, refining)"
+        )
+        self.btn_predict.config(state=tk.NORMAL)
+        self.btn_predict_file.config(state=tk.NORMAL)
+        if first:
             self.setup_prediction_inputs()
-            self.status_var.set(f"Trained {model_name} | Test Accuracy: {accuracy:.2%}")
-        except Exception as e:
-            self.train_status.config(text="❌ Failed", bootstyle="danger")
-            messagebox.showerror("Error", f"Model training failed: {str(e)}")
+        self.status_var.set(
+            f"Step {message['step']}: fitted {message['rows']:,} rows in {message['fit_time']:.2f}s "
+            f"({job.elapsed:.1f}s total)"
+        )
+
+    def _run_incremental_training(self, job, model_name, file_path, inputs, output):
+        with PROFILER.stage("train_incremental", cols=len(inputs)):
+            model, accuracy = train_incremental(
+                model_name, file_path, inputs, output,
+                progress=job.report,
+                should_stop=lambda: job.cancelled
+            )
+        job.check()
+        if accuracy is None:
+            raise ValueError("Not enough rows to hold out a validation sample")
+        # Out-of-core models scale raw numeric inputs inside their own pipeline
+        return model_name, model, accuracy, (None, None, None, None), None, None, False
+
+    def _on_incremental_progress(self, job, message):
+        if job is not self.train_job:
+            return
+        if message["accuracy"] is not None:
+            self.accuracy_var.set(f"Accuracy: {message['accuracy']:.2%} (running)")
+        self.status_var.set(
+            f"Streaming training... {message['fraction']:.0%} | {message['rows']:,} rows ({job.elapsed:.1f}s)"
+        )
+
+    def _tick_training(self):
+        # Elapsed-time readout while the job is running
+        job = self.train_job
+        if job is None or job.future.done():
+            return
+        self.train_status.config(text=f"⏳ Training... {job.elapsed:.1f}s")
+        self.root.after(100, self._tick_training)
+
+    def _on_training_progress(self, job, message):
+        if job is self.train_job:
+            self.status_var.set(f"{message}... ({job.elapsed:.1f}s)")
+
+    def _on_training_done(self, job, result):
+        if job is not self.train_job:
+            return
+        self._finish_training()
+        model_name, model, accuracy, split, preprocessor, X_all, from_cache = result
+        # Only the current model's predictions are worth keeping
+        if self.model is not None and self.model is not model:
+            self.predictions.clear(self.model)
+            self.surfaces.clear()
+        self.model = model
+        self.model_version += 1
+        self.model_name = model_name
+        self.preprocessor = preprocessor
+        self.X_all = X_all
+        self.X_train, self.X_test, self.y_train, self.y_test = split
+        if self.learning_curve:
+            # Last point on the full test split instead of the evaluation sample
+            self.learning_curve[-1] = (self.learning_curve[-1][0], accuracy)
+        
+        # Update UI
+        self.accuracy_var.set(f"Accuracy: {accuracy:.2%}")
+        self.train_status.config(text="✅ Trained", bootstyle="success")
+        self.btn_predict.config(state=tk.NORMAL)
+        self.btn_predict_file.config(state=tk.NORMAL)
+        self.setup_prediction_inputs()
+        self.setup_surface_axes()
+        self._refresh_prediction()
+        source = "loaded from cache" if from_cache else "trained"
+        self.status_var.set(f"{model_name} {source} in {job.elapsed:.1f}s | Test Accuracy: {accuracy:.2%}")
+        self.update_profile_summary()
+
+    def _on_training_error(self, job, error):
+        if job is not self.train_job:
+            return
+        self._finish_training()
+        self.train_status.config(text="❌ Failed", bootstyle="danger")
+        messagebox.showerror("Error", f"Model training failed: {str(error)}")
+
+    def _on_training_cancelled(self, job):
+        if job is not self.train_job:
+            return
+        self._finish_training()
+        self.train_status.config(text="🟠 Cancelled", bootstyle="warning")
+        self.status_var.set("Training cancelled")
+
+    def _finish_training(self):
+        self.train_job = None
+        self.train_progress.stop()
+        self.btn_train.config(state=tk.NORMAL)
+        self.btn_compare.config(state=tk.NORMAL)
+        self.btn_tune.config(state=tk.NORMAL)
+        self.btn_cancel_train.config(state=tk.DISABLED)
+
+    def cancel_training(self):
+        if self.train_job is not None:
+            self.train_job.cancel()
+            self.status_var.set("Cancelling training...")
 
     def setup_prediction_inputs(self):
-        # Clear previous inputs
-        for widget in self.left_col.winfo_children():
-            widget.destroy()
-        for widget in self.right_col.winfo_children():
-            widget.destroy()
-        self.input_entries = []
-        
-        # Create input fields in 2 columns
-        half = len(self.selected_inputs) // 2
-        if len(self.selected_inputs) % 2 != 0:
-            half += 1
-        
-        for i, col in enumerate(self.selected_inputs):
-            # Choose left or right column
-            col_frame = self.left_col if i < half else self.right_col
-            
-            frame = tb.Frame(col_frame)
-            frame.pack(fill=tk.X, pady=2)
-            
-            tb.Label(frame, text=f"{col}:", width=15, anchor=tk.W).pack(side=tk.LEFT)
-            entry = tb.Entry(frame)
-            entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
-            self.input_entries.append(entry)
+        # Retraining on the same inputs keeps what was typed
+        if self.prediction_form.fields != list(self.selected_inputs):
+            self.prediction_form.set_fields(self.selected_inputs)
+
+    def _column_stats(self, col):
+        if self.profile is None:
+            return None
+        return self.profile["columns"].get(str(col))
+
+    def _check_input(self, col, text):
+        # Checked against the profile as the user types; no data is scanned
+        return check_value(self._column_stats(col), text)
+
+    def _on_plot_selected(self, *_):
+        self.interactive_plot_var.set(self.plot_var.get() in ZOOMABLE_PLOTS)
+
+    def _on_target_selected(self, event=None):
+        # Suggest a model and plot for the kind of target, unless the user already picked one
+        stats = self._column_stats(self.output_var.get())
+        if stats is None:
+            return
+        if not self.model_var.get():
+            self.model_var.set(suggest_model(stats))
+        if not self.plot_var.get():
+            self.plot_var.set(suggest_plot(stats))
+        self.status_var.set(f"Target {self.output_var.get()}: {describe(stats)}")
+
+    def _top_correlated(self, k):
+        # Ranks on the background worker; wide datasets take a moment
+        target = self.output_var.get()
+        if self.dataset is None or not target:
+            messagebox.showerror("Error", "Load data and select the target column first!")
+            return
+        
+        def rank(job, dataset):
+            with PROFILER.stage("top_correlated", cols=dataset.shape[1]):
+                return top_correlated(dataset, target, k)
+        
+        def on_done(job, columns):
+            if dataset is not self.dataset:
+                return
+            self.column_picker.select(columns)
+            self.status_var.set(f"Selected the {len(columns)} columns most correlated with {target}")
+        
+        dataset = self.dataset
+        self.status_var.set(f"Ranking columns by correlation with {target}...")
+        self.background.submit(
+            rank, dataset, on_done=on_done,
+            on_error=lambda job, e: messagebox.showerror("Error", f"Correlation failed: {e}")
+        )
 
     def make_prediction(self):
         try:
-            # Get values from input fields
-            input_values = []
-            for entry, col in zip(self.input_entries, self.selected_inputs):
-                val = entry.get()
-                if not val:
-                    raise ValueError(f"Missing value for {col}")
-                input_values.append(float(val))
-            
-            # Make prediction
-            prediction = self.model.predict([input_values])[0]
-            self.prediction_result.config(text=f"Prediction: {prediction}")
-            self.status_var.set(f"Prediction: {prediction}")
+            text = self._predict_form()
+            self.prediction_result.config(text=text)
+            self.status_var.set(text)
         except Exception as e:
             messagebox.showerror("Error", f"Prediction failed: {str(e)}")
 
+    def _predict_form(self):
+        # Get values from input fields
+        values = self.prediction_form.get_values()
+        problems = self.prediction_form.problems()
+        if problems:
+            raise ValueError("; ".join(f"{col} {message}" for col, message in problems))
+        if self.preprocessor is not None:
+            # Blank fields are imputed, categorical fields take their label as typed
+            X = self.preprocessor.transform_row(values)
+        else:
+            for col, val in values.items():
+                if not val:
+                    raise ValueError(f"Missing value for {col}")
+            X = [[float(values[col]) for col in self.selected_inputs]]
+        
+        # Make prediction
+        prediction = self.model.predict(X)[0]
+        text = f"Prediction: {prediction}"
+        if (self.preprocessor is not None and self.model_name in REGRESSION_MODELS
+                and self.preprocessor.target_classes is not None):
+            text += f" (nearest class: {self.preprocessor.decode_target([prediction])[0]})"
+        return text
+
+    def _refresh_prediction(self):
+        # A shown prediction is redone with the new model after retraining or a watch-mode update
+        if self.prediction_result.cget("text") == "Prediction: N/A":
+            return
+        try:
+            self.prediction_result.config(text=self._predict_form())
+        except Exception:
+            self.prediction_result.config(text="Prediction: N/A")
+
+    def predict_file(self):
+        # A second click while a file is being scored cancels it
+        if self.batch_job is not None:
+            self.batch_job.cancel()
+            return
+        
+        input_path = filedialog.askopenfilename(filetypes=[("CSV", "*.csv"), ("Excel", "*.xlsx")])
+        if not input_path:
+            return
+        output_path = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[("CSV", "*.csv")],
+            initialfile="predictions.csv"
+        )
+        if not output_path:
+            return
+        
+        try:
+            n_jobs = max(1, int(self.batch_workers_var.get()))
+        except (tk.TclError, ValueError):
+            n_jobs = 1
+        self.btn_predict_file.config(text="Cancel Batch", bootstyle="danger-outline")
+        self.batch_job = self.jobs.submit(
+            self._run_batch_prediction, self.model, self.preprocessor, input_path, output_path,
+            list(self.selected_inputs), n_jobs,
+            on_done=self._on_batch_done,
+            on_error=self._on_batch_error,
+            on_progress=self._on_batch_progress,
+            on_cancel=self._on_batch_cancelled
+        )
+
+    def _run_batch_prediction(self, job, model, preprocessor, input_path, output_path, inputs, n_jobs):
+        rows = predict_file(
+            model, input_path, output_path, inputs,
+            n_jobs=n_jobs,
+            preprocessor=preprocessor,
+            progress=lambda done, fraction: job.report((done, fraction)),
+            should_stop=lambda: job.cancelled
+        )
+        job.check()
+        return rows, output_path
+
+    def _on_batch_progress(self, job, message):
+        if job is not self.batch_job:
+            return
+        done, fraction = message
+        rate = done / job.elapsed if job.elapsed else 0
+        self.status_var.set(f"Scoring file... {fraction:.0%} | {done:,} rows | {rate:,.0f} rows/s")
+
+    def _on_batch_done(self, job, result):
+        if job is not self.batch_job:
+            return
+        self._finish_batch()
+        rows, output_path = result
+        self.status_var.set(f"Scored {rows:,} rows in {job.elapsed:.1f}s -> {output_path}")
+
+    def _on_batch_error(self, job, error):
+        if job is not self.batch_job:
+            return
+        self._finish_batch()
+        messagebox.showerror("Error", f"Batch prediction failed: {str(error)}")
+
+    def _on_batch_cancelled(self, job):
+        if job is not self.batch_job:
+            return
+        self._finish_batch()
+        self.status_var.set("Batch prediction cancelled, output file is incomplete")
+
+    def _finish_batch(self):
+        self.batch_job = None
+        self.btn_predict_file.config(text="Predict File", bootstyle="primary-outline")
+
+    def setup_surface_axes(self):
+        numeric = self.preprocessor.numeric if self.preprocessor is not None else self.selected_inputs
+        for combobox, variable, default in ((self.surface_x_dropdown, self.surface_x_var, 0),
+                                            (self.surface_y_dropdown, self.surface_y_var, 1)):
+            combobox["values"] = numeric
+            if variable.get() not in numeric:
+                variable.set(numeric[default] if len(numeric) > default else "")
+
+    def _surface(self, x_col, y_col):
+        from surface import DecisionSurface
+
+        key = (x_col, y_col, self.data_version)
+        if key not in self.surfaces:
+            self.surfaces[key] = DecisionSurface(
+                self.model, self.dataset, list(self.selected_inputs), x_col, y_col, preprocessor=self.preprocessor
+            )
+        return self.surfaces[key]
+
     def generate_plot_window(self):
         if self.dataset is None or self.model is None:
             messagebox.showerror("Error", "Load data and train a model first!")
@@ -418,66 +1469,167 @@ class MLApp:
             messagebox.showerror("Error", "Select a plot type first!")
             return
         
+        selected_output = self.output_var.get()
+        interactive = self.interactive_plot_var.get()
+        history = list(self.learning_curve)
+        surface = None
+        if plot_name == "Decision Surface":
+            try:
+                surface = self._surface(self.surface_x_var.get(), self.surface_y_var.get())
+            except ValueError as e:
+                messagebox.showerror("Error", str(e))
+                return
+        key = (
+            plot_name, self.model_version, tuple(self.selected_inputs), selected_output, self.data_version,
+            tuple(history) if plot_name == "Learning Curve" else None,
+            (surface.x_col, surface.y_col) if surface is not None else None
+        )
+        if not interactive:
+            png = self.render_cache.get(key)
+            if png is not None:
+                self._show_plot(plot_name, png, interactive, cached=True)
+                return
+        
+        # A newer request replaces one still rendering
+        if self.plot_job is not None:
+            self.plot_job.cancel()
+        self.status_var.set(f"Rendering {plot_name}...")
+        self.plot_job = self.plot_jobs.submit(
+            self._render_plot, plot_name, key, interactive, self.model, self.dataset,
+            list(self.selected_inputs), selected_output, self.X_all, history, surface,
+            on_done=lambda job, result: self._on_plot_done(job, plot_name, interactive, result),
+            on_error=self._on_plot_error,
+            on_cancel=lambda job: None
+        )
+
+    def _render_plot(self, job, plot_name, key, interactive, model, dataset, inputs, output, X_all, history, surface):
+        # Worker thread: builds the Figure and, unless interactive, rasterizes it with Agg
+        from plots import generate_plot, render_png
+        
+        predictions = None
+        if plot_name == "Confusion Matrix":
+            # Full-dataset predictions are computed once per model and reused
+            predictions = self.predictions.predictions(model, "all", X_all if X_all is not None else dataset[inputs])
+        job.check()
+        with PROFILER.stage("generate_plot", rows=len(dataset), cols=len(inputs)):
+            fig = generate_plot(plot_name, model, dataset, inputs, output,
+                                predictions=predictions, history=history, surface=surface)
+        job.check()
+        if interactive:
+            return fig
+        with PROFILER.stage("render_png"):
+            png = render_png(fig)
+        self.render_cache.put(key, png)
+        return png
+
+    def _on_plot_done(self, job, plot_name, interactive, result):
+        if job is not self.plot_job:
+            return
+        self.plot_job = None
         try:
-            # Create plot window
-            if self.plot_window and self.plot_window.winfo_exists():
-                self.plot_window.destroy()
-                
-            self.plot_window = tb.Toplevel(self.root)
-            self.plot_window.title(f"{plot_name} - ML Visualization")
-            self.plot_window.geometry("900x700")
-            
-            # Generate plot
-            selected_output = self.output_var.get()
-            fig = generate_plot(
-                plot_name, 
-                self.model, 
-                self.dataset, 
-                self.selected_inputs, 
-                selected_output
-            )
+            self._show_plot(plot_name, result, interactive, cached=False, elapsed=job.elapsed)
+        except Exception as e:
+            messagebox.showerror("Error", f"Plot generation failed: {str(e)}")
+
+    def _on_plot_error(self, job, error):
+        if job is not self.plot_job:
+            return
+        self.plot_job = None
+        messagebox.showerror("Error", f"Plot generation failed: {str(error)}")
+
+    def _show_plot(self, plot_name, result, interactive, cached, elapsed=None):
+        # Create plot window
+        if self.plot_window and self.plot_window.winfo_exists():
+            self.plot_window.destroy()
+        
+        self.plot_window = tb.Toplevel(self.root)
+        self.plot_window.title(f"{plot_name} - ML Visualization")
+        self.plot_window.geometry("900x700")
+        
+        if interactive:
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
             
-            # Create canvas
-            canvas = FigureCanvasTkAgg(fig, master=self.plot_window)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+            canvas = FigureCanvasTkAgg(result, master=self.plot_window)
+            with PROFILER.stage("canvas_draw"):
+                canvas.draw()
             
             # Add navigation toolbar
             toolbar = NavigationToolbar2Tk(canvas, self.plot_window)
             toolbar.update()
             canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-            
-            self.status_var.set(f"Generated {plot_name} plot in new window")
-        except Exception as e:
-            messagebox.showerror("Error", f"Plot generation failed: {str(e)}")
+        else:
+            # Tk only decodes the finished PNG
+            image = tk.PhotoImage(master=self.plot_window, data=result)
+            label = tk.Label(self.plot_window, image=image)
+            label.image = image
+            label.pack(fill=tk.BOTH, expand=True)
+        
+        if cached:
+            self.status_var.set(f"Showing {plot_name} plot (cached)")
+        else:
+            self.status_var.set(f"Generated {plot_name} plot in {elapsed:.1f}s")
+        self.update_profile_summary()
 
-    def reset_app(self):
-        # Reset all variables and UI
-        self.dataset = None
+    def _clear_model(self):
+        # Drops the trained model and everything derived from it: on reset, and when another file
+        # is loaded, since the encoded features and splits belong to the earlier data.
+        # A batch prediction keeps running, it holds its own model and writes its own file.
+        if self.train_job is not None:
+            self.train_job.cancel()
+            self._finish_training()
         self.model = None
+        self.model_version += 1
+        self.model_name = None
+        self.predictions.clear()
+        self.prepared.clear()
+        self.preprocessor = None
+        self.X_all = None
+        self.learning_curve = []
+        if self.plot_job is not None:
+            self.plot_job.cancel()
+            self.plot_job = None
+        self.surfaces.clear()
+        self.surface_x_var.set("")
+        self.surface_y_var.set("")
+        if self.server is not None:
+            self.serving_var.set(False)
+            self.toggle_server()
         self.X_train, self.X_test, self.y_train, self.y_test = None, None, None, None
         self.selected_inputs = []
         
+        self.train_status.config(text="🟠 Not Trained", bootstyle="warning")
+        self.accuracy_var.set("Accuracy: N/A")
+        self.prediction_result.config(text="Prediction: N/A")
+        self.prediction_form.clear()
+        self.btn_predict.config(state=tk.DISABLED)
+        if self.batch_job is None:
+            self.btn_predict_file.config(state=tk.DISABLED)
+
+    def reset_app(self):
+        # Stop any running job first so its result is discarded
+        self.watch_var.set(False)
+        self._stop_watch()
+        self._clear_model()
+        
+        # Reset all variables and UI
+        self.dataset = None
+        self.dataset_path = None
+        self.dataset_size = None
+        self.profile = None
+        self.render_cache.clear()
+        
         # Reset UI elements
         self.label_file.config(text="No file selected")
-        self.input_listbox.delete(0, tk.END)
+        self.column_picker.clear()
         self.output_var.set("")
         self.model_var.set("")
         self.plot_var.set("")
-        self.train_status.config(text="🟠 Not Trained", bootstyle="warning")
-        self.accuracy_var.set("Accuracy: N/A")
-        self.prediction_result.config(text="Prediction: N/A")
-        self.tree.delete(*self.tree.get_children())
+        self.preview.clear()
         
-        # Clear prediction inputs
-        for widget in self.left_col.winfo_children():
-            widget.destroy()
-        for widget in self.right_col.winfo_children():
-            widget.destroy()
-        self.input_entries = []
-        
-        # Disable prediction button
-        self.btn_predict.config(state=tk.DISABLED)
+        if self.batch_job is not None:
+            self.batch_job.cancel()
+            self._finish_batch()
+        self.btn_predict_file.config(state=tk.DISABLED)
         
         # Close plot window if open
         if self.plot_window and self.plot_window.winfo_exists():
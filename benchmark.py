@@ -0,0 +1,242 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+from datetime import datetime, timezone
+
+import matplotlib
+matplotlib.use("Agg")  # headless: never touch a display
+
+import numpy as np
+import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from sklearn.model_selection import train_test_split
+
+from models import train_model, calculate_accuracy, model_target, MODEL_NAMES
+from plots import generate_plot
+from preprocessing import Preprocessor
+from utils import load_dataset, DEFAULT_CHUNKSIZE
+
+PRESETS = {
+    "quick": {"rows": [10_000, 100_000], "cols": [5, 50], "categorical": [0.0, 0.2]},
+    "full": {
+        "rows": [10_000, 100_000, 1_000_000, 10_000_000],
+        "cols": [5, 50, 500, 5000],
+        "categorical": [0.0, 0.2],
+    },
+}
+STAGES = ["load", "load_streaming", "train", "evaluate", "plot"]
+PLOTS = ["Scatter Plot", "Confusion Matrix"]
+# Models that scale super-linearly are skipped above these row counts unless --ignore-limits
+MODEL_ROW_LIMITS = {"SVM": 50_000}
+# generate_plot predicts on the DataFrame while models are fitted on arrays
+warnings.filterwarnings("ignore", message="X has feature names")
+CATEGORY_VALUES = np.array(["red", "green", "blue", "amber", "violet"])
+
+
+def make_dataset(rows, cols, categorical, seed):
+    # cols features (a `categorical` share of them string-valued) plus a 3-class target
+    rng = np.random.default_rng(seed)
+    n_cat = int(round(cols * categorical))
+    n_num = cols - n_cat
+    numeric = rng.standard_normal((rows, n_num), dtype=np.float64)
+    data = {f"num_{i}": numeric[:, i] for i in range(n_num)}
+    for i in range(n_cat):
+        data[f"cat_{i}"] = CATEGORY_VALUES[rng.integers(0, len(CATEGORY_VALUES), rows)]
+
+    weights = rng.standard_normal(max(n_num, 1))
+    score = numeric @ weights[:n_num] if n_num else rng.standard_normal(rows)
+    score += 0.5 * rng.standard_normal(rows)
+    data["target"] = np.array(["low", "mid", "high"])[np.digitize(score, np.quantile(score, [1 / 3, 2 / 3]))]
+    return pd.DataFrame(data)
+
+
+def measure(fn, repeat):
+    # Median wall/CPU time over `repeat` runs, and the peak traced allocation of one more run:
+    # tracing slows down what it watches, so that run is not timed
+    walls, cpus, result = [], [], None
+    for _ in range(repeat):
+        wall, cpu = time.perf_counter(), time.process_time()
+        result = fn()
+        walls.append(time.perf_counter() - wall)
+        cpus.append(time.process_time() - cpu)
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return result, {
+        "wall_time": statistics.median(walls),
+        "wall_times": walls,
+        "cpu_time": statistics.median(cpus),
+        "peak_memory": peak,
+    }
+
+
+def run_case(rows, cols, categorical, args, workdir):
+    case = {"rows": rows, "cols": cols, "categorical": categorical}
+    results = []
+
+    def record(stage, stats=None, **extra):
+        entry = dict(case, stage=stage, **extra)
+        entry.update(stats or {})
+        results.append(entry)
+        detail = f"{stats['wall_time']:.3f}s" if stats else extra.get("skipped") or f"error: {extra.get('error')}"
+        label = " / ".join(str(extra[k]) for k in ("model", "plot") if k in extra)
+        print(f"  {stage:<15} {label:<45} {detail}", flush=True)
+
+    df = make_dataset(rows, cols, categorical, args.seed)
+    path = os.path.join(workdir, f"bench_{rows}_{cols}_{categorical}.csv")
+    if {"load", "load_streaming"} & set(args.stages):
+        df.to_csv(path, index=False)
+    if "load" in args.stages:
+        _, stats = measure(lambda: load_dataset(path), args.repeat)
+        record("load", stats)
+    if "load_streaming" in args.stages:
+        _, stats = measure(lambda: load_dataset(path, chunksize=DEFAULT_CHUNKSIZE), args.repeat)
+        record("load_streaming", stats)
+    if os.path.exists(path):
+        os.remove(path)
+
+    # Model stages use the numeric features, the estimators take no categorical input
+    inputs = [c for c in df.columns if c.startswith("num_")]
+    if not inputs or not {"train", "evaluate", "plot"} & set(args.stages):
+        return results
+    X_train, X_test, y_train, y_test = train_test_split(
+        df[inputs], df["target"], test_size=0.2, random_state=42
+    )
+    # Regressors are fitted on the labels' codes, as in the app and the CLI
+    target = Preprocessor([]).fit(y_train.to_frame(), "target")
+
+    for model_name in args.models:
+        limit = MODEL_ROW_LIMITS.get(model_name)
+        if limit and rows > limit and not args.ignore_limits:
+            record("train", model=model_name, skipped=f"rows > {limit}")
+            continue
+        fit_y, eval_y = model_target(model_name, y_train, target), model_target(model_name, y_test, target)
+        try:
+            model, stats = measure(lambda: train_model(model_name, X_train, fit_y), args.repeat)
+        except Exception as e:
+            record("train", model=model_name, error=str(e))
+            continue
+        if "train" in args.stages:
+            record("train", stats, model=model_name)
+        if "evaluate" in args.stages:
+            try:
+                accuracy, stats = measure(lambda: calculate_accuracy(model, X_test, eval_y), args.repeat)
+                record("evaluate", stats, model=model_name, accuracy=float(accuracy))
+            except Exception as e:
+                record("evaluate", model=model_name, error=str(e))
+        if "plot" in args.stages:
+            for plot_name in PLOTS:
+                def render():
+                    fig = generate_plot(plot_name, model, df, inputs, "target")
+                    FigureCanvasAgg(fig).draw()
+                try:
+                    _, stats = measure(render, args.repeat)
+                    record("plot", stats, model=model_name, plot=plot_name)
+                except Exception as e:
+                    record("plot", model=model_name, plot=plot_name, error=str(e))
+    return results
+
+
+def environment():
+    import sklearn
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": commit,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "sklearn": sklearn.__version__,
+        "matplotlib": matplotlib.__version__,
+    }
+
+
+def compare(results, baseline_path, threshold):
+    # Prints cases that got slower than the baseline by more than `threshold`; returns their count
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+
+    def key(r):
+        return (r["stage"], r["rows"], r["cols"], r["categorical"], r.get("model"), r.get("plot"))
+
+    before = {key(r): r for r in baseline["results"] if "wall_time" in r}
+    regressions = 0
+    for r in results:
+        if "wall_time" not in r:
+            continue
+        old = before.get(key(r))
+        if not old or old["wall_time"] <= 0:
+            continue
+        change = r["wall_time"] / old["wall_time"] - 1
+        if change > threshold:
+            regressions += 1
+            print(f"REGRESSION {key(r)}: {old['wall_time']:.3f}s -> {r['wall_time']:.3f}s (+{change:.0%})")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark load, train, evaluate and plot on synthetic data.")
+    parser.add_argument("--preset", choices=PRESETS, default="quick")
+    parser.add_argument("--rows", type=int, nargs="+", help="row counts (overrides preset)")
+    parser.add_argument("--cols", type=int, nargs="+", help="feature counts (overrides preset)")
+    parser.add_argument("--categorical", type=float, nargs="+", help="share of categorical features (overrides preset)")
+    parser.add_argument("--models", nargs="+", default=MODEL_NAMES, choices=MODEL_NAMES)
+    parser.add_argument("--stages", nargs="+", default=STAGES, choices=STAGES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-cells", type=float, default=5e7, help="skip cases with more rows*cols than this")
+    parser.add_argument("--ignore-limits", action="store_true", help="also run models above MODEL_ROW_LIMITS")
+    parser.add_argument("--output", default="bench_output.json")
+    parser.add_argument("--compare", metavar="BASELINE", help="flag regressions against an earlier JSON report")
+    parser.add_argument("--threshold", type=float, default=0.2, help="relative slowdown counted as a regression")
+    args = parser.parse_args(argv)
+
+    preset = PRESETS[args.preset]
+    grid = [
+        (rows, cols, cat)
+        for rows in args.rows or preset["rows"]
+        for cols in args.cols or preset["cols"]
+        for cat in args.categorical or preset["categorical"]
+    ]
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="ml_viz_bench_") as workdir:
+        for rows, cols, cat in grid:
+            print(f"rows={rows} cols={cols} categorical={cat}", flush=True)
+            if rows * cols > args.max_cells:
+                results.append({"rows": rows, "cols": cols, "categorical": cat, "skipped": "max-cells"})
+                print("  skipped (max-cells)")
+                continue
+            results.extend(run_case(rows, cols, cat, args, workdir))
+
+    report = {"environment": environment(), "arguments": vars(args), "results": results}
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2, default=str)
+    print(f"Wrote {len(results)} results to {args.output}")
+
+    if args.compare:
+        return 1 if compare(results, args.compare, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,259 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+# Root of all on-disk caches, override with ML_VIZ_CACHE_DIR
+CACHE_DIR = os.environ.get(
+    "ML_VIZ_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".ml_viz_cache")
+)
+DATASET_CACHE_DIR = os.path.join(CACHE_DIR, "datasets")
+# Oldest entries are evicted once the dataset cache grows past this, override with ML_VIZ_DATASET_CACHE_MB
+DATASET_CACHE_LIMIT = int(os.environ.get("ML_VIZ_DATASET_CACHE_MB", 2048)) * 1024 * 1024
+# Part of every dataset cache key; bumped when loading starts producing different frames
+# (2: float64 columns are only narrowed to float32 when no value changes)
+DATASET_CACHE_FORMAT = 2
+MODEL_CACHE_DIR = os.path.join(CACHE_DIR, "models")
+# Disk budget for fitted models, override with ML_VIZ_MODEL_CACHE_MB
+MODEL_CACHE_LIMIT = int(os.environ.get("ML_VIZ_MODEL_CACHE_MB", 1024)) * 1024 * 1024
+
+
+def _feather():
+    # pyarrow is optional (caching is simply disabled without it) and only imported on first use
+    try:
+        import pyarrow.feather as feather
+    except ImportError:
+        return None
+    return feather
+
+
+def _digest(*parts):
+    return hashlib.sha1("\0".join(str(part) for part in parts).encode("utf-8")).hexdigest()[:16]
+
+
+def dataset_cache_path(file_path, columns=None, optimized=True, stat=None):
+    # Entries are named <source>-<version>-<variant> so stale versions of a file are easy to find.
+    # stat: os.stat of the file as it was when parsed, for files that may grow meanwhile
+    file_path = os.path.abspath(file_path)
+    if stat is None:
+        stat = os.stat(file_path)
+    source = _digest(file_path)
+    version = _digest(stat.st_size, stat.st_mtime_ns)
+    variant = _digest(DATASET_CACHE_FORMAT, optimized, sorted(columns) if columns else None)
+    return os.path.join(DATASET_CACHE_DIR, f"{source}-{version}-{variant}.feather")
+
+
+def read_cached_dataset(file_path, columns=None, optimized=True, stat=None):
+    # Returns the cached frame or None; a full-width entry also serves any projection
+    feather = _feather()
+    if feather is None:
+        return None
+    candidates = [dataset_cache_path(file_path, columns, optimized, stat)]
+    if columns:
+        candidates.append(dataset_cache_path(file_path, None, optimized, stat))
+    for path in candidates:
+        if os.path.exists(path):
+            try:
+                # Uncompressed Feather is memory-mapped instead of copied into RAM
+                table = feather.read_table(path, columns=list(columns) if columns else None, memory_map=True)
+            except Exception:
+                continue
+            os.utime(path)  # mark as recently used for LRU eviction
+            return table.to_pandas()
+    return None
+
+
+def write_cached_dataset(df, file_path, columns=None, optimized=True, max_bytes=None, stat=None):
+    # Best effort: frames Feather cannot represent are just not cached
+    feather = _feather()
+    if feather is None:
+        return None
+    path = dataset_cache_path(file_path, columns, optimized, stat)
+    os.makedirs(DATASET_CACHE_DIR, exist_ok=True)
+
+    # Drop entries for older versions of the same source file
+    source, version, _ = os.path.basename(path).split("-")
+    for name in os.listdir(DATASET_CACHE_DIR):
+        if name.startswith(source + "-") and not name.startswith(f"{source}-{version}-"):
+            _remove(os.path.join(DATASET_CACHE_DIR, name))
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        feather.write_feather(df.reset_index(drop=True), tmp_path, compression="uncompressed")
+        os.replace(tmp_path, path)
+    except Exception:
+        _remove(tmp_path)
+        return None
+
+    evict(DATASET_CACHE_DIR, DATASET_CACHE_LIMIT if max_bytes is None else max_bytes)
+    return path
+
+
+def read_cached_profile(file_path, columns=None, optimized=True, stat=None):
+    # Column profile stored next to the cached dataset (see column_profile.py), or None
+    path = _profile_path(file_path, columns, optimized, stat)
+    try:
+        with open(path, encoding="utf-8") as f:
+            profile = json.load(f)
+    except (OSError, ValueError):
+        return None
+    os.utime(path)
+    return profile
+
+
+def write_cached_profile(profile, file_path, columns=None, optimized=True, stat=None):
+    path = _profile_path(file_path, columns, optimized, stat)
+    os.makedirs(DATASET_CACHE_DIR, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(profile, f)
+        os.replace(tmp_path, path)
+    except (OSError, TypeError, ValueError):
+        _remove(tmp_path)
+        return None
+    return path
+
+
+def _profile_path(file_path, columns, optimized, stat=None):
+    # Same <source>-<version>- prefix as the dataset, so stale profiles are dropped with it
+    return dataset_cache_path(file_path, columns, optimized, stat)[:-len(".feather")] + ".profile.json"
+
+
+def evict(directory, max_bytes):
+    # Least recently used entries go first until the directory fits the budget
+    if not os.path.isdir(directory):
+        return
+    entries = []
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        if os.path.isfile(path) and not name.endswith(".tmp"):
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        _remove(path)
+        total -= size
+
+
+def fingerprint_frame(df):
+    # Content hash of a frame: vectorized per-row hashes folded into one digest
+    row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    digest = hashlib.blake2b(row_hashes.tobytes(), digest_size=16)
+    digest.update(repr([(str(col), str(dtype)) for col, dtype in df.dtypes.items()]).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def model_cache_key(data_fingerprint, inputs, output, model_name, params=None, test_size=0.2, random_state=42):
+    payload = json.dumps(
+        [data_fingerprint, list(inputs), output, model_name, params or {}, test_size, random_state],
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class ModelCache:
+    # Fitted models keyed by model_cache_key: a small in-memory LRU in front of joblib files on disk
+    def __init__(self, directory=MODEL_CACHE_DIR, max_bytes=MODEL_CACHE_LIMIT, memory_items=8):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.memory_items = memory_items
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.joblib")
+
+    def get(self, key):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        import joblib
+        try:
+            # Uncompressed dumps let joblib memory-map the large arrays (e.g. tree nodes)
+            value = joblib.load(path, mmap_mode="r")
+        except Exception:
+            _remove(path)
+            return None
+        os.utime(path)
+        self._remember(key, value)
+        return value
+
+    def put(self, key, value):
+        import joblib
+        self._remember(key, value)
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            joblib.dump(value, tmp_path)
+            os.replace(tmp_path, path)
+        except Exception:
+            _remove(tmp_path)
+            return
+        evict(self.directory, self.max_bytes)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        evict(self.directory, 0)
+
+    def _remember(self, key, value):
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+
+
+class RenderCache:
+    # Rendered plot images (PNG bytes) in memory, least recently used dropped beyond max_bytes
+    def __init__(self, max_bytes=64 * 1024 ** 2):
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._items:
+                return None
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def put(self, key, data):
+        with self._lock:
+            if key in self._items:
+                self._size -= len(self._items.pop(key))
+            self._items[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes and len(self._items) > 1:
+                _, dropped = self._items.popitem(last=False)
+                self._size -= len(dropped)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._size = 0
+
+
+def clear_dataset_cache():
+    evict(DATASET_CACHE_DIR, 0)
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -0,0 +1,259 @@
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from datetime import datetime, timezone
+
+# Headless entry point: only the data/model modules are imported, never tkinter,
+# ttkbootstrap or matplotlib, so it starts fast on servers without a display.
+from models import train_model, calculate_accuracy, train_incremental, save_model_bundle, model_target, MODEL_NAMES
+from utils import load_dataset, iter_chunks, DEFAULT_CHUNKSIZE
+from preprocessing import prepare_dataset
+from tuning import tune_model
+
+
+def _slug(name):
+    return re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_")
+
+
+def cmd_train(args):
+    models = MODEL_NAMES if args.all_models else args.models
+    if not models:
+        print("error: pass --models or --all-models", file=sys.stderr)
+        return 2
+
+    if args.incremental:
+        if args.tune:
+            print("error: --tune cannot be combined with --incremental", file=sys.stderr)
+            return 2
+        return _train_incremental(args, models)
+
+    columns = args.features + [args.target] if args.features else None
+    start = time.perf_counter()
+    dataset = load_dataset(
+        args.data,
+        columns=columns,
+        chunksize=DEFAULT_CHUNKSIZE,
+        use_cache=not args.no_cache
+    )
+    load_time = time.perf_counter() - start
+
+    features = args.features or [c for c in dataset.columns if c != args.target]
+    if args.target not in dataset.columns:
+        print(f"error: target column {args.target!r} not found", file=sys.stderr)
+        return 2
+
+    # Encoded once, every model trains on the same features and split
+    prepared = prepare_dataset(dataset, features, args.target,
+                               test_size=args.test_size, random_state=args.random_state)
+    preprocessor = prepared["preprocessor"]
+    X_train, X_test = prepared["X"][prepared["train_idx"]], prepared["X"][prepared["test_idx"]]
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    report = {
+        "data": os.path.abspath(args.data),
+        "rows": len(dataset),
+        "features": features,
+        "encoded_features": len(preprocessor.feature_names),
+        "target": args.target,
+        "test_size": args.test_size,
+        "random_state": args.random_state,
+        "load_time": load_time,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "models": [],
+    }
+    failed = 0
+    for model_name in models:
+        entry = {"model": model_name}
+        try:
+            y = model_target(model_name, prepared["y"], preprocessor)
+            y_train, y_test = y[prepared["train_idx"]], y[prepared["test_idx"]]
+            start = time.perf_counter()
+            if args.tune:
+                model, params, table = tune_model(
+                    model_name, X_train, y_train,
+                    cv=args.cv, budget=args.budget, random_state=args.random_state
+                )
+                entry["params"] = params
+                entry["cv_score"] = table[0]["score"]
+                entry["search"] = table
+            else:
+                model = train_model(model_name, X_train, y_train)
+            entry["fit_time"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            entry["accuracy"] = float(calculate_accuracy(model, X_test, y_test))
+            entry["evaluate_time"] = time.perf_counter() - start
+
+            path = os.path.join(args.output_dir, f"{_slug(model_name)}.joblib")
+            save_model_bundle(path, model, model_name, features, args.target, {
+                "accuracy": entry["accuracy"], "fit_time": entry["fit_time"]
+            }, preprocessor=preprocessor)
+            entry["path"] = path
+            print(f"{model_name}: accuracy={entry['accuracy']:.4f} fit={entry['fit_time']:.2f}s -> {path}")
+        except Exception as e:
+            failed += 1
+            entry["error"] = str(e)
+            print(f"{model_name}: FAILED {e}", file=sys.stderr)
+        report["models"].append(entry)
+
+    report_path = os.path.join(args.output_dir, "metrics.json")
+    with open(report_path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {report_path}")
+    return 1 if failed else 0
+
+
+def _train_incremental(args, models):
+    # Larger-than-RAM path: the file is never loaded whole, each model streams it via partial_fit
+    features = args.features
+    if not features:
+        header, _ = next(iter_chunks(args.data, chunksize=1))
+        features = [c for c in header.columns if c != args.target]
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    report = {
+        "data": os.path.abspath(args.data),
+        "features": features,
+        "target": args.target,
+        "incremental": True,
+        "chunksize": args.chunksize,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "models": [],
+    }
+    failed = 0
+    for model_name in models:
+        entry = {"model": model_name}
+        try:
+            start = time.perf_counter()
+            model, accuracy = train_incremental(
+                model_name, args.data, features, args.target,
+                chunksize=args.chunksize, random_state=args.random_state,
+                progress=lambda p: print(f"  {p['fraction']:.0%} rows={p['rows']:,} accuracy={p['accuracy']}", flush=True)
+            )
+            entry["fit_time"] = time.perf_counter() - start
+            entry["accuracy"] = None if accuracy is None else float(accuracy)
+            path = os.path.join(args.output_dir, f"{_slug(model_name)}.joblib")
+            save_model_bundle(path, model, model_name, features, args.target, {
+                "accuracy": entry["accuracy"], "fit_time": entry["fit_time"]
+            })
+            entry["path"] = path
+            print(f"{model_name}: holdout accuracy={entry['accuracy']} fit={entry['fit_time']:.2f}s -> {path}")
+        except Exception as e:
+            failed += 1
+            entry["error"] = str(e)
+            print(f"{model_name}: FAILED {e}", file=sys.stderr)
+        report["models"].append(entry)
+
+    report_path = os.path.join(args.output_dir, "metrics.json")
+    with open(report_path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {report_path}")
+    return 1 if failed else 0
+
+
+def cmd_serve(args):
+    from models import load_model_bundle
+    from server import start_server, stop_server
+
+    bundle = load_model_bundle(args.model)
+    server, service = start_server(
+        bundle, host=args.host, port=args.port,
+        max_batch=args.max_batch, max_delay=args.max_delay_ms / 1000
+    )
+    print(f"Serving {bundle['model_name']} on http://{args.host}:{server.server_address[1]} "
+          f"(POST /predict, GET /metrics, GET /health)", flush=True)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_server(server, service)
+    return 0
+
+
+def cmd_export(args):
+    from models import load_model_bundle
+    from export import export_bundle
+
+    bundle = load_model_bundle(args.model)
+    try:
+        export_bundle(args.output, bundle)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    print(f"Exported {bundle['model_name']} -> {args.output} ({os.path.getsize(args.output):,} bytes)")
+    return 0
+
+
+def cmd_profile(args):
+    from column_profile import profile_dataset, describe
+
+    dataset = load_dataset(args.data, chunksize=DEFAULT_CHUNKSIZE, use_cache=not args.no_cache)
+    profile = profile_dataset(dataset, None if args.no_cache else args.data, optimized=True)
+    if args.json:
+        json.dump(profile, sys.stdout, indent=2)
+        print()
+        return 0
+    print(f"{profile['rows']:,} rows, {len(profile['columns']):,} columns")
+    for col, stats in profile["columns"].items():
+        print(f"  {col}: {describe(stats)}")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="Headless training and evaluation.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    train = commands.add_parser("train", help="load a dataset, train models and write them with a metrics report")
+    train.add_argument("data", help="CSV or Excel file")
+    train.add_argument("--target", required=True, help="target column")
+    train.add_argument("--features", nargs="+", help="input columns (default: every other column)")
+    train.add_argument("--models", nargs="+", choices=MODEL_NAMES, metavar="MODEL",
+                       help=f"models to train, any of: {', '.join(MODEL_NAMES)}")
+    train.add_argument("--all-models", action="store_true", help="train every supported model")
+    train.add_argument("--output-dir", default="models_out")
+    train.add_argument("--test-size", type=float, default=0.2)
+    train.add_argument("--random-state", type=int, default=42)
+    train.add_argument("--no-cache", action="store_true", help="do not read or write the dataset cache")
+    train.add_argument("--incremental", action="store_true",
+                       help="stream the file through partial_fit (larger-than-RAM data, no tree models)")
+    train.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="rows per chunk with --incremental")
+    train.add_argument("--tune", action="store_true",
+                       help="search hyperparameters with cross-validated successive halving")
+    train.add_argument("--cv", type=int, default=3, help="cross-validation folds with --tune")
+    train.add_argument("--budget", type=float, help="seconds allowed per model with --tune")
+    train.set_defaults(func=cmd_train)
+
+    serve = commands.add_parser("serve", help="serve a saved model over HTTP with micro-batched predictions")
+    serve.add_argument("model", help=".joblib bundle written by the train command")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--max-batch", type=int, default=512, help="rows per predict call")
+    serve.add_argument("--max-delay-ms", type=float, default=2.0,
+                       help="how long the first request of a batch waits for others")
+    serve.set_defaults(func=cmd_serve)
+
+    export = commands.add_parser("export", help="convert a saved model to a NumPy-only predictor file (see npmodel.py)")
+    export.add_argument("model", help=".joblib bundle written by the train command")
+    export.add_argument("output", help="predictor file to write, e.g. model.mlvz")
+    export.set_defaults(func=cmd_export)
+
+    profile = commands.add_parser("profile", help="print per-column statistics of a dataset")
+    profile.add_argument("data", help="CSV or Excel file")
+    profile.add_argument("--json", action="store_true", help="print the full profile as JSON")
+    profile.add_argument("--no-cache", action="store_true", help="do not read or write the dataset cache")
+    profile.set_defaults(func=cmd_profile)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,261 @@
+import numpy as np
+import pandas as pd
+from cache import read_cached_profile, write_cached_profile
+
+# Per-column statistics computed once per loaded dataset: dtype, nulls, min/max/mean/std,
+# cardinality, top values and quantiles. Counts and moments are exact; cardinality, top values
+# and quantiles come from a uniform sample of SKETCH_ROWS rows once the frame is larger than
+# that (quantiles then have about 1% rank error). Columns are processed in blocks, so wide
+# frames never need one big float64 copy.
+PROFILE_VERSION = 2
+SKETCH_ROWS = 10_000
+BLOCK_COLUMNS = 256
+CHUNK_ROWS = 16_384
+QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+TOP_VALUES = 5
+# Columns with at most this many distinct values keep the full list, for input validation
+MAX_LISTED_VALUES = 50
+# Targets with at most this many distinct values are treated as classes
+MAX_CLASSES = 20
+
+
+def profile_dataset(df, file_path=None, columns=None, optimized=True, stat=None):
+    # Profile of a frame returned by load_dataset, reused from the dataset cache when the
+    # file has not changed since it was profiled. stat: the one the frame was loaded with.
+    if file_path is not None:
+        profile = read_cached_profile(file_path, columns, optimized, stat)
+        if profile is not None and profile.get("version") == PROFILE_VERSION and profile.get("rows") == len(df):
+            return profile
+    profile = profile_frame(df)
+    if file_path is not None:
+        write_cached_profile(profile, file_path, columns, optimized, stat)
+    return profile
+
+
+def profile_frame(df, random_state=0):
+    # {"version", "rows", "sampled", "columns": {name: stats}}; JSON-serializable
+    n = len(df)
+    sample_rows = None
+    if n > SKETCH_ROWS:
+        sample_rows = np.sort(np.random.default_rng(random_state).choice(n, SKETCH_ROWS, replace=False))
+    dtypes = df.dtypes
+    stats = {}
+    numeric = [col for col in df.columns if _kind(dtypes[col]) == "numeric"]
+    for start in range(0, len(numeric), BLOCK_COLUMNS):
+        stats.update(_profile_numeric(df[numeric[start:start + BLOCK_COLUMNS]], sample_rows))
+    for col in df.columns:
+        kind = _kind(dtypes[col])
+        if kind == "categorical":
+            stats[col] = _profile_categorical(df[col], sample_rows)
+        elif kind == "datetime":
+            series = df[col]
+            count = int(series.count())
+            stats[col] = _base(series.dtype, kind, n, count)
+            stats[col].update(min=str(series.min()) if count else None, max=str(series.max()) if count else None)
+    return {
+        "version": PROFILE_VERSION,
+        "rows": n,
+        "sampled": sample_rows is not None,
+        "columns": {str(col): stats[col] for col in df.columns},
+    }
+
+
+def _profile_numeric(block, sample_rows):
+    n = len(block)
+    count, mean, std, low, high = _moments(block)
+    sample = block if sample_rows is None else block.iloc[sample_rows]
+    # One sort per block gives quantiles and distinct counts for every column (NaN sorts last)
+    values = np.sort(sample.to_numpy(dtype=np.float64, na_value=np.nan), axis=0)
+    present = (~np.isnan(values)).sum(axis=0)
+    columns = np.arange(values.shape[1])
+    if not n:
+        quantiles = [np.full(values.shape[1], np.nan) for _ in QUANTILES]
+        distinct = np.zeros(values.shape[1], dtype=np.intp)
+    else:
+        quantiles = []
+        for q in QUANTILES:
+            position = q * np.maximum(present - 1, 0)
+            below = np.floor(position).astype(np.intp)
+            above = np.minimum(below + 1, np.maximum(present - 1, 0))
+            value = values[below, columns] + (position - below) * (values[above, columns] - values[below, columns])
+            quantiles.append(np.where(present > 0, value, np.nan))
+        changes = np.diff(values, axis=0) != 0
+        distinct = np.where(present > 0, 1 + (changes & ~np.isnan(values[1:])).sum(axis=0), 0)
+    dtypes = block.dtypes
+    out = {}
+    for j, col in enumerate(block.columns):
+        stats = _base(dtypes[col], "numeric", n, int(count[j]))
+        stats.update(
+            min=_number(low[j], dtypes[col]), max=_number(high[j], dtypes[col]), mean=_number(mean[j]), std=_number(std[j]),
+            quantiles={str(q): _number(quantiles[i][j]) for i, q in enumerate(QUANTILES)},
+        )
+        stats["cardinality"], stats["approximate"] = _cardinality(int(distinct[j]), int(present[j]), int(count[j]))
+        if stats["cardinality"] <= MAX_LISTED_VALUES and present[j]:
+            labels, label_counts = np.unique(values[:present[j], j], return_counts=True)
+            if dtypes[col] == np.float32:
+                # Back to the column's own precision, so 0.1 does not show up as 0.10000000149011612
+                labels = labels.astype(np.float32)
+            stats["top"] = _top(labels, label_counts, count[j] / present[j])
+            stats["values"] = [_label(value) for value in labels]
+        out[col] = stats
+    return out
+
+
+def _moments(block):
+    # Non-null count, mean, sample std, min and max per column in one pass over row chunks.
+    # Sums are taken around the first chunk's mean so the variance keeps its precision.
+    k = block.shape[1]
+    # float32 columns (and small integers) are exact in float32, which halves the memory traffic;
+    # sums still accumulate in float64
+    small = all(np.dtype(dtype).itemsize <= (4 if np.dtype(dtype).kind == "f" else 2) for dtype in block.dtypes)
+    work = np.float32 if small else np.float64
+    count, total, total_sq = np.zeros(k), np.zeros(k), np.zeros(k)
+    low, high = np.full(k, np.inf), np.full(k, -np.inf)
+    shift = None
+    for start in range(0, len(block), CHUNK_ROWS):
+        chunk = block.iloc[start:start + CHUNK_ROWS].to_numpy(dtype=work, na_value=np.nan)
+        missing = np.isnan(chunk)
+        present = len(chunk) - missing.sum(axis=0)
+        any_missing = present.sum() < chunk.size
+        if shift is None:
+            sums = (np.where(missing, 0, chunk) if any_missing else chunk).sum(axis=0, dtype=np.float64)
+            shift = np.where(present > 0, sums / np.maximum(present, 1), 0.0).astype(work)
+        deviation = chunk - shift
+        if any_missing:
+            deviation[missing] = 0
+        count += present
+        total += deviation.sum(axis=0, dtype=np.float64)
+        total_sq += np.square(deviation).sum(axis=0, dtype=np.float64)
+        if any_missing:
+            low = np.fmin(low, np.fmin.reduce(chunk, axis=0))
+            high = np.fmax(high, np.fmax.reduce(chunk, axis=0))
+        else:
+            low = np.minimum(low, chunk.min(axis=0))
+            high = np.maximum(high, chunk.max(axis=0))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(count > 0, (shift if shift is not None else 0.0) + total / count, np.nan)
+        variance = (total_sq - total ** 2 / count) / (count - 1)
+    std = np.where(count > 1, np.sqrt(np.maximum(variance, 0.0)), np.nan)
+    low = np.where(count > 0, low, np.nan)
+    high = np.where(count > 0, high, np.nan)
+    return count, mean, std, low, high
+
+
+def _profile_categorical(series, sample_rows):
+    n = len(series)
+    count = int(series.count())
+    stats = _base(series.dtype, "categorical", n, count)
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Codes give exact counts in one bincount
+        codes = series.cat.codes.to_numpy()
+        label_counts = np.bincount(codes[codes >= 0], minlength=len(series.cat.categories))
+        used = label_counts > 0
+        labels, label_counts, exact, scale = series.cat.categories[used], label_counts[used], True, 1.0
+    else:
+        sample = series if sample_rows is None else series.iloc[sample_rows]
+        counts = sample.value_counts(dropna=True)
+        labels, label_counts = counts.index, counts.to_numpy()
+        exact = sample_rows is None
+        scale = count / max(int(label_counts.sum()), 1)
+    if exact:
+        stats["cardinality"], stats["approximate"] = len(labels), False
+    else:
+        stats["cardinality"], stats["approximate"] = _cardinality(len(labels), int(label_counts.sum()), count)
+    stats["top"] = _top(np.asarray(labels, dtype=object), label_counts, scale)
+    if len(labels) <= MAX_LISTED_VALUES:
+        stats["values"] = sorted(str(label) for label in labels)
+    return stats
+
+
+def _base(dtype, kind, n, count):
+    return {
+        "dtype": str(dtype), "kind": kind, "count": count, "nulls": n - count,
+        "cardinality": 0, "approximate": False, "top": [], "values": None,
+    }
+
+
+def _cardinality(distinct, seen, count):
+    # Distinct values among `seen` sampled values of `count`: repeated values mean the sample
+    # has likely met them all, mostly-unique ones are scaled up to the full column
+    if seen >= count or distinct < seen // 2:
+        return distinct, seen < count
+    return min(count, int(round(distinct * count / max(seen, 1)))), True
+
+
+def _top(labels, counts, scale):
+    order = np.argsort(-np.asarray(counts), kind="stable")[:TOP_VALUES]
+    return [[_label(labels[i]), int(round(counts[i] * scale))] for i in order]
+
+
+def _kind(dtype):
+    if pd.api.types.is_bool_dtype(dtype):
+        return "categorical"
+    if pd.api.types.is_numeric_dtype(dtype):
+        return "numeric"
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return "datetime"
+    return "categorical"
+
+
+def _number(value, dtype=None):
+    # dtype float32: the shortest decimal that round-trips at float32, so a typed 0.1 matches
+    if value is not None and not pd.isna(value) and dtype == np.float32:
+        value = str(np.float32(value))
+    value = float(value) if value is not None and not pd.isna(value) else None
+    return value if value is None or np.isfinite(value) else None
+
+
+def _label(value):
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def describe(stats):
+    # Short annotation for column pickers, e.g. "float32, 2% null, 0.1 to 97"
+    parts = [stats["dtype"]]
+    if stats["nulls"]:
+        share = stats["nulls"] / max(stats["count"] + stats["nulls"], 1)
+        parts.append(f"{share:.0%} null" if share >= 0.01 else "<1% null")
+    if stats["kind"] == "numeric" and stats.get("min") is not None:
+        if stats["cardinality"] <= MAX_CLASSES and stats.get("values"):
+            parts.append(f"{stats['cardinality']} values")
+        else:
+            parts.append(f"{stats['min']:.4g} to {stats['max']:.4g}")
+    elif stats["kind"] == "categorical":
+        approx = "~" if stats["approximate"] else ""
+        parts.append(f"{approx}{stats['cardinality']:,} values")
+    return ", ".join(parts)
+
+
+def check_value(stats, text):
+    # Instant check of a typed prediction input: None, ("error", message) or ("warning", message).
+    # Blank is fine, missing inputs are imputed.
+    text = str(text).strip()
+    if not text or stats is None:
+        return None
+    if stats["kind"] == "numeric":
+        try:
+            value = float(text)
+        except ValueError:
+            return "error", "expects a number"
+        low, high = stats.get("min"), stats.get("max")
+        if low is not None and not low <= value <= high:
+            return "warning", f"outside the data range {low:.4g} to {high:.4g}"
+        return None
+    if stats["kind"] == "categorical" and stats.get("values") is not None and text not in stats["values"]:
+        return "warning", "not seen in the data, encoded as unknown"
+    return None
+
+
+def is_classification(stats):
+    # Categorical targets and numeric ones with few distinct values are classes
+    return stats["kind"] != "numeric" or (stats["cardinality"] <= MAX_CLASSES and stats.get("values") is not None)
+
+
+def suggest_model(stats):
+    return "Random Forest" if is_classification(stats) else "Linear / Multiple Regression"
+
+
+def suggest_plot(stats):
+    return "Confusion Matrix" if is_classification(stats) else "Scatter Plot"
@@ -0,0 +1,110 @@
+import numpy as np
+from npmodel import save_arrays
+
+# Converts fitted sklearn models (and their preprocessing) to the flat array file read by
+# npmodel.py. Supported: decision trees and random forests (classification), logistic and
+# linear regression, SGD linear models, Gaussian Naive Bayes, optionally behind a
+# StandardScaler in a Pipeline (out-of-core models).
+
+
+def export_model(path, model, preprocessor=None, inputs=None, target=None, model_name=None):
+    kind, arrays, meta = convert(model)
+    meta.update({"model_name": model_name, "target": target, "inputs": list(inputs) if inputs else None})
+    if preprocessor is not None:
+        meta["inputs"] = list(preprocessor.inputs)
+        meta["preprocessing"] = {
+            "numeric": list(preprocessor.numeric),
+            "categorical": [
+                [col, [str(value) for value in categories], int(mode), encoding]
+                for col, categories, mode, encoding in preprocessor.categorical
+            ],
+            "n_features": len(preprocessor.feature_names),
+        }
+        if preprocessor.numeric:
+            arrays["pre_medians"] = np.asarray(preprocessor.medians, dtype=np.float64)
+            arrays["pre_means"] = np.asarray(preprocessor.means, dtype=np.float64)
+            arrays["pre_scales"] = np.asarray(preprocessor.scales, dtype=np.float64)
+    return save_arrays(path, kind, arrays, meta)
+
+
+def export_bundle(path, bundle):
+    # A bundle written by models.save_model_bundle
+    return export_model(
+        path, bundle["model"], preprocessor=bundle.get("preprocessor"),
+        inputs=bundle.get("inputs"), target=bundle.get("target"), model_name=bundle.get("model_name")
+    )
+
+
+def convert(model):
+    # (kind, arrays, meta) for one fitted estimator
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.tree import DecisionTreeClassifier
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.linear_model import LinearRegression, LogisticRegression, SGDClassifier, SGDRegressor
+    from sklearn.naive_bayes import GaussianNB
+
+    if isinstance(model, Pipeline):
+        steps = [step for _, step in model.steps]
+        if len(steps) == 2 and isinstance(steps[0], StandardScaler):
+            kind, arrays, meta = convert(steps[1])
+            scaler = steps[0]
+            n_features = scaler.n_features_in_
+            arrays["scaler_mean"] = scaler.mean_ if scaler.mean_ is not None else np.zeros(n_features)
+            arrays["scaler_scale"] = scaler.scale_ if scaler.scale_ is not None else np.ones(n_features)
+            return kind, arrays, meta
+        raise ValueError("Only StandardScaler + estimator pipelines can be exported")
+
+    if isinstance(model, (DecisionTreeClassifier, RandomForestClassifier)):
+        trees = model.estimators_ if isinstance(model, RandomForestClassifier) else [model]
+        return "forest", _stack_trees([tree.tree_ for tree in trees]), {"classes": _labels(model.classes_)}
+
+    if isinstance(model, (LogisticRegression, SGDClassifier)):
+        proba = None
+        if isinstance(model, LogisticRegression):
+            multi_class = getattr(model, "multi_class", "auto")
+            proba = "ovr" if multi_class == "ovr" or model.solver == "liblinear" else "multinomial"
+        elif model.loss == "log_loss":
+            proba = "ovr"
+        arrays = {"coef": np.atleast_2d(model.coef_), "intercept": np.atleast_1d(model.intercept_)}
+        return "linear_classifier", arrays, {"classes": _labels(model.classes_), "proba": proba}
+
+    if isinstance(model, (LinearRegression, SGDRegressor)):
+        coef = np.asarray(model.coef_)
+        arrays = {"coef": np.atleast_2d(coef), "intercept": np.atleast_1d(model.intercept_)}
+        return "linear_regressor", arrays, {"single_target": coef.ndim == 1}
+
+    if isinstance(model, GaussianNB):
+        arrays = {"theta": model.theta_, "var": model.var_, "log_prior": np.log(model.class_prior_)}
+        return "gaussian_nb", arrays, {"classes": _labels(model.classes_)}
+
+    raise ValueError(f"{type(model).__name__} cannot be exported (supported: trees, forests, linear models, Gaussian NB)")
+
+
+def _stack_trees(trees):
+    # All nodes of all trees in one set of arrays; child indices are made global via offsets
+    offsets = np.cumsum([0] + [tree.node_count for tree in trees[:-1]])
+    left, right, feature, threshold, value = [], [], [], [], []
+    for offset, tree in zip(offsets, trees):
+        leaf = tree.children_left < 0
+        left.append(np.where(leaf, -1, tree.children_left + offset))
+        right.append(np.where(leaf, -1, tree.children_right + offset))
+        # Leaves get feature 0 so the vectorized traversal can index with it safely
+        feature.append(np.where(leaf, 0, tree.feature))
+        threshold.append(tree.threshold)
+        counts = tree.value[:, 0, :]
+        totals = counts.sum(axis=1, keepdims=True)
+        value.append(counts / np.where(totals > 0, totals, 1))
+    return {
+        "left": np.concatenate(left).astype(np.int32),
+        "right": np.concatenate(right).astype(np.int32),
+        "feature": np.concatenate(feature).astype(np.int32),
+        "threshold": np.concatenate(threshold).astype(np.float64),
+        "value": np.concatenate(value).astype(np.float64),
+        "roots": np.asarray(offsets, dtype=np.int32),
+    }
+
+
+def _labels(classes):
+    # Class labels as JSON values (numbers stay numbers)
+    return np.asarray(classes).tolist()
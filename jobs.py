@@ -0,0 +1,125 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class Job:
+    # Handle passed to the worker function for progress reports and cancellation checks
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.future = None
+        self._cancelled = threading.Event()
+        self._messages = queue.Queue()
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        self._cancelled.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    def report(self, message):
+        self._messages.put(message)
+
+    def check(self):
+        # Workers call this between steps to stop early once cancelled
+        if self.cancelled:
+            raise JobCancelled()
+
+
+class JobRunner:
+    # Runs callables on a worker pool and delivers their outcome on the Tk thread via root.after polling
+    def __init__(self, root, max_workers=1, poll_ms=50):
+        self.root = root
+        self.poll_ms = poll_ms
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ml-job")
+        self._jobs = []
+        self._polling = False
+
+    def submit(self, fn, *args, on_done=None, on_error=None, on_progress=None, on_cancel=None, **kwargs):
+        # fn receives the Job as its first argument; callbacks always run on the Tk thread
+        job = Job()
+        job.future = self.executor.submit(fn, job, *args, **kwargs)
+        self._jobs.append((job, on_done, on_error, on_progress, on_cancel))
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_ms, self._poll)
+        return job
+
+    @property
+    def busy(self):
+        return any(not job.future.done() for job, *_ in self._jobs)
+
+    def cancel_all(self):
+        for job, *_ in self._jobs:
+            job.cancel()
+
+    def shutdown(self):
+        self.cancel_all()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _poll(self):
+        # Callbacks may submit follow-up jobs, those land in self._jobs meanwhile
+        jobs, self._jobs = self._jobs, []
+        pending = []
+        try:
+            for entry in jobs:
+                if not self._deliver(entry):
+                    pending.append(entry)
+        finally:
+            self._jobs = pending + self._jobs
+            if self._jobs:
+                self.root.after(self.poll_ms, self._poll)
+            else:
+                self._polling = False
+
+    def _deliver(self, entry):
+        # Runs the callbacks due for one job; False while it is still running. A failing
+        # callback is logged and never stops the other jobs from reporting.
+        job, on_done, on_error, on_progress, on_cancel = entry
+        while True:
+            try:
+                message = job._messages.get_nowait()
+            except queue.Empty:
+                break
+            if on_progress and not job.cancelled:
+                self._call(on_progress, job, message)
+
+        if not job.future.done():
+            return False
+
+        if job.cancelled or job.future.cancelled():
+            # Results of cancelled jobs are discarded even if the worker ran to completion
+            if on_cancel:
+                self._call(on_cancel, job)
+            return True
+        error = job.future.exception()
+        if error is None:
+            if on_done:
+                self._call(on_done, job, job.future.result())
+        elif isinstance(error, JobCancelled):
+            if on_cancel:
+                self._call(on_cancel, job)
+        elif on_error:
+            self._call(on_error, job, error)
+        return True
+
+    def _call(self, callback, *args):
+        try:
+            callback(*args)
+        except Exception:
+            logger.exception("Job callback %r failed", callback)
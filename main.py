@@ -1,9 +1,33 @@
+import time
+_started = time.perf_counter()
+
+import json
+import os
+import sys
+import multiprocessing
 from app import MLApp
 import ttkbootstrap as tb
 import tkinter as tk
 
+_imported = time.perf_counter()
+
+
+def report_startup(timings):
+    # ML_VIZ_STARTUP_REPORT=1 prints the timings, any other value is a file to append them to as JSON lines
+    target = os.environ.get("ML_VIZ_STARTUP_REPORT")
+    if not target:
+        return
+    line = json.dumps({name: round(seconds, 4) for name, seconds in timings.items()})
+    if target == "1":
+        print(f"startup: {line}", file=sys.stderr)
+    else:
+        with open(target, "a") as f:
+            f.write(line + "\n")
+
 
 if __name__ == "__main__":
+    # Needed for the model comparison worker processes in frozen builds
+    multiprocessing.freeze_support()
     # root= tk.Tk()
     root = tb.Window(themename="pulse" )
     # root = tb.Window(themename="solar")
@@ -12,4 +36,19 @@ if __name__ == "__main__":
     # root = tb.Window(themename="sandstone")
     # root = tb.Window(themename="flatly")  
     app = MLApp(root)
-    root.mainloop()
\ No newline at end of file
+    timings = {"imports": _imported - _started, "window_built": time.perf_counter() - _started}
+
+    def on_prewarmed(seconds):
+        timings["prewarm"] = seconds
+        report_startup(timings)
+
+    def on_first_map(event):
+        # Time to first window: the main window has been mapped on screen
+        if event.widget is not root or "first_window" in timings:
+            return
+        timings["first_window"] = time.perf_counter() - _started
+        app.status_var.set(f"Ready in {timings['first_window']:.2f}s")
+        app.prewarm(on_done=on_prewarmed)
+
+    root.bind("<Map>", on_first_map, add="+")
+    root.mainloop()
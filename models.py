@@ -1,53 +1,473 @@
-from sklearn.preprocessing import LabelEncoder
-from sklearn.model_selection import train_test_split
-from sklearn.linear_model import LinearRegression, LogisticRegression
-from sklearn.tree import DecisionTreeClassifier
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.svm import SVC
-from sklearn.naive_bayes import GaussianNB
-from sklearn.metrics import accuracy_score, r2_score
+# scikit-learn and joblib are imported inside the functions that need them:
+# importing this module stays cheap, so the GUI window can appear before sklearn loads
 import pandas as pd
 import numpy as np
+import os
+import threading
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from shared import SharedDataset, attach_dataset, release
+from utils import iter_chunks, DEFAULT_CHUNKSIZE
+from profiling import peak_rss, reset_peak_rss
 
-def train_model(model_name, X_train, y_train):
+MODEL_NAMES = [
+    "Linear / Multiple Regression",
+    "Logistic Regression",
+    "Decision Tree",
+    "Random Forest",
+    "SVM",
+    "Naive Bayes",
+]
+
+def make_model(model_name, **params):
+    from sklearn.linear_model import LinearRegression, LogisticRegression
+    from sklearn.tree import DecisionTreeClassifier
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.svm import SVC
+    from sklearn.naive_bayes import GaussianNB
 
-    X_train = np.array(X_train) if not isinstance(X_train, np.ndarray) else X_train
-    y_train = np.array(y_train) if not isinstance(y_train, np.ndarray) else y_train
-    
-    if model_name in ["Linear / Multiple Regression"] and y_train.dtype == object:
-        le = LabelEncoder()
-        y_train = le.fit_transform(y_train)
-    
     if model_name == "Linear / Multiple Regression":
-        model = LinearRegression()
+        return LinearRegression(**params)
     elif model_name == "Logistic Regression":
-        model = LogisticRegression()
+        return LogisticRegression(**params)
     elif model_name == "Decision Tree":
-        model = DecisionTreeClassifier()
+        return DecisionTreeClassifier(**params)
     elif model_name == "Random Forest":
-        model = RandomForestClassifier()
+        return RandomForestClassifier(**params)
     elif model_name == "SVM":
-        model = SVC()
+        return SVC(**params)
     elif model_name == "Naive Bayes":
-        model = GaussianNB()
+        return GaussianNB(**params)
     else:
         raise ValueError("Unsupported model type")
+
+# Models fitted as regressors: categorical targets reach them as the preprocessor's label codes
+REGRESSION_MODELS = ["Linear / Multiple Regression"]
+
+def model_target(model_name, y, preprocessor):
+    # Target as model_name is fitted on; classifiers take the labels as they are
+    if model_name in REGRESSION_MODELS:
+        return preprocessor.encode_target(y)
+    return np.asarray(y)
+
+def train_model(model_name, X_train, y_train, params=None):
+    from sklearn.preprocessing import LabelEncoder
+
+    X_train = np.array(X_train) if not isinstance(X_train, np.ndarray) else X_train
+    y_train = np.array(y_train) if not isinstance(y_train, np.ndarray) else y_train
+    
+    if model_name in REGRESSION_MODELS and not np.issubdtype(y_train.dtype, np.number):
+        # Callers with a Preprocessor pass model_target() codes; this keeps plain label arrays working
+        le = LabelEncoder()
+        y_train = le.fit_transform(y_train)
     
+    model = make_model(model_name, **(params or {}))
     model.fit(X_train, y_train)
     return model
 
-def calculate_accuracy(model, X_test, y_test):
+def calculate_accuracy(model, X_test, y_test, y_pred=None):
+    # y_pred: predictions already computed for X_test (e.g. from a PredictionStore).
+    # Regressors need a numeric y_test, encoded the same way as at training time (see model_target)
+    from sklearn.metrics import accuracy_score, r2_score
+    from sklearn.base import is_classifier
 
     y_test = np.array(y_test) if not isinstance(y_test, np.ndarray) else y_test
     
-    if hasattr(model, "predict_proba"):
-        y_pred = model.predict(X_test)
+    if y_pred is None:
+        y_pred = model.predict(np.asarray(X_test))
+    
+    if hasattr(model, "predict_proba") or is_classifier(model):
         return accuracy_score(y_test, y_pred)
-    else: 
-        try:
-            return model.score(X_test, y_test)
-        except:
-         
-            le = LabelEncoder()
-            y_test_encoded = le.fit_transform(y_test)
-            return model.score(X_test, y_test_encoded)
\ No newline at end of file
+    if not np.issubdtype(y_test.dtype, np.number):
+        raise ValueError("Regression targets must be numeric, encode labels with model_target() first")
+    # Same as model.score for regressors: R² on the test split
+    return r2_score(y_test, y_pred)
+
+class PredictionStore:
+    # Predictions computed once per model and split, shared by evaluation and plots instead of
+    # calling predict again each time; class probabilities only once something asks for them
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, model, split, X):
+        key = (id(model), split)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry["model"] is model and entry["rows"] == len(X):
+            return entry
+
+        X = np.asarray(X)
+        y_pred = np.asarray(model.predict(X))
+        entry = {"model": model, "rows": len(X), "proba": None}
+        classes = getattr(model, "classes_", None)
+        if classes is not None and y_pred.dtype.kind not in "fc":
+            # Class predictions kept as small integer codes into model.classes_
+            codes = np.searchsorted(classes, y_pred)
+            entry["codes"] = codes.astype(np.min_scalar_type(max(len(classes) - 1, 0)))
+            entry["classes"] = np.asarray(classes)
+        else:
+            entry["values"] = y_pred
+        with self._lock:
+            self._entries[key] = entry
+        return entry
+
+    def predictions(self, model, split, X):
+        entry = self.get(model, split, X)
+        if "codes" in entry:
+            return entry["classes"][entry["codes"]]
+        return entry["values"]
+
+    def probabilities(self, model, split, X):
+        # None for models without predict_proba
+        entry = self.get(model, split, X)
+        if entry["proba"] is None and hasattr(model, "predict_proba"):
+            entry["proba"] = model.predict_proba(np.asarray(X)).astype(np.float32)
+        return entry["proba"]
+
+    def clear(self, model=None):
+        with self._lock:
+            if model is None:
+                self._entries.clear()
+            else:
+                self._entries = {k: v for k, v in self._entries.items() if v["model"] is not model}
+
+# Shares of the training rows fitted in turn by progressive training
+PROGRESSIVE_STEPS = (0.01, 0.1, 1.0)
+# Progressive training can stop once a step improves accuracy by less than this
+PLATEAU_TOLERANCE = 0.005
+
+def stratified_order(y, random_state=42):
+    # Row order in which every prefix is a random sample with the class proportions of y
+    rng = np.random.default_rng(random_state)
+    codes = pd.factorize(np.asarray(y))[0]
+    n = len(codes)
+    counts = np.bincount(codes + 1)
+    # Group rows by class in random order, then interleave the classes by relative rank
+    perm = rng.permutation(n)
+    grouped = perm[np.argsort(codes[perm], kind="stable")]
+    sizes = counts[counts > 0]
+    rank = np.arange(n) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    keys = (rank + rng.random(n)) / np.repeat(sizes, sizes)
+    return grouped[np.argsort(keys, kind="stable")]
+
+def train_progressive(model_name, X_train, y_train, X_test, y_test, steps=PROGRESSIVE_STEPS,
+                      min_rows=1000, eval_rows=50_000, plateau=None, on_step=None,
+                      should_stop=None, random_state=42):
+    # Fits model_name on growing stratified samples of the training rows so a usable model
+    # exists after the first (small) fit. Every step is scored on the same eval_rows of the
+    # test split and passed to on_step as {step, rows, fraction, model, accuracy, fit_time}.
+    # plateau: stop once a step improves accuracy by less than this. Returns the list of steps.
+    X_train, y_train = np.asarray(X_train), np.asarray(y_train)
+    X_eval, y_eval = np.asarray(X_test)[:eval_rows], np.asarray(y_test)[:eval_rows]
+    n = len(X_train)
+    stratify = model_name not in REGRESSION_MODELS
+    order = stratified_order(y_train, random_state) if stratify else np.random.default_rng(random_state).permutation(n)
+
+    sizes = sorted({min(n, max(min_rows, int(round(n * fraction)))) for fraction in steps})
+    history = []
+    for size in sizes:
+        if should_stop and should_stop():
+            break
+        rows = np.sort(order[:size])
+        start = time.perf_counter()
+        model = train_model(model_name, X_train[rows], y_train[rows])
+        fit_time = time.perf_counter() - start
+        step = {
+            "step": len(history) + 1,
+            "rows": size,
+            "fraction": size / n,
+            "model": model,
+            "accuracy": float(calculate_accuracy(model, X_eval, y_eval)),
+            "fit_time": fit_time,
+        }
+        history.append(step)
+        if on_step:
+            on_step(step)
+        if plateau is not None and len(history) > 1 and step["accuracy"] - history[-2]["accuracy"] < plateau:
+            break
+    return history
+
+# Streaming (partial_fit) counterparts of the regular models; trees have none
+INCREMENTAL_MODELS = ["Linear / Multiple Regression", "Logistic Regression", "SVM", "Naive Bayes"]
+
+def make_incremental_model(model_name, random_state=42):
+    from sklearn.linear_model import SGDClassifier, SGDRegressor
+    from sklearn.naive_bayes import GaussianNB
+
+    if model_name == "Linear / Multiple Regression":
+        return SGDRegressor(random_state=random_state)
+    elif model_name == "Logistic Regression":
+        return SGDClassifier(loss="log_loss", random_state=random_state)
+    elif model_name == "SVM":
+        # Linear SVM trained by SGD, kernel SVC has no incremental form
+        return SGDClassifier(loss="hinge", random_state=random_state)
+    elif model_name == "Naive Bayes":
+        return GaussianNB()
+    else:
+        raise ValueError(f"{model_name} does not support incremental training")
+
+def train_incremental(model_name, file_path, inputs, output, chunksize=DEFAULT_CHUNKSIZE,
+                      holdout=0.1, holdout_max=100_000, progress=None, should_stop=None, random_state=42):
+    # Out-of-core training: chunks are streamed from disk into partial_fit, so memory is
+    # bounded by one chunk plus the validation sample whatever the file size.
+    # A share `holdout` of every chunk (up to holdout_max rows) is kept back for validation and
+    # progress receives {"rows", "fraction", "accuracy"} after each chunk.
+    from sklearn.linear_model import SGDClassifier, SGDRegressor
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.pipeline import Pipeline
+    from sklearn.metrics import accuracy_score, r2_score
+
+    model = make_incremental_model(model_name, random_state)
+    regressor = model_name == "Linear / Multiple Regression"
+    # SGD needs standardized inputs; the scaler is fitted on the first chunk and then frozen
+    scaler = StandardScaler() if isinstance(model, (SGDClassifier, SGDRegressor)) else None
+    rng = np.random.default_rng(random_state)
+
+    # partial_fit needs every class up front: one cheap pass over the target column only.
+    # A numeric regression target has no classes, so its distinct values are never collected.
+    if regressor and _numeric_column(file_path, output, chunksize):
+        classes, numeric_target = None, True
+    else:
+        classes = _stream_classes(file_path, output, chunksize)
+        numeric_target = np.issubdtype(classes.dtype, np.number)
+
+    X_valid, y_valid, rows, accuracy = [], [], 0, None
+    valid_rows = 0
+    for chunk, fraction in iter_chunks(file_path, list(inputs) + [output], chunksize):
+        if should_stop and should_stop():
+            break
+        chunk = chunk.dropna(subset=list(inputs) + [output])
+        if chunk.empty:
+            continue
+        X = chunk[list(inputs)].to_numpy(dtype=np.float64)
+        y = chunk[output].to_numpy()
+        if not numeric_target:
+            y = y.astype(str)
+        if regressor and classes is not None:
+            # Same label encoding train_model applies to categorical regression targets
+            y = np.searchsorted(classes, y)
+
+        held = rng.random(len(X)) < holdout if valid_rows < holdout_max else np.zeros(len(X), dtype=bool)
+        if held.any():
+            take = np.flatnonzero(held)[:holdout_max - valid_rows]
+            X_valid.append(X[take])
+            y_valid.append(y[take])
+            valid_rows += len(take)
+        X, y = X[~held], y[~held]
+        if not len(X):
+            continue
+
+        if scaler is not None:
+            if not hasattr(scaler, "mean_"):
+                scaler.fit(X)
+            X = scaler.transform(X)
+        if regressor:
+            model.partial_fit(X, y)
+        else:
+            model.partial_fit(X, y, classes=classes)
+        rows += len(X)
+
+        if valid_rows:
+            Xv = np.concatenate(X_valid)
+            if scaler is not None:
+                Xv = scaler.transform(Xv)
+            yv = np.concatenate(y_valid)
+            y_pred = model.predict(Xv)
+            accuracy = r2_score(yv, y_pred) if regressor else accuracy_score(yv, y_pred)
+            X_valid, y_valid = [np.concatenate(X_valid)], [yv]
+        if progress:
+            progress({"rows": rows, "fraction": fraction, "accuracy": accuracy})
+
+    if rows == 0:
+        raise ValueError("No complete rows to train on")
+    if scaler is not None:
+        model = Pipeline([("scaler", scaler), ("model", model)])
+    return model, accuracy
+
+def _numeric_column(file_path, output, chunksize):
+    # Dtype of the column as parsed in the first chunk
+    for chunk, _ in iter_chunks(file_path, [output], chunksize):
+        return pd.api.types.is_numeric_dtype(chunk[output].dtype)
+    raise ValueError(f"Target column {output!r} has no values")
+
+def _stream_classes(file_path, output, chunksize):
+    classes = None
+    for chunk, _ in iter_chunks(file_path, [output], chunksize):
+        values = chunk[output].dropna().to_numpy()
+        if not np.issubdtype(values.dtype, np.number):
+            values = values.astype(str)
+        values = np.unique(values)
+        classes = values if classes is None else np.union1d(classes, values)
+    if classes is None or not len(classes):
+        raise ValueError(f"Target column {output!r} has no values")
+    return classes
+
+def save_model_bundle(path, model, model_name, inputs, target, metrics=None, preprocessor=None):
+    # Everything needed to reuse a fitted model outside the app; preprocessor is None
+    # for models fitted on raw numeric inputs (out-of-core training)
+    import joblib
+    bundle = {
+        "model": model,
+        "model_name": model_name,
+        "inputs": list(inputs),
+        "target": target,
+        "metrics": metrics or {},
+        "preprocessor": preprocessor,
+    }
+    joblib.dump(bundle, path)
+    return path
+
+def load_model_bundle(path):
+    import joblib
+    bundle = joblib.load(path)
+    if not isinstance(bundle, dict) or "model" not in bundle:
+        raise ValueError(f"{path} is not a saved model bundle")
+    bundle.setdefault("preprocessor", None)
+    return bundle
+
+def predict_file(model, input_path, output_path, inputs, chunksize=DEFAULT_CHUNKSIZE,
+                 n_jobs=1, progress=None, should_stop=None, prediction_column="prediction",
+                 preprocessor=None):
+    # Scores a whole CSV/Excel file chunk by chunk and appends each scored chunk to a CSV,
+    # so memory stays bounded by a few chunks however large the input is.
+    # Chunks are encoded with preprocessor (the one the model was trained with) when given.
+    # progress receives (rows_done, fraction_of_input); returns the number of rows written
+    rows_done = 0
+    first = True
+    executor = None
+    if n_jobs > 1:
+        # Each worker receives the model once through the initializer, not with every chunk
+        context = multiprocessing.get_context("spawn")
+        executor = ProcessPoolExecutor(max_workers=n_jobs, mp_context=context,
+                                       initializer=_init_predict_worker, initargs=(model,))
+    try:
+        with open(output_path, "w", newline="", encoding="utf-8") as out:
+            in_flight = []
+
+            def flush(chunk, predicted, fraction):
+                nonlocal rows_done, first
+                scored = chunk.assign(**{prediction_column: predicted})
+                scored.to_csv(out, header=first, index=False)
+                first = False
+                rows_done += len(chunk)
+                if progress:
+                    progress(rows_done, fraction)
+
+            for chunk, fraction in iter_chunks(input_path, chunksize=chunksize):
+                if should_stop and should_stop():
+                    break
+                missing = [col for col in inputs if col not in chunk.columns]
+                if missing:
+                    raise ValueError(f"Input file is missing columns: {', '.join(missing)}")
+                X = chunk[inputs].to_numpy() if preprocessor is None else preprocessor.transform(chunk)
+                if executor is None:
+                    flush(chunk, model.predict(X), fraction)
+                    continue
+                # Keep at most two chunks per worker queued, results are written in input order
+                in_flight.append((chunk, executor.submit(_predict_chunk, X), fraction))
+                if len(in_flight) >= 2 * n_jobs:
+                    chunk, future, done = in_flight.pop(0)
+                    flush(chunk, future.result(), done)
+            for chunk, future, done in in_flight:
+                if should_stop and should_stop():
+                    break
+                flush(chunk, future.result(), done)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+    return rows_done
+
+_worker_model = None
+
+def _init_predict_worker(model):
+    global _worker_model
+    _worker_model = model
+
+def _predict_chunk(X):
+    return _worker_model.predict(X)
+
+def compare_models(X_train, X_test, y_train, y_test, model_names=None, max_workers=None, on_result=None, should_stop=None):
+    # Trains every model on the same split in parallel worker processes.
+    # Train and test rows go into one SharedDataset instead of being pickled to each worker;
+    # string labels are shared as integer codes.
+    model_names = list(model_names or MODEL_NAMES)
+    n_train = len(X_train)
+    store = SharedDataset([X_train, X_test], [np.asarray(y_train), np.asarray(y_test)])
+    max_workers = max_workers or min(len(model_names), os.cpu_count() or 1)
+    results = []
+    pending = set()
+    # spawn keeps the workers clean of the GUI state of the parent process; a fresh worker
+    # per model makes its peak RSS that model's alone
+    context = multiprocessing.get_context("spawn")
+    executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=context, max_tasks_per_child=1)
+    try:
+        futures = {executor.submit(_compare_worker, name, store.handle, n_train): name for name in model_names}
+        pending = set(futures)
+        while pending:
+            # Polled while every worker is busy, not only when a fit finishes
+            if should_stop and should_stop():
+                break
+            done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {"model": futures[future], "error": str(e)}
+                results.append(result)
+                if on_result:
+                    on_result(result)
+    finally:
+        if pending:
+            # Stopped early: fits still running are killed rather than waited for
+            workers = list((executor._processes or {}).values())
+            executor.shutdown(wait=False, cancel_futures=True)
+            for process in workers:
+                process.terminate()
+        else:
+            executor.shutdown()
+        store.close()
+
+    return sorted(results, key=lambda r: r.get("accuracy", float("-inf")), reverse=True)
+
+def _compare_worker(model_name, handle, n_train):
+    X, y, _, blocks = attach_dataset(handle)
+    try:
+        return _compare_fit(model_name, X, y, n_train)
+    finally:
+        # The views must be gone before the blocks can be closed
+        del X, y
+        release(blocks, unlink=False)
+
+def _compare_fit(model_name, X, y, n_train):
+    from sklearn.metrics import accuracy_score, r2_score
+    # Views into the shared store: the split costs no copy
+    X_train, X_test, y_train, y_test = X[:n_train], X[n_train:], y[:n_train], y[n_train:]
+    # Memory is read from the process's peak RSS rather than traced: tracemalloc would slow
+    # the fit being timed. The peak is restarted first, so imports and attaching the data do
+    # not hide what the fit itself needs (where it cannot be, only growth past them shows)
+    make_model(model_name)  # imports the estimator's modules before anything is measured
+    reset_peak_rss()
+    before = peak_rss()
+    start = time.perf_counter()
+    model = train_model(model_name, X_train, y_train)
+    fit_time = time.perf_counter() - start
+    peak = peak_rss() - before if before is not None else None
+
+    start = time.perf_counter()
+    y_pred = model.predict(X_test)
+    predict_time = time.perf_counter() - start
+
+    # Same metric calculate_accuracy reports: R² for regression, accuracy otherwise
+    if model_name in REGRESSION_MODELS:
+        accuracy = r2_score(y_test, y_pred)
+    else:
+        accuracy = accuracy_score(y_test, y_pred)
+    return {
+        "model": model_name,
+        "accuracy": float(accuracy),
+        "fit_time": fit_time,
+        "predict_time": predict_time,
+        "peak_memory": peak,
+    }
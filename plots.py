@@ -1,28 +1,273 @@
-import matplotlib.pyplot as plt
+import io
+from matplotlib.backend_bases import FigureCanvasBase
 from matplotlib.figure import Figure
+from matplotlib.colors import ListedColormap, LogNorm
+from matplotlib.patches import Patch
+import numpy as np
+import pandas as pd
 import seaborn as sns
-from sklearn.tree import plot_tree
 from sklearn.metrics import confusion_matrix
 
-def generate_plot(plot_name, model, dataset, selected_inputs, selected_output):
+# Scatter rendering strategy by number of points in view:
+# every point up to SCATTER_FULL_LIMIT, a (stratified) sample up to SCATTER_SAMPLE_LIMIT,
+# hexbin up to HEXBIN_LIMIT and a 2D-histogram raster beyond that
+SCATTER_FULL_LIMIT = 50_000
+SCATTER_SAMPLE_LIMIT = 500_000
+HEXBIN_LIMIT = 1_000_000
+SCATTER_SAMPLE_SIZE = 50_000
+PAIRPLOT_SAMPLE_SIZE = 5_000
+DENSITY_BINS = (480, 320)
+# Data points drawn over a decision surface
+SURFACE_POINTS = 2_000
+
+def generate_plot(plot_name, model, dataset, selected_inputs, selected_output, predictions=None, history=None,
+                  surface=None):
+    # predictions: model output for every row of dataset, reused instead of predicting again
+    # history: (training rows, accuracy) per step of progressive training
+    # surface: surface.DecisionSurface for the two inputs on the axes
     fig = Figure(figsize=(6, 4))
     ax = fig.add_subplot(111)
-    
+
     X = dataset[selected_inputs]
     y = dataset[selected_output] if selected_output else None
 
     if plot_name == "Scatter Plot":
         if selected_output:
-            ax.scatter(X.iloc[:, 0], y)
+            scatter_large(ax, X.iloc[:, 0], y)
             ax.set_xlabel(selected_inputs[0])
             ax.set_ylabel(selected_output)
         else:
-            sns.pairplot(dataset[selected_inputs])
+            sample = dataset[selected_inputs]
+            if len(sample) > PAIRPLOT_SAMPLE_SIZE:
+                sample = sample.sample(PAIRPLOT_SAMPLE_SIZE, random_state=0)
+            # Drawn into fig itself: seaborn's pairplot opens a pyplot figure, which is
+            # neither shown here nor safe to create off the Tk thread
+            sample = sample.select_dtypes("number")
+            if sample.shape[1] == 0:
+                raise ValueError("The scatter matrix needs at least one numeric input, or pick a target")
+            fig.delaxes(ax)
+            grid = fig.subplots(sample.shape[1], sample.shape[1], squeeze=False)
+            pd.plotting.scatter_matrix(sample, ax=grid, s=4, alpha=0.5)
     elif plot_name == "Confusion Matrix":
-        y_pred = model.predict(X)
-        cm = confusion_matrix(y, y_pred)
+        # Rows without a target are neither trained nor scored on, so they are left out here too
+        labelled = y.notna().to_numpy()
+        y_pred = np.asarray(predictions)[labelled] if predictions is not None else model.predict(X[labelled])
+        cm = confusion_matrix(y[labelled], y_pred)
         sns.heatmap(cm, annot=True, cmap="Blues", fmt="d", ax=ax)
+    elif plot_name == "Learning Curve":
+        if not history:
+            raise ValueError("No learning curve yet, train with Progressive enabled")
+        rows, scores = zip(*history)
+        ax.plot(rows, scores, marker="o")
+        for x, score in history:
+            ax.annotate(f"{score:.3f}", (x, score), textcoords="offset points", xytext=(0, 6),
+                        ha="center", fontsize=8)
+        if len(rows) > 1 and rows[-1] / rows[0] >= 10:
+            ax.set_xscale("log")
+        ax.set_xlabel("Training rows")
+        ax.set_ylabel("Accuracy")
+        ax.grid(True, alpha=0.3)
+    elif plot_name == "Decision Surface":
+        if surface is None:
+            raise ValueError("Select the X and Y inputs of the decision surface")
+        draw_surface(ax, surface, dataset, selected_output)
     else:
         raise ValueError("Unsupported plot type")
-    
-    return fig
\ No newline at end of file
+
+    return fig
+
+def render_png(fig, width=880, height=660, dpi=100):
+    # Rasterizes fig with Agg and returns PNG bytes; no GUI toolkit involved, so it can
+    # run on a worker thread while the Tk thread only decodes the finished image
+    fig.set_size_inches(width / dpi, height / dpi)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=dpi)
+    return buffer.getvalue()
+
+def scatter_large(ax, x, y, seed=0):
+    # Scatter that stays fast for millions of points: picks a strategy from the
+    # number of points in view and re-aggregates whenever the view limits change
+    x, _ = _axis_values(x, ax.set_xticks, ax.set_xticklabels)
+    y, labels = _axis_values(y, ax.set_yticks, ax.set_yticklabels)
+    valid = np.isfinite(x) & np.isfinite(y)
+    x, y = x[valid], y[valid]
+    strata = y if labels is not None else None
+    # One random priority per point, drawn once: a view samples its lowest-priority points,
+    # so zooming adds points instead of redrawing a different sample
+    priority = np.random.default_rng(seed).permutation(len(x))
+    artists = []
+
+    def render(*_):
+        for artist in artists:
+            artist.remove()
+        artists.clear()
+
+        x0, x1 = ax.get_xlim()
+        y0, y1 = ax.get_ylim()
+        in_view = (x >= x0) & (x <= x1) & (y >= y0) & (y <= y1)
+        xv, yv = x[in_view], y[in_view]
+        n = len(xv)
+
+        if n <= SCATTER_FULL_LIMIT:
+            artists.append(ax.scatter(xv, yv, s=6))
+            mode = "all points"
+        elif n <= SCATTER_SAMPLE_LIMIT or labels is not None:
+            idx = sample_by_priority(priority[in_view], SCATTER_SAMPLE_SIZE,
+                                     strata[in_view] if strata is not None else None)
+            artists.append(ax.scatter(xv[idx], yv[idx], s=4, alpha=0.5))
+            mode = f"{len(idx):,} sampled"
+        elif n <= HEXBIN_LIMIT:
+            artists.append(ax.hexbin(xv, yv, gridsize=100, mincnt=1, bins="log",
+                                     extent=(x0, x1, y0, y1), cmap="viridis"))
+            mode = "hexbin"
+        else:
+            counts = density_raster(xv, yv, (x0, x1, y0, y1), DENSITY_BINS)
+            artists.append(ax.imshow(
+                np.ma.masked_equal(counts.T, 0), origin="lower", extent=(x0, x1, y0, y1),
+                aspect="auto", norm=LogNorm(), cmap="viridis", interpolation="nearest"
+            ))
+            mode = "density"
+        ax.set_title(f"{n:,} points ({mode})", fontsize=9)
+        # Drawing must not move the view, the limits are what the user zoomed to
+        ax.set_xlim(x0, x1, emit=False)
+        ax.set_ylim(y0, y1, emit=False)
+
+    if len(x):
+        x_pad = (x.max() - x.min()) * 0.02 or 0.5
+        y_pad = (y.max() - y.min()) * 0.02 or 0.5
+        ax.set_xlim(x.min() - x_pad, x.max() + x_pad)
+        ax.set_ylim(y.min() - y_pad, y.max() + y_pad)
+    render()
+    on_view_change(ax, render)
+    return ax
+
+def _axis_values(values, set_ticks, set_labels):
+    # Floats for one scatter axis; a categorical column is drawn as codes with its labels as ticks
+    if isinstance(values, pd.Series) and not pd.api.types.is_numeric_dtype(values):
+        codes, labels = pd.factorize(values, sort=True)
+        values = codes.astype(np.float64)
+        values[codes < 0] = np.nan
+        set_ticks(range(len(labels)))
+        set_labels([str(label) for label in labels])
+        return values, labels
+    return np.asarray(values, dtype=np.float64), None
+
+def on_view_change(ax, callback):
+    # Calls callback once per pan or zoom. The toolbar sets xlim and then ylim, so on a GUI
+    # canvas both changes are collected into one timer tick instead of two renders.
+    pending = []
+
+    def fire():
+        pending.clear()
+        callback()
+        ax.figure.canvas.draw_idle()
+
+    def changed(_):
+        canvas = ax.figure.canvas
+        if type(canvas).new_timer is FigureCanvasBase.new_timer:
+            # No event loop to defer to (e.g. Agg)
+            callback()
+        elif not pending:
+            timer = canvas.new_timer(interval=1)
+            timer.single_shot = True
+            timer.add_callback(fire)
+            pending.append(timer)
+            timer.start()
+
+    ax.callbacks.connect("xlim_changed", changed)
+    ax.callbacks.connect("ylim_changed", changed)
+
+def draw_surface(ax, surface, dataset, output, seed=0):
+    # Model output over surface.x_col/y_col with a sample of the data on top; recomputed from
+    # the surface's tile cache whenever the view limits change
+    x0, x1, y0, y1 = surface.extent
+    image, extent, _ = surface.render((x0, x1), (y0, y1))
+    if surface.labels is not None:
+        n_classes = len(surface.labels)
+        colors = sns.color_palette("tab10" if n_classes <= 10 else "husl", n_classes)
+        cmap = ListedColormap(colors)
+        norm = dict(vmin=-0.5, vmax=n_classes - 0.5)
+    else:
+        cmap = "viridis"
+        norm = {}
+    artist = ax.imshow(image, origin="lower", extent=extent, aspect="auto", cmap=cmap,
+                       interpolation="nearest", alpha=0.6, **norm)
+    if surface.labels is None:
+        ax.figure.colorbar(artist, ax=ax, label=output)
+
+    points = dataset[[surface.x_col, surface.y_col]].to_numpy(dtype=np.float64)
+    target = dataset[output] if output else None
+    valid = np.isfinite(points).all(axis=1)
+    if surface.labels is not None and target is not None:
+        codes = pd.Categorical(target.astype(str), categories=[str(label) for label in surface.labels]).codes
+        valid &= codes >= 0
+        rng = np.random.default_rng(seed)
+        idx = np.flatnonzero(valid)[downsample(int(valid.sum()), SURFACE_POINTS, codes[valid], rng)]
+        ax.scatter(points[idx, 0], points[idx, 1], c=codes[idx], cmap=cmap, s=8,
+                   edgecolors="black", linewidths=0.3, **norm)
+        handles = [Patch(color=colors[i], label=str(label)) for i, label in enumerate(surface.labels[:20])]
+        ax.legend(handles=handles, fontsize=7, loc="upper right", title=output, title_fontsize=8)
+    else:
+        idx = np.flatnonzero(valid)[downsample(int(valid.sum()), SURFACE_POINTS)]
+        ax.scatter(points[idx, 0], points[idx, 1], s=4, color="black", alpha=0.4)
+    ax.set_xlabel(surface.x_col)
+    ax.set_ylabel(surface.y_col)
+    ax.set_xlim(x0, x1)
+    ax.set_ylim(y0, y1)
+    ax.set_autoscale_on(False)
+
+    def render(*_):
+        view_x, view_y = ax.get_xlim(), ax.get_ylim()
+        image, extent, level = surface.render(view_x, view_y)
+        artist.set_data(image)
+        artist.set_extent(extent)
+        ax.set_title(f"Decision surface, zoom level {level} ({surface.predicted:,} predictions)", fontsize=9)
+        ax.set_xlim(*view_x, emit=False)
+        ax.set_ylim(*view_y, emit=False)
+
+    render()
+    on_view_change(ax, render)
+    return ax
+
+def downsample(n, size, strata=None, rng=None):
+    # Indices of a random sample; with strata every class keeps its share (and at least one point)
+    rng = rng or np.random.default_rng(0)
+    if n <= size:
+        return np.arange(n)
+    if strata is None:
+        return np.sort(rng.choice(n, size, replace=False))
+    classes, inverse, counts = np.unique(strata, return_inverse=True, return_counts=True)
+    order = np.argsort(inverse, kind="stable")
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    picks = []
+    for start, count in zip(starts, counts):
+        take = min(count, max(1, int(round(size * count / n))))
+        picks.append(order[start + rng.choice(count, take, replace=False)])
+    return np.sort(np.concatenate(picks))
+
+def sample_by_priority(priority, size, strata=None):
+    # Indices of the `size` lowest priorities; with strata every class keeps its share (and at
+    # least one point), like downsample but the same points stay picked as the view changes
+    n = len(priority)
+    if n <= size:
+        return np.arange(n)
+    if strata is None:
+        return np.sort(np.argpartition(priority, size)[:size])
+    classes, inverse, counts = np.unique(strata, return_inverse=True, return_counts=True)
+    order = np.lexsort((priority, inverse))
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    picks = []
+    for start, count in zip(starts, counts):
+        take = min(count, max(1, int(round(size * count / n))))
+        picks.append(order[start:start + take])
+    return np.sort(np.concatenate(picks))
+
+def density_raster(x, y, extent, bins):
+    # 2D histogram via direct binning and bincount, much faster than np.histogram2d
+    x0, x1, y0, y1 = extent
+    width, height = bins
+    ix = ((x - x0) * (width / (x1 - x0))).astype(np.intp)
+    iy = ((y - y0) * (height / (y1 - y0))).astype(np.intp)
+    np.clip(ix, 0, width - 1, out=ix)
+    np.clip(iy, 0, height - 1, out=iy)
+    return np.bincount(ix * height + iy, minlength=width * height).reshape(width, height)
@@ -0,0 +1,178 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+# Categorical inputs with at most this many distinct values are one-hot encoded, larger ones ordinal encoded
+MAX_ONEHOT = 20
+
+
+class Preprocessor:
+    # Fitted once per feature selection and reused for training, evaluation, plots and prediction.
+    # Numeric columns: median imputation + standard scaling.
+    # Categorical columns: most-frequent imputation + one-hot (or ordinal codes when high-cardinality);
+    # values never seen during fit encode as all zeros (one-hot) or -1 (ordinal).
+    def __init__(self, inputs, max_onehot=MAX_ONEHOT):
+        self.inputs = list(inputs)
+        self.max_onehot = max_onehot
+        self.numeric = []
+        self.medians = self.means = self.scales = None
+        self.categorical = []  # (column, categories, mode index, "onehot" | "ordinal")
+        self.target_classes = None
+        self.feature_names = []
+
+    def fit(self, df, target=None):
+        self.numeric, self.categorical = [], []
+        for col in self.inputs:
+            series = df[col]
+            if _is_numeric(series):
+                self.numeric.append(col)
+            else:
+                counts = series.value_counts(dropna=True)
+                if counts.empty:
+                    raise ValueError(f"Column {col!r} has no values")
+                categories = pd.Index(counts.index.astype(str))
+                if len(categories) <= self.max_onehot:
+                    kind = "onehot"
+                else:
+                    # Ordinal codes follow the sorted labels so they are stable across refits
+                    categories = categories.sort_values()
+                    kind = "ordinal"
+                mode = categories.get_loc(str(counts.index[0]))
+                self.categorical.append((col, categories, mode, kind))
+
+        if self.numeric:
+            values = _numeric_matrix(df, self.numeric)
+            with np.errstate(all="ignore"):
+                medians = np.nanmedian(values, axis=0)
+            medians = np.where(np.isnan(medians), 0.0, medians)
+            filled = np.where(np.isnan(values), medians, values)
+            scales = filled.std(axis=0)
+            self.medians = medians
+            self.means = filled.mean(axis=0)
+            self.scales = np.where(scales > 0, scales, 1.0)
+
+        if target is not None:
+            y = df[target]
+            # Categorical targets get one fixed label order, reused for every model and split
+            self.target_classes = None if _is_numeric(y) else np.unique(y.dropna().astype(str).to_numpy())
+
+        self.feature_names = list(self.numeric)
+        for col, categories, _, kind in self.categorical:
+            if kind == "onehot":
+                self.feature_names.extend(f"{col}={value}" for value in categories)
+            else:
+                self.feature_names.append(col)
+        return self
+
+    def transform(self, df):
+        # Compact float32 feature matrix in feature_names order
+        n = len(df)
+        out = np.zeros((n, len(self.feature_names)), dtype=np.float32)
+        offset = len(self.numeric)
+        if self.numeric:
+            values = _numeric_matrix(df, self.numeric)
+            values = np.where(np.isnan(values), self.medians, values)
+            out[:, :offset] = (values - self.means) / self.scales
+        rows = np.arange(n)
+        for col, categories, mode, kind in self.categorical:
+            series = df[col]
+            codes = pd.Categorical(series.astype(str), categories=categories).codes.astype(np.int64)
+            codes[series.isna().to_numpy()] = mode
+            if kind == "onehot":
+                known = codes >= 0
+                out[rows[known], offset + codes[known]] = 1.0
+                offset += len(categories)
+            else:
+                out[:, offset] = codes
+                offset += 1
+        return out
+
+    def transform_row(self, values):
+        # values: {column: text} as typed in the prediction form; blank means missing (imputed)
+        row = {}
+        for col in self.inputs:
+            text = str(values.get(col, "")).strip()
+            if col in self.numeric:
+                if not text:
+                    row[col] = [np.nan]
+                    continue
+                try:
+                    row[col] = [float(text)]
+                except ValueError:
+                    raise ValueError(f"{col} expects a number, got {text!r}")
+            else:
+                row[col] = [text if text else None]
+        return self.transform(pd.DataFrame(row))
+
+    def encode_target(self, y):
+        # Categorical targets as integer codes (-1 for unseen or missing labels), numeric ones unchanged
+        if self.target_classes is None:
+            return np.asarray(y)
+        labels = pd.Series(y).astype(str)
+        labels = np.asarray(labels.where(labels.notna(), ""))
+        codes = np.searchsorted(self.target_classes, labels)
+        codes = np.clip(codes, 0, len(self.target_classes) - 1)
+        return np.where(self.target_classes[codes] == labels, codes, -1)
+
+    def decode_target(self, values):
+        # Nearest class label for (possibly fractional) codes predicted by a regressor
+        if self.target_classes is None:
+            return np.asarray(values)
+        codes = np.clip(np.rint(np.asarray(values, dtype=np.float64)), 0, len(self.target_classes) - 1)
+        return self.target_classes[codes.astype(np.intp)]
+
+
+def prepare_dataset(dataset, inputs, target, test_size=0.2, random_state=42):
+    # Split indices, a Preprocessor fitted on the training rows, and the whole dataset encoded once
+    from sklearn.model_selection import train_test_split
+
+    # Rows without a target can be neither fitted nor scored: they are left out of both
+    # splits, but stay encoded in X so it keeps lining up with the dataset's rows
+    labelled = np.flatnonzero(dataset[target].notna().to_numpy())
+    if len(labelled) < 2:
+        raise ValueError(f"Target column {target!r} has fewer than two values")
+    train_idx, test_idx = train_test_split(
+        labelled, test_size=test_size, random_state=random_state
+    )
+    preprocessor = Preprocessor(inputs).fit(dataset.iloc[train_idx], target)
+    return {
+        "preprocessor": preprocessor,
+        "X": preprocessor.transform(dataset),
+        "y": dataset[target].to_numpy(),
+        "train_idx": train_idx,
+        "test_idx": test_idx,
+    }
+
+
+class PreparedCache:
+    # prepare_dataset results for the most recent feature selections, so switching models reuses them
+    def __init__(self, max_items=2):
+        self.max_items = max_items
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, dataset, inputs, target, test_size=0.2, random_state=42):
+        key = (id(dataset), len(dataset), tuple(inputs), target, test_size, random_state)
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                return self._items[key]
+        prepared = prepare_dataset(dataset, inputs, target, test_size, random_state)
+        with self._lock:
+            self._items[key] = prepared
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+        return prepared
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+def _is_numeric(series):
+    return pd.api.types.is_numeric_dtype(series.dtype) and not isinstance(series.dtype, pd.CategoricalDtype)
+
+
+def _numeric_matrix(df, columns):
+    return df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
@@ -0,0 +1,156 @@
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+try:
+    import resource
+except ImportError:  # Windows: peak RSS is not reported
+    resource = None
+
+
+class _NullStage:
+    # Shared no-op stage handed out while profiling is disabled
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, rows=None, cols=None):
+        pass
+
+
+_DISABLED = _NullStage()
+
+
+def peak_rss():
+    # Peak resident set size of the process in bytes, or None where unsupported.
+    # On Linux it is read from /proc, which also counts from the last reset_peak_rss()
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def reset_peak_rss():
+    # Restarts the process's peak RSS at its current RSS (Linux 4.0+); False where it cannot be
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        return False
+    return True
+
+
+class _Stage:
+    def __init__(self, profiler, name, rows, cols):
+        self.profiler = profiler
+        self.name = name
+        self.rows = rows
+        self.cols = cols
+
+    def set(self, rows=None, cols=None):
+        # Shape known only once the stage has run (e.g. rows of a loaded file)
+        if rows is not None:
+            self.rows = rows
+        if cols is not None:
+            self.cols = cols
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        self.cpu = time.thread_time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler._record({
+            "name": self.name,
+            "start": self.start,
+            "wall": time.perf_counter() - self.start,
+            "cpu": time.thread_time() - self.cpu,
+            "peak_rss": peak_rss(),
+            "rows": self.rows,
+            "cols": self.cols,
+            "thread": threading.current_thread().name,
+            "tid": threading.get_ident(),
+            "error": exc_type.__name__ if exc_type else None,
+        })
+        return False
+
+
+class Profiler:
+    # Records wall time, CPU time of the calling thread, peak RSS and data shape per stage
+    def __init__(self, enabled=False, max_events=10_000):
+        self.enabled = enabled
+        self.origin = time.perf_counter()
+        self.events = deque(maxlen=max_events)
+        self._lock = threading.Lock()
+
+    def stage(self, name, rows=None, cols=None):
+        if not self.enabled:
+            return _DISABLED
+        return _Stage(self, name, rows, cols)
+
+    def clear(self):
+        with self._lock:
+            self.events.clear()
+
+    def _record(self, event):
+        with self._lock:
+            self.events.append(event)
+
+    def summary(self, last=6):
+        # One line for the status bar: the most recent stages, newest last
+        with self._lock:
+            events = list(self.events)[-last:]
+        parts = []
+        for event in events:
+            part = f"{event['name']} {event['wall'] * 1000:.0f}ms"
+            if event["rows"] is not None:
+                part += f" ({event['rows']:,}x{event['cols'] or 0})"
+            parts.append(part)
+        peak = events[-1]["peak_rss"] if events else None
+        if peak:
+            parts.append(f"peak RSS {peak / 1024 ** 2:.0f} MB")
+        return " | ".join(parts)
+
+    def export_chrome_trace(self, path):
+        # Chrome trace event format, viewable in chrome://tracing or Perfetto
+        with self._lock:
+            events = list(self.events)
+        pid = os.getpid()
+        trace = []
+        for event in events:
+            trace.append({
+                "name": event["name"],
+                "cat": "stage",
+                "ph": "X",
+                "ts": (event["start"] - self.origin) * 1e6,
+                "dur": event["wall"] * 1e6,
+                "pid": pid,
+                "tid": event["tid"],
+                "args": {
+                    "cpu_ms": event["cpu"] * 1000,
+                    "peak_rss_mb": event["peak_rss"] / 1024 ** 2 if event["peak_rss"] else None,
+                    "rows": event["rows"],
+                    "cols": event["cols"],
+                    "thread": event["thread"],
+                    "error": event["error"],
+                },
+            })
+        with open(path, "w") as f:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
+        return len(trace)
+
+
+# Shared instance, also switchable from the File menu; ML_VIZ_PROFILE=1 enables it at startup
+PROFILER = Profiler(enabled=os.environ.get("ML_VIZ_PROFILE") == "1")
@@ -0,0 +1,228 @@
+import json
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+import pandas as pd
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# A batch is scored once it holds MAX_BATCH rows or MAX_DELAY seconds after its first request
+MAX_BATCH = 512
+MAX_DELAY = 0.002
+
+
+class PredictionService:
+    # Scores rows with a saved model bundle (see models.save_model_bundle). Concurrent
+    # requests are queued and a single batcher thread encodes and predicts them together,
+    # so many small requests cost one vectorized predict call per batch.
+    def __init__(self, bundle, max_batch=MAX_BATCH, max_delay=MAX_DELAY, window=10_000):
+        self.bundle = bundle
+        self.model = bundle["model"]
+        self.inputs = list(bundle["inputs"])
+        self.preprocessor = bundle.get("preprocessor")
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.started = time.time()
+        self._queue = queue.Queue()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._requests = deque(maxlen=window)  # (finished at, latency, rows)
+        self._batch_sizes = deque(maxlen=window)
+        self._totals = {"requests": 0, "rows": 0, "batches": 0, "errors": 0}
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="prediction-batcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+        # Requests still queued would otherwise wait for their timeout
+        while True:
+            try:
+                _, future, _ = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            future.set_exception(RuntimeError("Prediction server stopped"))
+
+    def predict(self, rows, timeout=30):
+        # rows: list of {input column: value}; blocks until the batch holding them is scored.
+        # Every row is checked here, so a bad one fails only its own request.
+        if not rows:
+            return []
+        for i, row in enumerate(rows):
+            if not isinstance(row, dict):
+                raise ValueError(f"Row {i} is not an object of input values")
+            missing = [col for col in self.inputs if col not in row]
+            if missing:
+                raise ValueError(f"Row {i} is missing inputs: {', '.join(missing)}")
+        if self._stopped.is_set():
+            raise RuntimeError("Prediction server stopped")
+        future = Future()
+        self._queue.put((rows, future, time.perf_counter()))
+        return future.result(timeout)
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                first = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            batch = [first]
+            size = len(first[0])
+            deadline = time.perf_counter() + self.max_delay
+            while size < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(item)
+                size += len(item[0])
+            self._score(batch, size)
+
+    def _score(self, batch, size):
+        try:
+            predictions = self._predict([row for rows, _, _ in batch for row in rows])
+        except Exception:
+            # One bad request must not fail the others: score them one by one
+            for item in batch:
+                self._score_one(item)
+            return
+        start = 0
+        for rows, future, _ in batch:
+            future.set_result(predictions[start:start + len(rows)])
+            start += len(rows)
+        self._record(batch, size)
+
+    def _score_one(self, item):
+        rows, future, _ = item
+        try:
+            future.set_result(self._predict(rows))
+            self._record([item], len(rows))
+        except Exception as e:
+            with self._lock:
+                self._totals["errors"] += 1
+            future.set_exception(e)
+
+    def _predict(self, rows):
+        frame = pd.DataFrame.from_records(rows, columns=self.inputs)
+        if self.preprocessor is not None:
+            X = self.preprocessor.transform(frame)
+        else:
+            X = frame.to_numpy(dtype=np.float64)
+        return np.asarray(self.model.predict(X)).tolist()
+
+    def _record(self, batch, size):
+        now = time.perf_counter()
+        with self._lock:
+            for rows, _, queued in batch:
+                self._requests.append((now, now - queued, len(rows)))
+            self._batch_sizes.append(size)
+            self._totals["requests"] += len(batch)
+            self._totals["rows"] += size
+            self._totals["batches"] += 1
+
+    def metrics(self):
+        # Totals since start plus throughput and latency percentiles over the recent window
+        with self._lock:
+            requests = list(self._requests)
+            batch_sizes = list(self._batch_sizes)
+            result = dict(self._totals)
+        result["uptime"] = time.time() - self.started
+        result["mean_batch_size"] = float(np.mean(batch_sizes)) if batch_sizes else 0.0
+        if requests:
+            latencies = np.array([latency for _, latency, _ in requests]) * 1000
+            span = max(requests[-1][0] - requests[0][0] + requests[0][1], 1e-9)
+            result["requests_per_second"] = len(requests) / span
+            result["rows_per_second"] = sum(rows for _, _, rows in requests) / span
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+            result["latency_ms"] = {"p50": p50, "p95": p95, "p99": p99, "max": float(latencies.max())}
+        return result
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # Bursts of concurrent clients would overflow the default listen backlog of 5
+    request_queue_size = 128
+
+
+def make_server(service, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    # POST /predict  {"rows": [{column: value}, ...]} -> {"predictions": [...]}
+    # GET  /metrics  throughput and latency percentiles
+    # GET  /health   model name, inputs and target
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/health":
+                self._reply(200, {
+                    "status": "ok",
+                    "model": service.bundle.get("model_name"),
+                    "inputs": service.inputs,
+                    "target": service.bundle.get("target"),
+                })
+            elif self.path == "/metrics":
+                self._reply(200, service.metrics())
+            else:
+                self._reply(404, {"error": f"unknown path {self.path}"})
+
+        def do_POST(self):
+            if self.path != "/predict":
+                self._reply(404, {"error": f"unknown path {self.path}"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                rows = payload["rows"] if isinstance(payload, dict) else payload
+                if isinstance(rows, dict):
+                    rows = [rows]
+                self._reply(200, {"predictions": service.predict(rows)})
+            except (ValueError, KeyError, TypeError) as e:
+                self._reply(400, {"error": str(e)})
+            except Exception as e:
+                self._reply(500, {"error": str(e)})
+
+        def _reply(self, status, body):
+            data = json.dumps(body, default=_to_json).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return _Server((host, port), Handler)
+
+
+def start_server(bundle, host=DEFAULT_HOST, port=DEFAULT_PORT, max_batch=MAX_BATCH, max_delay=MAX_DELAY):
+    # Serves in a background thread; returns (server, service), stop with stop_server
+    service = PredictionService(bundle, max_batch=max_batch, max_delay=max_delay).start()
+    try:
+        server = make_server(service, host, port)
+    except OSError:
+        service.stop()
+        raise
+    threading.Thread(target=server.serve_forever, name="prediction-server", daemon=True).start()
+    return server, service
+
+
+def stop_server(server, service):
+    server.shutdown()
+    server.server_close()
+    service.stop()
+
+
+def _to_json(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
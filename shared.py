@@ -0,0 +1,127 @@
+import os
+import tempfile
+import numpy as np
+from multiprocessing import shared_memory
+
+
+def release(blocks, unlink=True):
+    for block in blocks:
+        try:
+            block.close()
+            if unlink:
+                block.unlink()
+        except (FileNotFoundError, BufferError):
+            pass
+
+
+def _attach(block_name):
+    # Pool workers share the parent's resource tracker, so attaching never unlinks on exit
+    try:
+        return shared_memory.SharedMemory(name=block_name, track=False)
+    except TypeError:  # track= is Python 3.13+
+        return shared_memory.SharedMemory(name=block_name)
+
+
+class SharedDataset:
+    # Feature matrix and target placed once where any number of worker processes can map them:
+    # X as one C-contiguous float32 matrix, y as float32 values, integer labels or int32 class
+    # codes (the labels travel in the handle). Uses shared memory, or memory-mapped files in directory when shared
+    # memory is unavailable or use_memmap is set. X and y may also be sequences of row blocks
+    # (e.g. train and test rows), which are stacked straight into the store.
+    def __init__(self, X, y=None, use_memmap=False, directory=None):
+        X_parts = list(X) if isinstance(X, (list, tuple)) else [X]
+        arrays = {"X": (_stacked_shape(X_parts), np.float32, X_parts)}
+        self.classes = None
+        if y is not None:
+            y_parts = [np.asarray(part) for part in (y if isinstance(y, (list, tuple)) else [y])]
+            y_all = y_parts[0] if len(y_parts) == 1 else np.concatenate(y_parts)
+            if np.issubdtype(y_all.dtype, np.floating):
+                arrays["y"] = (y_all.shape, np.float32, [y_all])
+            elif np.issubdtype(y_all.dtype, np.integer) or y_all.dtype == bool:
+                # Integer class labels stay integers so classifiers predict the same labels
+                arrays["y"] = (y_all.shape, np.int64, [y_all])
+            else:
+                self.classes, codes = np.unique(y_all.astype(str), return_inverse=True)
+                arrays["y"] = (y_all.shape, np.int32, [codes])
+        self.blocks = []
+        self.paths = []
+        self.handle = {"classes": None if self.classes is None else self.classes.tolist()}
+        try:
+            for name, (shape, dtype, parts) in arrays.items():
+                self.handle[name] = self._store(shape, dtype, parts, use_memmap, directory)
+        except Exception:
+            self.close()
+            raise
+
+    def _store(self, shape, dtype, parts, use_memmap, directory):
+        nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        if not use_memmap:
+            try:
+                block = shared_memory.SharedMemory(create=True, size=max(nbytes, 1))
+            except OSError:  # e.g. /dev/shm too small
+                block = None
+            if block is not None:
+                self.blocks.append(block)
+                _fill(np.ndarray(shape, dtype=dtype, buffer=block.buf), parts)
+                return ("shm", block.name, shape, np.dtype(dtype).str)
+        fd, path = tempfile.mkstemp(suffix=".bin", prefix="ml_viz_", dir=directory)
+        os.close(fd)
+        self.paths.append(path)
+        if nbytes:
+            view = np.memmap(path, dtype=dtype, mode="w+", shape=shape)
+            _fill(view, parts)
+            view.flush()
+            del view
+        return ("memmap", path, shape, np.dtype(dtype).str)
+
+    def close(self):
+        # Owner side: frees the shared memory and deletes the files once workers are done
+        release(self.blocks)
+        self.blocks = []
+        for path in self.paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self.paths = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def attach_dataset(handle):
+    # Worker side: read-only (X, y, classes, blocks); pass blocks to release(blocks, unlink=False)
+    views, blocks = {}, []
+    for name in ("X", "y"):
+        if name not in handle:
+            views[name] = None
+            continue
+        kind, location, shape, dtype = handle[name]
+        if kind == "shm":
+            block = _attach(location)
+            blocks.append(block)
+            view = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+            view.flags.writeable = False
+        elif int(np.prod(shape)):
+            view = np.memmap(location, dtype=np.dtype(dtype), mode="r", shape=shape)
+        else:
+            view = np.empty(shape, dtype=np.dtype(dtype))
+        views[name] = view
+    classes = None if handle["classes"] is None else np.asarray(handle["classes"])
+    return views["X"], views["y"], classes, blocks
+
+
+def _stacked_shape(parts):
+    first = np.shape(parts[0])
+    return (sum(len(part) for part in parts),) + tuple(first[1:])
+
+
+def _fill(view, parts):
+    start = 0
+    for part in parts:
+        view[start:start + len(part)] = part
+        start += len(part)
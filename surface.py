@@ -0,0 +1,178 @@
+import math
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+# Decision surface of a trained model over two numeric inputs, every other input held at its
+# median (numeric) or most frequent value (categorical).
+#
+# The plane is cut into tiles of TILE_CELLS x TILE_CELLS samples; zoom level L splits the data
+# extent into 2**L x 2**L tiles. A tile is sampled every COARSE_STEP cells first and a block is
+# only subdivided where its corners disagree (a class boundary, or for regression a change of
+# more than REGRESSION_TOLERANCE of the value range); agreeing blocks are filled in. All points
+# of one refinement step, over every missing tile, are predicted in one batch. Finished tiles
+# are kept, so zooming and panning only computes tiles never seen before.
+TILE_CELLS = 64
+COARSE_STEP = 8
+# Minimum number of cells across the view; picks the zoom level
+VIEW_CELLS = 256
+MAX_LEVEL = 12
+MAX_TILES = 2048
+PREDICT_BATCH = 65_536
+REGRESSION_TOLERANCE = 0.01
+
+
+class DecisionSurface:
+    def __init__(self, model, dataset, inputs, x_col, y_col, preprocessor=None):
+        if x_col == y_col:
+            raise ValueError("Pick two different inputs for the decision surface")
+        for col in (x_col, y_col):
+            if col not in inputs:
+                raise ValueError(f"{col} is not an input of the model")
+            if not pd.api.types.is_numeric_dtype(dataset[col]):
+                raise ValueError(f"{col} is not numeric, the decision surface needs numeric axes")
+        self.model = model
+        self.x_col, self.y_col = x_col, y_col
+
+        if preprocessor is not None:
+            # An all-missing row is imputed to the medians and modes
+            self.base = preprocessor.transform(pd.DataFrame({col: [np.nan] for col in inputs}))[0]
+            positions = {col: i for i, col in enumerate(preprocessor.numeric)}
+            self.axes = [
+                (positions[col], preprocessor.means[positions[col]], preprocessor.scales[positions[col]])
+                for col in (x_col, y_col)
+            ]
+        else:
+            self.base = dataset[inputs].median(numeric_only=True).reindex(inputs).to_numpy(dtype=np.float64)
+            self.axes = [(inputs.index(col), 0.0, 1.0) for col in (x_col, y_col)]
+
+        # Classifiers are drawn as class codes, a regressor trained on a categorical target as
+        # its nearest class, any other regressor as its value
+        self.classes = getattr(model, "classes_", None)
+        self.target_classes = preprocessor.target_classes if preprocessor is not None else None
+        if self.classes is not None:
+            self.labels = np.asarray(self.classes)
+        else:
+            self.labels = self.target_classes
+        self.tolerance = 0.0 if self.labels is not None else None
+
+        values = dataset[[x_col, y_col]].to_numpy(dtype=np.float64)
+        values = values[np.isfinite(values).all(axis=1)]
+        if not len(values):
+            raise ValueError(f"{x_col} and {y_col} have no values in common")
+        lo, hi = values.min(axis=0), values.max(axis=0)
+        pad = np.where(hi > lo, (hi - lo) * 0.05, 0.5)
+        self.extent = (lo[0] - pad[0], hi[0] + pad[0], lo[1] - pad[1], hi[1] + pad[1])
+
+        self.tiles = OrderedDict()  # (level, tx, ty) -> (TILE_CELLS, TILE_CELLS) float32, rows along y
+        self.predicted = 0
+        self._lock = threading.Lock()
+
+    def render(self, x_range=None, y_range=None):
+        # Mosaic of the tiles covering the view: (image with rows along y, its extent, level)
+        X0, X1, Y0, Y1 = self.extent
+        width, height = X1 - X0, Y1 - Y0
+        x0, x1 = x_range or (X0, X1)
+        y0, y1 = y_range or (Y0, Y1)
+        # Far outside the data the model is only extrapolating; a bounded view also bounds the tile count
+        x0, x1 = max(min(x0, x1), X0 - width), min(max(x0, x1), X1 + width)
+        y0, y1 = max(min(y0, y1), Y0 - height), min(max(y0, y1), Y1 + height)
+        level = min(self._level(width, x1 - x0), self._level(height, y1 - y0))
+        tile_w = width / 2 ** level
+        tile_h = height / 2 ** level
+        tx0, tx1 = math.floor((x0 - X0) / tile_w), math.floor((x1 - X0) / tile_w)
+        ty0, ty1 = math.floor((y0 - Y0) / tile_h), math.floor((y1 - Y0) / tile_h)
+        n = TILE_CELLS
+        image = np.empty(((ty1 - ty0 + 1) * n, (tx1 - tx0 + 1) * n), dtype=np.float32)
+        with self._lock:
+            missing = [(tx, ty) for ty in range(ty0, ty1 + 1) for tx in range(tx0, tx1 + 1)
+                       if (level, tx, ty) not in self.tiles]
+            if missing:
+                for tile, values in zip(missing, self._compute(level, missing)):
+                    self.tiles[(level,) + tile] = values
+            for ty in range(ty0, ty1 + 1):
+                for tx in range(tx0, tx1 + 1):
+                    key = (level, tx, ty)
+                    self.tiles.move_to_end(key)
+                    image[(ty - ty0) * n:(ty - ty0 + 1) * n, (tx - tx0) * n:(tx - tx0 + 1) * n] = self.tiles[key]
+            while len(self.tiles) > MAX_TILES:
+                self.tiles.popitem(last=False)
+        extent = (X0 + tx0 * tile_w, X0 + (tx1 + 1) * tile_w, Y0 + ty0 * tile_h, Y0 + (ty1 + 1) * tile_h)
+        return image, extent, level
+
+    def _level(self, full, view):
+        if view <= 0:
+            return MAX_LEVEL
+        level = math.ceil(math.log2(max(VIEW_CELLS * full / (TILE_CELLS * view), 1.0)))
+        return min(level, MAX_LEVEL)
+
+    def _compute(self, level, tiles):
+        # Samples sit on cell centres; every tile also computes the first row and column of
+        # its neighbours so blocks along its edges have all four corners
+        n, s = TILE_CELLS, COARSE_STEP
+        X0, X1, Y0, Y1 = self.extent
+        cell_w = (X1 - X0) / (n * 2 ** level)
+        cell_h = (Y1 - Y0) / (n * 2 ** level)
+        origin = np.asarray(tiles, dtype=np.float64) * n
+        grid = np.full((len(tiles), n + 1, n + 1), np.nan)
+
+        def evaluate(mask):
+            t, r, c = np.nonzero(mask)
+            xs = X0 + (origin[t, 0] + c + 0.5) * cell_w
+            ys = Y0 + (origin[t, 1] + r + 0.5) * cell_h
+            grid[t, r, c] = self._values(xs, ys)
+
+        step = np.zeros(grid.shape, dtype=bool)
+        step[:, ::s, ::s] = True
+        evaluate(step)
+        if self.tolerance is None:
+            self.tolerance = REGRESSION_TOLERANCE * float(np.ptp(grid[step]))
+
+        index = np.arange(n + 1)
+        while s > 1:
+            blocks = n // s
+            corners = grid[:, ::s, ::s]
+            c00, c01 = corners[:, :-1, :-1], corners[:, :-1, 1:]
+            c10, c11 = corners[:, 1:, :-1], corners[:, 1:, 1:]
+            stacked = np.stack([c00, c01, c10, c11])
+            rough = stacked.max(axis=0) - stacked.min(axis=0) > self.tolerance
+            # Blocks holding each sample: the one it starts in and, on a block edge, the one before
+            lo = np.minimum(index // s, blocks - 1)
+            hi = np.where(index % s == 0, np.maximum(index // s - 1, 0), lo)
+            near_rough = (rough[:, lo[:, None], lo[None, :]] | rough[:, lo[:, None], hi[None, :]]
+                          | rough[:, hi[:, None], lo[None, :]] | rough[:, hi[:, None], hi[None, :]])
+            unknown = np.isnan(grid)
+            t, r, c = np.nonzero(unknown & ~near_rough)
+            if len(t):
+                # Bilinear between the corners; equal corners (one class) make this a plain fill
+                br, bc = lo[r], lo[c]
+                u = (r - br * s) / s
+                v = (c - bc * s) / s
+                grid[t, r, c] = ((1 - u) * (1 - v) * c00[t, br, bc] + (1 - u) * v * c01[t, br, bc]
+                                 + u * (1 - v) * c10[t, br, bc] + u * v * c11[t, br, bc])
+            s //= 2
+            step[:] = False
+            step[:, ::s, ::s] = True
+            evaluate(step & unknown & near_rough)
+
+        if self.labels is not None:
+            grid = np.rint(grid)
+        return list(grid[:, :n, :n].astype(np.float32))
+
+    def _values(self, xs, ys):
+        out = np.empty(len(xs))
+        for start in range(0, len(xs), PREDICT_BATCH):
+            stop = start + PREDICT_BATCH
+            X = np.repeat(self.base[None, :], len(xs[start:stop]), axis=0)
+            for (position, mean, scale), values in zip(self.axes, (xs[start:stop], ys[start:stop])):
+                X[:, position] = (values - mean) / scale
+            pred = np.asarray(self.model.predict(X))
+            if self.classes is not None:
+                out[start:stop] = np.searchsorted(self.classes, pred)
+            elif self.target_classes is not None:
+                out[start:stop] = np.clip(np.rint(pred.astype(np.float64)), 0, len(self.target_classes) - 1)
+            else:
+                out[start:stop] = pred.astype(np.float64).reshape(len(X), -1)[:, 0]
+        self.predicted += len(xs)
+        return out
@@ -0,0 +1,144 @@
+import itertools
+import time
+import numpy as np
+from models import make_model, train_model, REGRESSION_MODELS
+
+# Candidate values per constructor argument of make_model(); configurations are
+# drawn from the grid of all combinations
+SEARCH_SPACES = {
+    "Linear / Multiple Regression": {
+        "fit_intercept": [True, False],
+    },
+    "Logistic Regression": {
+        "C": [0.01, 0.1, 1.0, 10.0, 100.0],
+        "max_iter": [1000],
+    },
+    "Decision Tree": {
+        "max_depth": [None, 4, 8, 16],
+        "min_samples_leaf": [1, 5, 20],
+        "criterion": ["gini", "entropy"],
+    },
+    "Random Forest": {
+        "n_estimators": [50, 100, 200],
+        "max_depth": [None, 8, 16],
+        "max_features": ["sqrt", 0.5],
+        "min_samples_leaf": [1, 5],
+    },
+    "SVM": {
+        "C": [0.1, 1.0, 10.0],
+        "gamma": ["scale", 0.01, 0.1],
+        "kernel": ["rbf", "linear"],
+    },
+    "Naive Bayes": {
+        "var_smoothing": [1e-9, 1e-8, 1e-7, 1e-6],
+    },
+}
+
+
+def candidates(model_name, n_candidates=16, random_state=42):
+    # Up to n_candidates distinct configurations, sampled from the model's grid
+    space = SEARCH_SPACES[model_name]
+    keys = list(space)
+    grid = [dict(zip(keys, values)) for values in itertools.product(*(space[k] for k in keys))]
+    if len(grid) <= n_candidates:
+        return grid
+    picks = np.random.default_rng(random_state).choice(len(grid), n_candidates, replace=False)
+    return [grid[i] for i in sorted(picks)]
+
+
+def tune_model(model_name, X, y, n_candidates=16, cv=3, factor=3, min_rows=None, budget=None,
+               n_jobs=-1, random_state=42, progress=None, should_stop=None):
+    # Successive halving: every configuration is cross-validated on a small subset of rows,
+    # the best 1/factor go on to a factor times larger subset, until one round runs on all rows.
+    # No round is started that would likely end after budget seconds; the best configuration
+    # of the last finished round is then refitted on all of X, y.
+    # Returns (model, params, table) with one table row per configuration and round.
+    from joblib import Parallel, delayed
+
+    start = time.perf_counter()
+    X = np.asarray(X)
+    y = np.asarray(y)
+    n = len(X)
+    configs = candidates(model_name, n_candidates, random_state)
+    rounds, remaining = 1, len(configs)
+    while remaining > 1:
+        remaining = max(1, remaining // factor)
+        rounds += 1
+    min_rows = min(n, max(min_rows or n // factor ** (rounds - 1), 20 * cv))
+    # One shuffled order so every round's subset contains the previous one
+    order = np.random.default_rng(random_state).permutation(n)
+
+    table = []
+    survivors = list(range(len(configs)))
+    scores = None
+    with Parallel(n_jobs=n_jobs) as parallel:
+        for round_index in range(rounds):
+            if should_stop and should_stop():
+                break
+            # A round costs about as much as the previous one (factor x rows, 1/factor configurations)
+            if scores is not None and budget is not None and time.perf_counter() - start + round_time > budget:
+                break
+            round_start = time.perf_counter()
+            rows = n if round_index == rounds - 1 else min(n, min_rows * factor ** round_index)
+            subset = order[:rows]
+            X_sub, y_sub = X[subset], y[subset]
+            folds = _folds(model_name, y_sub, cv, random_state)
+            results = parallel(
+                delayed(_score_fold)(model_name, configs[i], X_sub, y_sub, train, test)
+                for i in survivors for train, test in folds
+            )
+            scores = {}
+            for position, i in enumerate(survivors):
+                fold_results = results[position * len(folds):(position + 1) * len(folds)]
+                fold_scores = [score for score, _ in fold_results]
+                scores[i] = float(np.mean(fold_scores))
+                table.append({
+                    "round": round_index + 1,
+                    "rows": rows,
+                    "params": configs[i],
+                    "score": scores[i],
+                    "std": float(np.std(fold_scores)),
+                    "fit_time": float(np.mean([seconds for _, seconds in fold_results])),
+                })
+            round_time = time.perf_counter() - round_start
+            survivors = sorted(survivors, key=lambda i: scores[i], reverse=True)
+            if progress:
+                progress({
+                    "round": round_index + 1,
+                    "rounds": rounds,
+                    "rows": rows,
+                    "candidates": len(survivors),
+                    "best_score": scores[survivors[0]],
+                    "elapsed": time.perf_counter() - start,
+                })
+            survivors = survivors[:max(1, len(survivors) // factor)]
+
+    if scores is None:
+        raise ValueError("Tuning stopped before any configuration was scored")
+    best = configs[max(scores, key=scores.get)]
+    model = train_model(model_name, X, y, params=best)
+    table.sort(key=lambda row: (row["round"], row["score"]), reverse=True)
+    return model, best, table
+
+
+def _folds(model_name, y, cv, random_state):
+    from sklearn.model_selection import KFold, StratifiedKFold
+
+    if model_name not in REGRESSION_MODELS:
+        _, counts = np.unique(y, return_counts=True)
+        if counts.min() >= cv:
+            return list(StratifiedKFold(cv, shuffle=True, random_state=random_state).split(y, y))
+    return list(KFold(cv, shuffle=True, random_state=random_state).split(y))
+
+
+def _score_fold(model_name, params, X, y, train, test):
+    # Accuracy for classifiers, R² for regression, as calculate_accuracy reports
+    model = make_model(model_name, **params)
+    start = time.perf_counter()
+    model.fit(X[train], y[train])
+    seconds = time.perf_counter() - start
+    return float(model.score(X[test], y[test])), seconds
+
+
+def format_params(params):
+    return ", ".join(f"{key}={value}" for key, value in params.items())
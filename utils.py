@@ -1,9 +1,189 @@
+import io
+import os
+import numpy as np
 import pandas as pd
+from pandas.api.types import union_categoricals
+from cache import read_cached_dataset, write_cached_dataset
 
-def load_dataset(file_path):
+# Rows per chunk when streaming a CSV
+DEFAULT_CHUNKSIZE = 100_000
+# Object columns with fewer unique values than this share of rows become categoricals
+CATEGORY_MAX_RATIO = 0.5
+# Rows sampled and columns per block when ranking columns by correlation
+CORRELATION_SAMPLE_ROWS = 20_000
+CORRELATION_BLOCK_COLUMNS = 256
+
+
+def load_dataset(file_path, columns=None, chunksize=None, progress=None, use_cache=False, stat=None):
+    # columns: optional projection, only these columns are materialized
+    # chunksize: stream the file in chunks and downcast dtypes as we go
+    # progress: optional callback receiving a fraction in [0, 1]
+    # use_cache: reuse/write a columnar copy keyed on path, size and mtime
+    # stat: os.stat taken before the call; a CSV is parsed up to stat.st_size bytes, so rows
+    # appended meanwhile are neither read nor cached under the grown file's key
+    if stat is None:
+        stat = os.stat(file_path)
+    if use_cache:
+        df = read_cached_dataset(file_path, columns, optimized=bool(chunksize), stat=stat)
+        if df is not None:
+            if progress:
+                progress(1.0)
+            return df
+        df = _parse_dataset(file_path, columns, chunksize, progress, stat.st_size)
+        write_cached_dataset(df, file_path, columns, optimized=bool(chunksize), stat=stat)
+        return df
+    return _parse_dataset(file_path, columns, chunksize, progress, stat.st_size)
+
+
+def _parse_dataset(file_path, columns, chunksize, progress, size=None):
     if file_path.endswith(".csv"):
-        return pd.read_csv(file_path)
+        if chunksize:
+            return _read_csv_chunked(file_path, columns, chunksize, progress, size)
+        with open(file_path, "rb") as handle:
+            return pd.read_csv(_prefix(handle, size), usecols=columns)
     elif file_path.endswith(".xlsx"):
-        return pd.read_excel(file_path)
+        # Excel cannot be streamed, so only projection and downcasting apply
+        if progress:
+            progress(0.0)
+        df = pd.read_excel(file_path, usecols=columns)
+        if chunksize:
+            df = optimize_dtypes(df)
+        if progress:
+            progress(1.0)
+        return df
+    else:
+        raise ValueError("Unsupported file format.")
+
+
+def optimize_dtypes(df):
+    # Downcast numerics to the smallest type and turn repetitive strings into categoricals
+    for col in df.columns:
+        series = df[col]
+        kind = series.dtype.kind
+        if kind == "f":
+            if series.dtype == np.float64 and float32_exact(series.to_numpy()):
+                df[col] = series.astype(np.float32)
+        elif kind in "iu":
+            df[col] = pd.to_numeric(series, downcast="integer" if kind == "i" else "unsigned")
+        elif isinstance(series.dtype, pd.CategoricalDtype):
+            continue
+        elif kind in "OT" or pd.api.types.is_string_dtype(series.dtype):
+            if len(series) and series.nunique(dropna=True) < CATEGORY_MAX_RATIO * len(series):
+                df[col] = series.astype("category")
+    return df
+
+
+def float32_exact(values):
+    # True when float32 holds every value unchanged. Integer IDs above 2**24 (made float by
+    # missing values) and values with more than ~7 significant digits are not.
+    with np.errstate(over="ignore", invalid="ignore"):
+        narrowed = values.astype(np.float32)
+    return bool(np.array_equal(narrowed.astype(np.float64), values, equal_nan=True))
+
+
+def top_correlated(df, target, k, columns=None, random_state=0):
+    # The k numeric columns most correlated (absolute Pearson r) with target. A categorical
+    # target counts the best correlation with any one of its class indicators.
+    # Uses a row sample and standardizes columns a block at a time, so wide frames stay cheap.
+    dtypes = df.dtypes
+    columns = [col for col in (columns if columns is not None else df.columns)
+               if col != target and pd.api.types.is_numeric_dtype(dtypes[col])
+               and not pd.api.types.is_bool_dtype(dtypes[col])]
+    if not columns or k <= 0:
+        return []
+    rows = np.arange(len(df))
+    if len(df) > CORRELATION_SAMPLE_ROWS:
+        rows = np.sort(np.random.default_rng(random_state).choice(len(df), CORRELATION_SAMPLE_ROWS, replace=False))
+    y = df[target].iloc[rows]
+    keep = y.notna().to_numpy()
+    if pd.api.types.is_numeric_dtype(y) and not pd.api.types.is_bool_dtype(y):
+        T = y.to_numpy(dtype=np.float64, na_value=np.nan)[keep, None]
     else:
-        raise ValueError("Unsupported file format.")
\ No newline at end of file
+        T = pd.get_dummies(y[keep]).to_numpy(dtype=np.float64)
+    rows = rows[keep]
+    if len(rows) < 2:
+        return []
+    T = T - T.mean(axis=0)
+    T_norm = np.sqrt((T ** 2).sum(axis=0))
+    scores = np.zeros(len(columns))
+    for start in range(0, len(columns), CORRELATION_BLOCK_COLUMNS):
+        block = columns[start:start + CORRELATION_BLOCK_COLUMNS]
+        Z = df[block].iloc[rows].to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+        # Missing values count as the column mean, i.e. contribute nothing
+        missing = np.isnan(Z)
+        Z[missing] = 0.0
+        Z -= Z.sum(axis=0) / np.maximum((~missing).sum(axis=0), 1)
+        Z[missing] = 0.0
+        Z_norm = np.sqrt((Z ** 2).sum(axis=0))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            corr = np.abs(Z.T @ T) / np.outer(Z_norm, T_norm)
+        scores[start:start + len(block)] = np.nan_to_num(corr, nan=0.0).max(axis=1)
+    order = np.argsort(-scores, kind="stable")[:k]
+    return [columns[i] for i in order]
+
+
+def iter_chunks(file_path, columns=None, chunksize=DEFAULT_CHUNKSIZE, size=None):
+    # Yields (chunk, fraction of the file consumed) without holding the whole file.
+    # size: only the first size bytes of a CSV are read
+    if file_path.endswith(".csv"):
+        total = (os.path.getsize(file_path) if size is None else size) or 1
+        with open(file_path, "rb") as handle:
+            for chunk in pd.read_csv(_prefix(handle, size), usecols=columns, chunksize=chunksize):
+                yield chunk, min(handle.tell() / total, 1.0)
+    elif file_path.endswith(".xlsx"):
+        # Excel cannot be streamed: read once, hand out slices
+        df = pd.read_excel(file_path, usecols=columns)
+        for start in range(0, len(df), chunksize):
+            yield df.iloc[start:start + chunksize], min((start + chunksize) / max(len(df), 1), 1.0)
+    else:
+        raise ValueError("Unsupported file format.")
+
+
+class _Prefix(io.RawIOBase):
+    # The first `limit` bytes of an open binary file
+    def __init__(self, handle, limit):
+        self.handle = handle
+        self.remaining = limit
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self.handle.read(min(len(buffer), self.remaining))
+        buffer[:len(data)] = data
+        self.remaining -= len(data)
+        return len(data)
+
+
+def _prefix(handle, size):
+    return handle if size is None else io.BufferedReader(_Prefix(handle, size))
+
+
+def _read_csv_chunked(file_path, columns, chunksize, progress, size=None):
+    chunks = []
+    for chunk, fraction in iter_chunks(file_path, columns, chunksize, size):
+        chunks.append(optimize_dtypes(chunk))
+        if progress:
+            progress(fraction)
+
+    if not chunks:
+        with open(file_path, "rb") as handle:
+            return pd.read_csv(_prefix(handle, size), usecols=columns)
+
+    result = {}
+    for col in chunks[0].columns:
+        parts = [chunk[col] for chunk in chunks]
+        if all(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+            # Merge per-chunk categories without going through object arrays
+            merged = union_categoricals(parts, ignore_order=True)
+            result[col] = pd.Series(merged, name=col)
+        elif any(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+            result[col] = pd.concat([part.astype(object) for part in parts], ignore_index=True)
+        else:
+            result[col] = pd.concat(parts, ignore_index=True)
+    df = pd.DataFrame(result)
+
+    if progress:
+        progress(1.0)
+    # Chunks may have settled on different widths, normalize once over the full frame
+    return optimize_dtypes(df)
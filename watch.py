@@ -0,0 +1,135 @@
+import copy
+import io
+import os
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+from utils import float32_exact
+
+# Watch mode for CSV files that only grow by appended lines: TailReader parses just the bytes
+# written since the last poll, append_rows adds them to the loaded frame and update_model folds
+# them into estimators that support partial_fit.
+# Bytes before the read offset that are compared on every poll to notice a rewritten file
+TAIL_CHECK_BYTES = 64
+
+
+class FileRewritten(Exception):
+    # The file shrank or its already-read content changed: only a full reload is safe
+    pass
+
+
+class TailReader:
+    def __init__(self, file_path, dtypes, offset=None):
+        # dtypes: of the loaded frame, so text columns stay text however the new values look.
+        # offset: bytes of the file the frame was parsed from (the stat passed to load_dataset)
+        if not file_path.endswith(".csv"):
+            raise ValueError("Only CSV files can be watched")
+        self.file_path = file_path
+        self.header = list(pd.read_csv(file_path, nrows=0).columns)
+        self.columns = [col for col in self.header if col in dtypes.index]
+        self.text_columns = {
+            col: str for col in self.columns
+            if not (pd.api.types.is_numeric_dtype(dtypes[col]) or pd.api.types.is_bool_dtype(dtypes[col]))
+        }
+        size = os.path.getsize(file_path)
+        offset = size if offset is None else min(offset, size)
+        with open(file_path, "rb") as f:
+            f.seek(max(offset - TAIL_CHECK_BYTES, 0))
+            self._check = f.read(offset - max(offset - TAIL_CHECK_BYTES, 0))
+        self.offset = offset
+        self._pending = None
+
+    def read(self):
+        # Rows appended after the offset as a DataFrame, or None when nothing new is complete.
+        # The offset only moves on advance(), so rows the caller could not use are read again.
+        size = os.path.getsize(self.file_path)
+        if size < self.offset:
+            raise FileRewritten(f"{self.file_path} is shorter than when it was read")
+        if size == self.offset:
+            return None
+        with open(self.file_path, "rb") as f:
+            f.seek(self.offset - len(self._check))
+            if f.read(len(self._check)) != self._check:
+                raise FileRewritten(f"{self.file_path} was rewritten")
+            data = f.read(size - self.offset)
+        if self._check and not self._check.endswith(b"\n") and not data.startswith((b"\n", b"\r")):
+            # The parsed part ended inside a row that was still being written: that row was
+            # loaded incomplete and only a full reload gets it right
+            raise FileRewritten(f"{self.file_path} was loaded while its last row was being written")
+        end = data.rfind(b"\n")
+        if end < 0:
+            return None
+        data = data[:end + 1]
+        self._pending = (self.offset + len(data), (self._check + data)[-TAIL_CHECK_BYTES:])
+        if not data.strip():
+            self.advance()
+            return None
+        tail = pd.read_csv(io.BytesIO(data), header=None, names=self.header, usecols=self.columns,
+                           dtype=self.text_columns)
+        return tail[self.columns]
+
+    def advance(self):
+        # Moves past the rows returned by the last read()
+        if self._pending is not None:
+            self.offset, self._check = self._pending
+            self._pending = None
+
+
+def append_rows(df, tail):
+    # New frame with tail's rows after df's, keeping df's (downcast, categorical) dtypes where
+    # the new values fit. Copies every column once, still far cheaper than parsing the file again.
+    tail = tail.reindex(columns=df.columns)
+    result = {}
+    for col in df.columns:
+        old, new = df[col], tail[col]
+        if isinstance(old.dtype, pd.CategoricalDtype):
+            categories = old.cat.categories
+            new = pd.Series(pd.Categorical(new.astype(object).where(new.notna(), None)))
+            new = new.cat.set_categories(new.cat.categories.astype(categories.dtype))
+            result[col] = pd.Series(union_categoricals([old, new], ignore_order=True), name=col)
+            continue
+        if pd.api.types.is_numeric_dtype(old.dtype) and not pd.api.types.is_bool_dtype(old.dtype):
+            new = pd.to_numeric(new, errors="coerce")
+            if _fits(new, old.dtype):
+                new = new.astype(old.dtype)
+        result[col] = pd.concat([old, new], ignore_index=True).rename(col)
+    return pd.DataFrame(result)
+
+
+def _fits(values, dtype):
+    if dtype.kind == "f":
+        # Otherwise concat upcasts the column rather than rounding the new values
+        return dtype != np.float32 or float32_exact(values.to_numpy(dtype=np.float64, na_value=np.nan))
+    if dtype.kind not in "iu" or values.isna().any():
+        return False
+    data = values.to_numpy()
+    if not len(data):
+        return True
+    if data.dtype.kind == "f" and not np.all(data == np.round(data)):
+        return False
+    info = np.iinfo(dtype)
+    return info.min <= data.min() and data.max() <= info.max
+
+
+def supports_partial_fit(model):
+    final = model.steps[-1][1] if hasattr(model, "steps") else model
+    return hasattr(final, "partial_fit")
+
+
+def update_model(model, X, y):
+    # Copy of model with the rows folded in through partial_fit (the model in use keeps serving
+    # until the copy replaces it), or None when the estimator cannot learn incrementally or the
+    # rows bring a class it was not set up for
+    if not supports_partial_fit(model):
+        return None
+    final = model.steps[-1][1] if hasattr(model, "steps") else model
+    classes = getattr(final, "classes_", None)
+    if classes is not None and not np.isin(y, classes).all():
+        return None
+    updated = copy.deepcopy(model)
+    if hasattr(updated, "steps"):
+        # The pipeline's scaler stays frozen, as in out-of-core training
+        updated.steps[-1][1].partial_fit(updated[:-1].transform(X), y)
+    else:
+        updated.partial_fit(X, y)
+    return updated
@@ -0,0 +1,602 @@
+import re
+import tkinter as tk
+from tkinter import ttk
+import numpy as np
+import pandas as pd
+import ttkbootstrap as tb
+
+# Filter syntax for the selected column: ">5", ">=5", "<5", "<=5", "=5", "2..8"; anything else is a substring match
+_RANGE = re.compile(r"^\s*(-?[\d.eE+-]+)\s*\.\.\s*(-?[\d.eE+-]+)\s*$")
+_COMPARE = re.compile(r"^\s*(>=|<=|>|<|=)\s*(-?[\d.eE+-]+)\s*$")
+
+
+class VirtualTable(tb.Frame):
+    # Data preview that only materializes the visible window of rows.
+    # Rows are addressed through an optional index array (sort and/or filter),
+    # sort orders are computed once per column and reused.
+    def __init__(self, master, visible_rows=10, **kwargs):
+        super().__init__(master, **kwargs)
+        self.visible_rows = visible_rows
+        self.dataset = None
+        self.view = None  # row positions in display order, None means all rows in file order
+        self.offset = 0
+        self.sort_column = None
+        self.sort_descending = False
+        self._sort_cache = {}
+        self._filter_rows = None  # sorted row positions passing the filter
+
+        # Toolbar: jump to row and column filter
+        bar = tb.Frame(self)
+        bar.pack(fill=tk.X, pady=(0, 5))
+        tb.Label(bar, text="Go to row:").pack(side=tk.LEFT)
+        self.jump_var = tk.StringVar()
+        jump = tb.Entry(bar, textvariable=self.jump_var, width=10)
+        jump.pack(side=tk.LEFT, padx=5)
+        jump.bind("<Return>", lambda e: self.jump_to(self.jump_var.get()))
+
+        tb.Label(bar, text="Filter:").pack(side=tk.LEFT, padx=(15, 0))
+        self.filter_column_var = tk.StringVar()
+        self.filter_column = tb.Combobox(bar, textvariable=self.filter_column_var, state="readonly", width=18)
+        self.filter_column.pack(side=tk.LEFT, padx=5)
+        self.filter_var = tk.StringVar()
+        entry = tb.Entry(bar, textvariable=self.filter_var, width=18)
+        entry.pack(side=tk.LEFT, padx=5)
+        entry.bind("<Return>", lambda e: self.apply_filter())
+        tb.Button(bar, text="Apply", command=self.apply_filter, bootstyle="secondary-outline").pack(side=tk.LEFT)
+        tb.Button(bar, text="Clear", command=self.clear_filter, bootstyle="secondary-outline").pack(side=tk.LEFT, padx=5)
+        self.position_label = tb.Label(bar, text="")
+        self.position_label.pack(side=tk.RIGHT)
+
+        # The Treeview holds a fixed set of item rows whose values are swapped on scroll
+        self.tree = ttk.Treeview(self, show="headings", height=visible_rows)
+        self.scroll_y = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scroll_x = ttk.Scrollbar(self, orient=tk.HORIZONTAL, command=self.tree.xview)
+        self.tree.configure(xscrollcommand=self.scroll_x.set)
+        self.scroll_y.pack(side=tk.RIGHT, fill=tk.Y)
+        self.scroll_x.pack(side=tk.BOTTOM, fill=tk.X)
+        self.tree.pack(fill=tk.BOTH, expand=True)
+
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tree.bind(sequence, self._on_wheel)
+        self.tree.bind("<Prior>", lambda e: self._scroll_by(-self.visible_rows) or "break")
+        self.tree.bind("<Next>", lambda e: self._scroll_by(self.visible_rows) or "break")
+
+    @property
+    def row_count(self):
+        if self.dataset is None:
+            return 0
+        return len(self.dataset) if self.view is None else len(self.view)
+
+    def set_data(self, dataset):
+        self.dataset = dataset
+        self.view = None
+        self.offset = 0
+        self.sort_column = None
+        self.sort_descending = False
+        self._sort_cache = {}
+        self._filter_rows = None
+        self.filter_var.set("")
+
+        columns = [str(col) for col in dataset.columns]
+        self.tree.delete(*self.tree.get_children())
+        self.tree["columns"] = columns
+        for col, name in zip(dataset.columns, columns):
+            self.tree.heading(name, text=name, anchor=tk.W, command=lambda c=col: self.sort_by(c))
+            self.tree.column(name, anchor=tk.W, width=100, stretch=tk.YES)
+        for i in range(self.visible_rows):
+            self.tree.insert("", tk.END, iid=str(i), values=())
+        self.filter_column["values"] = columns
+        if columns:
+            self.filter_column_var.set(columns[0])
+        self.render()
+
+    def clear(self):
+        self.dataset = None
+        self.view = None
+        self._sort_cache = {}
+        self._filter_rows = None
+        self.tree.delete(*self.tree.get_children())
+        self.tree["columns"] = []
+        self.filter_column["values"] = []
+        self.filter_column_var.set("")
+        self.position_label.config(text="")
+        self.scroll_y.set(0, 1)
+
+    def render(self):
+        if self.dataset is None:
+            return
+        total = self.row_count
+        self.offset = max(0, min(self.offset, max(total - self.visible_rows, 0)))
+        stop = min(self.offset + self.visible_rows, total)
+        if self.view is None:
+            block = self.dataset.iloc[self.offset:stop]
+        else:
+            block = self.dataset.iloc[self.view[self.offset:stop]]
+        values = block.to_numpy()
+
+        for i in range(self.visible_rows):
+            if i < len(values):
+                self.tree.item(str(i), values=list(values[i]))
+            else:
+                self.tree.item(str(i), values=())
+
+        if total:
+            self.scroll_y.set(self.offset / total, stop / total)
+            shown = f"Rows {self.offset + 1:,}-{stop:,} of {total:,}"
+        else:
+            self.scroll_y.set(0, 1)
+            shown = "No rows"
+        if self.view is not None and self._filter_rows is not None:
+            shown += f" (filtered from {len(self.dataset):,})"
+        self.position_label.config(text=shown)
+
+    def jump_to(self, row):
+        try:
+            self.offset = int(str(row).replace(",", "")) - 1
+        except ValueError:
+            return
+        self.render()
+
+    def sort_by(self, column):
+        if self.dataset is None:
+            return
+        if self.sort_column == column:
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_column = column
+            self.sort_descending = False
+        self._rebuild_view()
+        self.offset = 0
+        self.render()
+
+    def apply_filter(self):
+        if self.dataset is None:
+            return
+        column = self._column_by_name(self.filter_column_var.get())
+        text = self.filter_var.get().strip()
+        if column is None or not text:
+            self.clear_filter()
+            return
+        self._filter_rows = self.filter_rows(column, text)
+        self._rebuild_view()
+        self.offset = 0
+        self.render()
+
+    def clear_filter(self):
+        self.filter_var.set("")
+        self._filter_rows = None
+        self._rebuild_view()
+        self.render()
+
+    def sort_order(self, column):
+        # Ascending argsort of a column (NaN last), computed once and cached
+        order = self._sort_cache.get(column)
+        if order is None:
+            series = self.dataset[column]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                # Sort by category label, missing values (code -1) last
+                ranks = np.argsort(np.argsort(series.cat.categories.astype(str)))
+                codes = series.cat.codes.to_numpy()
+                keys = np.where(codes >= 0, ranks[codes], len(ranks))
+                order = np.argsort(keys, kind="stable")
+            elif pd.api.types.is_numeric_dtype(series):
+                order = np.argsort(series.to_numpy(dtype=np.float64, na_value=np.nan), kind="stable")
+            else:
+                order = np.argsort(series.astype(str).to_numpy(), kind="stable")
+            self._sort_cache[column] = order
+        return order
+
+    def filter_rows(self, column, text):
+        # Row positions (ascending) matching the filter expression on column
+        series = self.dataset[column]
+        numeric = pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+        bounds = _parse_bounds(text) if numeric else None
+        if bounds is not None:
+            # Numeric ranges come straight out of the cached sort order via binary search
+            order = self.sort_order(column)
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)[order]
+            low, high, low_side, high_side = bounds
+            start = 0 if low is None else np.searchsorted(values, low, side=low_side)
+            stop = np.searchsorted(values, np.inf, side="right") if high is None else np.searchsorted(values, high, side=high_side)
+            return np.sort(order[start:stop])
+        mask = series.astype(str).str.contains(text, case=False, regex=False, na=False).to_numpy()
+        return np.flatnonzero(mask)
+
+    def _rebuild_view(self):
+        if self.sort_column is None:
+            self.view = self._filter_rows
+            return
+        order = self.sort_order(self.sort_column)
+        if self.sort_descending:
+            order = order[::-1]
+        if self._filter_rows is not None:
+            keep = np.zeros(len(self.dataset), dtype=bool)
+            keep[self._filter_rows] = True
+            order = order[keep[order]]
+        self.view = order
+
+    def _column_by_name(self, name):
+        for col in self.dataset.columns:
+            if str(col) == name:
+                return col
+        return None
+
+    def _scroll_by(self, rows):
+        self.offset += rows
+        self.render()
+
+    def _on_scrollbar(self, *args):
+        if args[0] == "moveto":
+            self.offset = int(float(args[1]) * self.row_count)
+        elif args[0] == "scroll":
+            step = int(args[1]) * (self.visible_rows if args[2] == "pages" else 1)
+            self.offset += step
+        self.render()
+
+    def _on_wheel(self, event):
+        if event.num == 4 or event.delta > 0:
+            self._scroll_by(-3)
+        else:
+            self._scroll_by(3)
+        return "break"
+
+
+class ColumnPicker(tb.Frame):
+    # Multi-select column list for datasets with thousands of columns. The Listbox only ever
+    # holds the visible window of the filtered names and the selection is kept as a set of
+    # column positions, so loading, filtering and scrolling cost the same for 10 or 10,000 columns.
+    # Bulk actions (Select Shown, Numeric) apply to the columns passing the search.
+    def __init__(self, master, visible_rows=5, top_k=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self.visible_rows = visible_rows
+        self.top_k = top_k  # callback(k) for By Correlation; picks columns and passes them to select()
+        self.columns = []
+        self.numeric = set()
+        self.notes = {}  # column -> short description shown next to its name
+        self.shown = []  # positions of the columns passing the search, in dataset order
+        self.selected = set()
+        self.offset = 0
+        self._lower = []  # search index: lowercase names by position
+        self._positions = {}
+        self._query = ""  # last plain-text query, None after a regex search
+        self._pending = None
+
+        bar = tb.Frame(self)
+        bar.pack(fill=tk.X, pady=(0, 5))
+        tb.Label(bar, text="Search:").pack(side=tk.LEFT)
+        self.search_var = tk.StringVar()
+        tb.Entry(bar, textvariable=self.search_var, width=24).pack(side=tk.LEFT, padx=5)
+        self.search_var.trace_add("write", lambda *_: self._schedule_filter())
+        self.regex_var = tk.BooleanVar(value=False)
+        tb.Checkbutton(
+            bar, text="Regex", variable=self.regex_var, command=self.apply_filter, bootstyle="round-toggle"
+        ).pack(side=tk.LEFT, padx=5)
+        tb.Button(bar, text="Select Shown", command=self.select_shown, bootstyle="secondary-outline").pack(side=tk.LEFT, padx=2)
+        tb.Button(bar, text="Numeric", command=self.select_numeric, bootstyle="secondary-outline").pack(side=tk.LEFT, padx=2)
+        self.top_k_var = tk.IntVar(value=20)
+        tb.Label(bar, text="Top").pack(side=tk.LEFT, padx=(10, 0))
+        tb.Spinbox(bar, from_=1, to=100_000, textvariable=self.top_k_var, width=6).pack(side=tk.LEFT, padx=2)
+        tb.Button(bar, text="By Correlation", command=self.select_top_k, bootstyle="secondary-outline").pack(side=tk.LEFT, padx=2)
+        tb.Button(bar, text="Clear", command=self.clear_selection, bootstyle="secondary-outline").pack(side=tk.LEFT, padx=2)
+        self.count_label = tb.Label(bar, text="")
+        self.count_label.pack(side=tk.RIGHT)
+
+        body = tb.Frame(self)
+        body.pack(fill=tk.BOTH, expand=True)
+        self.listbox = tk.Listbox(
+            body, selectmode=tk.MULTIPLE, height=visible_rows, exportselection=False, activestyle="none"
+        )
+        self.scroll_y = ttk.Scrollbar(body, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scroll_y.pack(side=tk.RIGHT, fill=tk.Y)
+        self.listbox.pack(fill=tk.BOTH, expand=True)
+        self.listbox.bind("<<ListboxSelect>>", self._on_select)
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.listbox.bind(sequence, self._on_wheel)
+
+    def set_columns(self, columns, numeric=(), notes=None):
+        self.columns = list(columns)
+        self.notes = notes or {}
+        self._lower = [str(col).lower() for col in self.columns]
+        self._positions = {col: i for i, col in enumerate(self.columns)}
+        self.numeric = {self._positions[col] for col in numeric if col in self._positions}
+        self.selected = set()
+        self.shown = list(range(len(self.columns)))
+        self._query = ""
+        if self._pending is not None:
+            self.after_cancel(self._pending)
+            self._pending = None
+        self.search_var.set("")
+        self.offset = 0
+        self.render()
+
+    def clear(self):
+        self.set_columns([])
+
+    def set_notes(self, notes):
+        # New annotations for the same columns; filter, selection and scroll position stay
+        self.notes = notes
+        self.render()
+
+    def selection(self):
+        # Selected columns in dataset order
+        return [self.columns[i] for i in sorted(self.selected)]
+
+    def select(self, columns):
+        self.selected.update(self._positions[col] for col in columns if col in self._positions)
+        self.render()
+
+    def select_shown(self):
+        self.selected.update(self.shown)
+        self.render()
+
+    def select_numeric(self):
+        self.selected.update(i for i in self.shown if i in self.numeric)
+        self.render()
+
+    def select_top_k(self):
+        if self.top_k is None:
+            return
+        try:
+            k = int(self.top_k_var.get())
+        except (tk.TclError, ValueError):
+            return
+        self.top_k(k)
+
+    def clear_selection(self):
+        self.selected = set()
+        self.render()
+
+    def apply_filter(self):
+        self._pending = None
+        query = self.search_var.get().strip()
+        if self.regex_var.get():
+            try:
+                pattern = re.compile(query, re.IGNORECASE)
+            except re.error:
+                self.count_label.config(text="Invalid regex")
+                return
+            self.shown = [i for i, col in enumerate(self.columns) if pattern.search(str(col))]
+            self._query = None
+        else:
+            query = query.lower()
+            # A longer query only narrows the previous matches
+            if self._query is not None and query.startswith(self._query):
+                candidates = self.shown
+            else:
+                candidates = range(len(self.columns))
+            self.shown = [i for i in candidates if query in self._lower[i]]
+            self._query = query
+        self.offset = 0
+        self.render()
+
+    def render(self):
+        total = len(self.shown)
+        self.offset = max(0, min(self.offset, max(total - self.visible_rows, 0)))
+        window = self.shown[self.offset:self.offset + self.visible_rows]
+        self.listbox.delete(0, tk.END)
+        if window:
+            self.listbox.insert(tk.END, *[self.label(i) for i in window])
+        for row, i in enumerate(window):
+            if i in self.selected:
+                self.listbox.selection_set(row)
+        if total:
+            self.scroll_y.set(self.offset / total, (self.offset + len(window)) / total)
+        else:
+            self.scroll_y.set(0, 1)
+        self._update_count()
+
+    def label(self, position):
+        col = self.columns[position]
+        note = self.notes.get(col)
+        return f"{col}  ({note})" if note else str(col)
+
+    def _update_count(self):
+        if not self.columns:
+            self.count_label.config(text="")
+            return
+        self.count_label.config(
+            text=f"{len(self.shown):,} of {len(self.columns):,} shown, {len(self.selected):,} selected"
+        )
+
+    def _schedule_filter(self):
+        # Filters once typing pauses instead of on every keystroke
+        if self._pending is not None:
+            self.after_cancel(self._pending)
+        self._pending = self.after(150, self.apply_filter)
+
+    def _on_select(self, event=None):
+        window = self.shown[self.offset:self.offset + self.visible_rows]
+        current = set(self.listbox.curselection())
+        for row, i in enumerate(window):
+            if row in current:
+                self.selected.add(i)
+            else:
+                self.selected.discard(i)
+        self._update_count()
+
+    def _scroll_by(self, rows):
+        self.offset += rows
+        self.render()
+
+    def _on_scrollbar(self, *args):
+        if args[0] == "moveto":
+            self.offset = int(float(args[1]) * len(self.shown))
+        elif args[0] == "scroll":
+            self.offset += int(args[1]) * (self.visible_rows if args[2] == "pages" else 1)
+        self.render()
+
+    def _on_wheel(self, event):
+        if event.num == 4 or event.delta > 0:
+            self._scroll_by(-1)
+        else:
+            self._scroll_by(1)
+        return "break"
+
+
+class VirtualForm(tb.Frame):
+    # Label/entry form over any number of fields that only builds visible_rows x columns
+    # entries. Scrolling rebinds them to other fields; typed values are kept per field.
+    # validate(field, text) -> None or (level, message) is run as the user types;
+    # "error" and "warning" levels color the entry and show the message.
+    def __init__(self, master, visible_rows=5, columns=2, validate=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self.visible_rows = visible_rows
+        self.columns = columns
+        self.validate = validate
+        self.fields = []
+        self.values = {}
+        self.offset = 0
+        self._bound = []  # field shown by each slot, None when the slot is empty
+        self._loading = False
+
+        header = tb.Frame(self)
+        header.pack(fill=tk.X)
+        self.message_label = tb.Label(header, text="")
+        self.message_label.pack(side=tk.LEFT)
+        self.position_label = tb.Label(header, text="")
+        self.position_label.pack(side=tk.RIGHT)
+        body = tb.Frame(self)
+        body.pack(fill=tk.BOTH, expand=True)
+        self.scroll_y = ttk.Scrollbar(body, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scroll_y.pack(side=tk.RIGHT, fill=tk.Y)
+        grid = tb.Frame(body)
+        grid.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        # Slots fill row by row, so scrolling moves whole rows of `columns` fields
+        self.slots = []
+        for slot in range(visible_rows * columns):
+            row, column = divmod(slot, columns)
+            label = tb.Label(grid, text="", width=15, anchor=tk.W)
+            label.grid(row=row, column=2 * column, sticky="w", padx=(5, 0), pady=2)
+            var = tk.StringVar()
+            entry = tb.Entry(grid, textvariable=var)
+            entry.grid(row=row, column=2 * column + 1, sticky="ew", padx=5, pady=2)
+            var.trace_add("write", lambda *_, slot=slot: self._on_edit(slot))
+            for widget in (label, entry):
+                for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+                    widget.bind(sequence, self._on_wheel)
+            self.slots.append((label, entry, var))
+            self._bound.append(None)
+        for column in range(columns):
+            grid.grid_columnconfigure(2 * column + 1, weight=1)
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            grid.bind(sequence, self._on_wheel)
+
+    def set_fields(self, fields):
+        self.fields = list(fields)
+        self.values = {}
+        self.offset = 0
+        self.message_label.config(text="")
+        self.render()
+
+    def clear(self):
+        self.set_fields([])
+
+    def get_values(self):
+        return {field: self.values.get(field, "") for field in self.fields}
+
+    def problems(self, level="error"):
+        # [(field, message)] for every field, including those scrolled out of view
+        if self.validate is None:
+            return []
+        found = []
+        for field in self.fields:
+            result = self.validate(field, self.values.get(field, ""))
+            if result is not None and result[0] == level:
+                found.append((field, result[1]))
+        return found
+
+    def render(self):
+        total = len(self.fields)
+        per_page = len(self.slots)
+        last_row = max((total - 1) // self.columns - self.visible_rows + 1, 0)
+        self.offset = max(0, min(self.offset, last_row * self.columns))
+        self._loading = True
+        try:
+            for slot, (label, entry, var) in enumerate(self.slots):
+                index = self.offset + slot
+                if index < total:
+                    field = self.fields[index]
+                    self._bound[slot] = field
+                    label.config(text=f"{field}:")
+                    var.set(self.values.get(field, ""))
+                    self._check(slot)
+                    label.grid()
+                    entry.grid()
+                else:
+                    self._bound[slot] = None
+                    var.set("")
+                    entry.configure(bootstyle="default")
+                    label.grid_remove()
+                    entry.grid_remove()
+        finally:
+            self._loading = False
+        stop = min(self.offset + per_page, total)
+        if total > per_page:
+            self.scroll_y.set(self.offset / total, stop / total)
+            self.position_label.config(text=f"Fields {self.offset + 1:,}-{stop:,} of {total:,}")
+        else:
+            self.scroll_y.set(0, 1)
+            self.position_label.config(text="")
+
+    def _on_edit(self, slot):
+        field = self._bound[slot]
+        if not self._loading and field is not None:
+            self.values[field] = self.slots[slot][2].get()
+            self._check(slot, announce=True)
+
+    def _check(self, slot, announce=False):
+        field = self._bound[slot]
+        result = self.validate(field, self.values.get(field, "")) if self.validate else None
+        level = result[0] if result else None
+        self.slots[slot][1].configure(bootstyle={"error": "danger", "warning": "warning"}.get(level, "default"))
+        if announce:
+            self.message_label.config(
+                text=f"{field}: {result[1]}" if result else "",
+                bootstyle="danger" if level == "error" else "warning"
+            )
+
+    def _scroll_by(self, rows):
+        self.offset += rows * self.columns
+        self.render()
+
+    def _on_scrollbar(self, *args):
+        if args[0] == "moveto":
+            row = int(float(args[1]) * len(self.fields)) // self.columns
+            self.offset = row * self.columns
+        elif args[0] == "scroll":
+            self.offset += int(args[1]) * self.columns * (self.visible_rows if args[2] == "pages" else 1)
+        self.render()
+
+    def _on_wheel(self, event):
+        if event.num == 4 or event.delta > 0:
+            self._scroll_by(-1)
+        else:
+            self._scroll_by(1)
+        return "break"
+
+def _parse_bounds(text):
+    # (low, high, searchsorted side for low, side for high) or None if text is not numeric syntax
+    match = _RANGE.match(text)
+    if match:
+        try:
+            return float(match.group(1)), float(match.group(2)), "left", "right"
+        except ValueError:
+            return None
+    match = _COMPARE.match(text)
+    if not match:
+        return None
+    try:
+        value = float(match.group(2))
+    except ValueError:
+        return None
+    op = match.group(1)
+    if op == ">":
+        return value, None, "right", None
+    if op == ">=":
+        return value, None, "left", None
+    if op == "<":
+        return None, value, None, "left"
+    if op == "<=":
+        return None, value, None, "right"
+    return value, value, "left", "right"